@@ -20,5 +20,11 @@ class NetBoxACLsConfig(PluginConfig):
     min_version = "3.5.0"
     max_version = "3.6.99"
 
+    def ready(self):
+        super().ready()
+
+        # Connect the signal receivers
+        from . import signals  # noqa: F401
+
 
 config = NetBoxACLsConfig
@@ -0,0 +1,113 @@
+"""
+Keyset pagination of the rule lists, whose cost does not grow with the depth of the page.
+"""
+
+import base64
+
+from django.conf import settings
+from django.db.models import Q
+from netbox.config import get_config
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+__all__ = ("RuleCursorPagination",)
+
+
+class RuleCursorPagination(BasePagination):
+    """
+    Paginate rules by (access_list, id), the ordering of an index, with opaque next and previous
+    cursors: each page is an index range scan following the cursor, instead of sorting the whole
+    table and skipping the rows of the previous pages as offset pagination does. The ordering
+    query parameter is ignored, and the total count is not returned, as counting is not cheap.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    ordering = ("access_list_id", "pk")
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get(self.limit_query_param, 0))
+        except ValueError:
+            limit = 0
+        if limit <= 0:
+            limit = get_config().PAGINATE_COUNT
+        if settings.MAX_PAGE_SIZE:
+            limit = min(limit, settings.MAX_PAGE_SIZE)
+        return limit
+
+    def encode_cursor(self, reverse, rule):
+        position = f"{'p' if reverse else 'n'}:{rule.access_list_id}:{rule.pk}"
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, request):
+        """
+        Return the (reverse, access_list_id, id) position of the request's cursor, or None for the first page.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            direction, access_list_id, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+            if direction in ("n", "p"):
+                return direction == "p", int(access_list_id), int(pk)
+        except ValueError:
+            pass
+        raise NotFound("Invalid cursor.")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        limit = self.get_limit(request)
+        position = self.decode_cursor(request)
+        reverse = position is not None and position[0]
+
+        if position is not None:
+            _, access_list_id, pk = position
+            # The leading range on access_list is what the (access_list, id) index is scanned with.
+            if reverse:
+                queryset = queryset.filter(Q(access_list_id__lte=access_list_id), Q(access_list_id__lt=access_list_id) | Q(pk__lt=pk))
+            else:
+                queryset = queryset.filter(Q(access_list_id__gte=access_list_id), Q(access_list_id__gt=access_list_id) | Q(pk__gt=pk))
+        ordering = [f"-{field}" for field in self.ordering] if reverse else self.ordering
+
+        rules = list(queryset.order_by(*ordering)[:limit + 1])
+        has_more = len(rules) > limit
+        rules = rules[:limit]
+        if reverse:
+            rules.reverse()
+
+        # Pages are only known to exist in the direction of the cursor followed, and back to where it was.
+        self.next_cursor = self.previous_cursor = None
+        if rules:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(False, rules[-1])
+            if position is not None and (has_more or not reverse):
+                self.previous_cursor = self.encode_cursor(True, rules[0])
+        return rules
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_link(self.next_cursor),
+                "previous": self.get_link(self.previous_cursor),
+                "results": data,
+            },
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
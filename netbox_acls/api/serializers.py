@@ -3,31 +3,83 @@ Serializers control the translation of client data to and from Python objects,
 while Django itself handles the database abstraction.
 """
 
+from collections import defaultdict
+from functools import lru_cache
+
+from dcim.models import Device
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError as DjangoValidationError
 from drf_spectacular.utils import extend_schema_field
 from ipam.api.serializers import NestedPrefixSerializer
-from netbox.api.fields import ContentTypeField
+from netbox.api.fields import ChoiceField, ContentTypeField
 from netbox.api.serializers import NetBoxModelSerializer
 from netbox.constants import NESTED_SERIALIZER_PREFIX
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from utilities.api import get_serializer_for_model
 
-from ..constants import ACL_HOST_ASSIGNMENT_MODELS, ACL_INTERFACE_ASSIGNMENT_MODELS
+from ..bulk import bulk_create_objects
+from ..changes import decode_cursor
+from ..choices import (
+    ACLAssignmentDirectionChoices,
+    ACLExportFormatChoices,
+    ACLProtocolChoices,
+    ACLRenderPlatformChoices,
+    ACLRuleFindingChoices,
+    ACLVerdictChoices,
+)
+from ..constants import ACL_HOST_ASSIGNMENT_MODELS, ACL_INTERFACE_ASSIGNMENT_MODELS, ACL_RULE_SEQUENCE_STEP
+from ..engine import MAX_PORT, merge_port_ranges, parse_flows, parse_port_range, parse_prefix, parse_rule_entries
 from ..models import (
     AccessList,
+    ACLEffectiveRule,
     ACLEgressRule,
     ACLInterfaceAssignment,
     ACLIngressRule,
 )
+from ..querysets import DEVICE_ROLE_FIELD
+from ..signals import update_interface_assignments
+from ..tcam import TCAM_USAGE_GROUPS
 from .nested_serializers import NestedAccessListSerializer
 
 __all__ = [
     "AccessListSerializer",
+    "ACLBulkWriteResultSerializer",
+    "ACLChangeFeedResultSerializer",
+    "ACLChangeFeedSerializer",
+    "ACLCoverageResultSerializer",
+    "ACLCoverageSerializer",
+    "ACLEffectiveRuleSerializer",
+    "ACLExportSerializer",
+    "ACLFlowSerializer",
+    "ACLFlowResultSerializer",
+    "ACLFlowSimulationSerializer",
+    "ACLHistoryDiffResultSerializer",
+    "ACLHistoryDiffSerializer",
+    "ACLImpactResultSerializer",
+    "ACLImpactSerializer",
+    "ACLOptimizationResultSerializer",
+    "ACLOptimizeSerializer",
+    "ACLRenderSerializer",
+    "ACLRenumberSerializer",
+    "ACLRuleFindingSerializer",
+    "ACLTCAMUsageEntrySerializer",
+    "ACLTCAMUsageResultSerializer",
+    "ACLTCAMUsageSerializer",
     "ACLInterfaceAssignmentSerializer",
     "ACLIngressRuleSerializer",
     "ACLEgressRuleSerializer",
 ]
 
+
+@lru_cache(maxsize=None)
+def get_nested_serializer(model):
+    """
+    Return the nested serializer class of a model, resolved once per model rather than once per object.
+    """
+    return get_serializer_for_model(model, prefix=NESTED_SERIALIZER_PREFIX)
+
+
 # Sets a standard error message for ACL rules no associated to an ACL of the same type.
 error_message_acl_type = "Provided parent Access List is not of right type."
 
@@ -41,6 +93,7 @@ class AccessListSerializer(NetBoxModelSerializer):
         view_name="plugins-api:netbox_acls-api:accesslist-detail",
     )
     rule_count = serializers.IntegerField(read_only=True)
+    tcam_entry_count = serializers.IntegerField(read_only=True)
     assigned_object_type = ContentTypeField(
         queryset=ContentType.objects.filter(ACL_HOST_ASSIGNMENT_MODELS),
     )
@@ -67,14 +120,17 @@ class AccessListSerializer(NetBoxModelSerializer):
             "created",
             "last_updated",
             "rule_count",
+            "icmp_rule_count",
+            "tcp_rule_count",
+            "udp_rule_count",
+            "tcam_entry_count",
         )
 
     @extend_schema_field(serializers.DictField())
     def get_assigned_object(self, obj):
-        serializer = get_serializer_for_model(
-            obj.assigned_object,
-            prefix=NESTED_SERIALIZER_PREFIX,
-        )
+        if obj.assigned_object is None:
+            return None
+        serializer = get_nested_serializer(type(obj.assigned_object))
         context = {"request": self.context["request"]}
         return serializer(obj.assigned_object, context=context).data
 
@@ -98,6 +154,187 @@ class AccessListSerializer(NetBoxModelSerializer):
         return super().validate(data)
 
 
+# Parent host field of each interface model.
+INTERFACE_HOST_FIELDS = {
+    "interface": "device",
+    "vminterface": "virtual_machine",
+}
+
+# Error message for interfaces whose host does not have the Access List's device role.
+error_message_acl_not_assigned_to_host = "Access List not present on the selected interface's host."
+
+
+def get_assigned_interfaces(content_type, object_ids):
+    """
+    Return the interfaces or VM interfaces of a content type along with their parent host,
+    as a {pk: interface} mapping, with a single query.
+    """
+    return content_type.model_class().objects.select_related(INTERFACE_HOST_FIELDS[content_type.model]).in_bulk(object_ids)
+
+
+def get_interface_assignment_errors(access_list, interface):
+    """
+    Return the errors of assigning an Access List to an interface, possibly None when it does not exist.
+    Access Lists are assigned to device roles: the interface's host must have that role.
+    """
+    if interface is None:
+        return {"assigned_object_id": ["Interface not found."]}
+
+    host = getattr(interface, INTERFACE_HOST_FIELDS[interface._meta.model_name])
+    role_field = DEVICE_ROLE_FIELD if isinstance(host, Device) else "role"
+    if getattr(host, f"{role_field}_id") != access_list.assigned_object_id:
+        return {
+            "access_list": [error_message_acl_not_assigned_to_host],
+            "assigned_object_id": [error_message_acl_not_assigned_to_host],
+        }
+    return {}
+
+
+class PrefetchedAccessListField(NestedAccessListSerializer):
+    """
+    Nested Access List field reading Access Lists referenced by ID from the "access_lists" context
+    mapping when they were prefetched for a list of objects, instead of querying them one at a time.
+    """
+
+    def to_internal_value(self, data):
+        access_lists = self.context.get("access_lists")
+        if access_lists is None or not isinstance(data, int):
+            return super().to_internal_value(data)
+        try:
+            return access_lists[data]
+        except KeyError:
+            raise serializers.ValidationError(f"Related object not found using the provided numeric ID: {data}")
+
+
+class PrefetchedContentTypeField(ContentTypeField):
+    """
+    Content type field reading the allowed content types from the "content_types" context
+    mapping when a list serializer prefetched them, instead of querying them one at a time.
+    """
+
+    def to_internal_value(self, data):
+        content_types = self.context.get("content_types")
+        if content_types is None:
+            return super().to_internal_value(data)
+        try:
+            return content_types[data]
+        except (KeyError, TypeError):
+            self.fail("does_not_exist", content_type=data)
+
+
+@extend_schema_field(
+    {
+        "type": "array",
+        "items": {"type": "array", "items": {"type": "integer"}, "minItems": 2, "maxItems": 2},
+        "nullable": True,
+    },
+)
+class PortRangeListField(serializers.Field):
+    """
+    Destination ports, represented as the list of their merged [low, high] ranges. Accepts ports,
+    [low, high] pairs and "low-high" strings.
+    """
+
+    default_error_messages = {
+        "invalid": 'Expected a list of ports, [low, high] pairs or "low-high" port ranges.',
+    }
+
+    def to_representation(self, value):
+        return value
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            self.fail("invalid")
+        ranges = []
+        try:
+            for item in data:
+                if isinstance(item, str):
+                    ranges.append(parse_port_range(item))
+                elif isinstance(item, list) and len(item) == 2 and all(type(port) is int for port in item):
+                    ranges.append(tuple(item))
+                elif type(item) is int:
+                    ranges.append((item, item))
+                else:
+                    self.fail("invalid")
+            return merge_port_ranges(ranges)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+
+class ACLInterfaceAssignmentListSerializer(serializers.ListSerializer):
+    """
+    Validates a list of ACL Interface Assignments with a fixed number of queries: the Access Lists,
+    the content types, the interfaces of each content type and the existing assignments.
+    Then inserts them in batches.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            access_list_ids = {item.get("access_list") for item in data if isinstance(item, dict)}
+            self.context["access_lists"] = AccessList.objects.in_bulk(
+                [pk for pk in access_list_ids if isinstance(pk, int)],
+            )
+            self.context["content_types"] = {
+                f"{content_type.app_label}.{content_type.model}": content_type
+                for content_type in ContentType.objects.filter(ACL_INTERFACE_ASSIGNMENT_MODELS)
+            }
+        validated_data = super().to_internal_value(data)
+
+        object_ids = defaultdict(set)
+        for attrs in validated_data:
+            object_ids[attrs["assigned_object_type"]].add(attrs["assigned_object_id"])
+        interfaces = {}
+        for content_type, ids in object_ids.items():
+            for pk, interface in get_assigned_interfaces(content_type, ids).items():
+                interfaces[content_type.pk, pk] = interface
+
+        existing_keys = set(
+            ACLInterfaceAssignment.objects.filter(
+                access_list__in={attrs["access_list"] for attrs in validated_data},
+                assigned_object_id__in={attrs["assigned_object_id"] for attrs in validated_data},
+            ).values_list("assigned_object_type", "assigned_object_id", "access_list")
+        )
+
+        errors = []
+        for attrs in validated_data:
+            key = (attrs["assigned_object_type"].pk, attrs["assigned_object_id"], attrs["access_list"].pk)
+            interface = interfaces.get(key[:2])
+            item_errors = get_interface_assignment_errors(attrs["access_list"], interface)
+            if key in existing_keys:
+                item_errors[api_settings.NON_FIELD_ERRORS_KEY] = [
+                    "The fields assigned_object_type, assigned_object_id, access_list must make a unique set."
+                ]
+            existing_keys.add(key)
+
+            if not item_errors:
+                # Validate the model the way ValidatedModelSerializer does for a single object, except
+                # for the related objects and uniqueness, already checked above for the whole list.
+                instance_attrs = {name: value for name, value in attrs.items() if name != "tags"}
+                try:
+                    ACLInterfaceAssignment(**instance_attrs).full_clean(
+                        exclude=["access_list", "assigned_object_type"],
+                        validate_unique=False,
+                    )
+                except DjangoValidationError as e:
+                    item_errors = e.message_dict
+                # Reuse the interface, and its host, when creating and serializing the assignment.
+                attrs["assigned_object"] = interface
+            errors.append(item_errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return validated_data
+
+    def create(self, validated_data):
+        assignments = []
+        for attrs in validated_data:
+            tags = attrs.pop("tags", [])
+            assignments.append((ACLInterfaceAssignment(**attrs), tags))
+        instances = bulk_create_objects(ACLInterfaceAssignment, assignments, self.context["request"], ignore_conflicts=True)
+        update_interface_assignments(instances)
+        return instances
+
+
 class ACLInterfaceAssignmentSerializer(NetBoxModelSerializer):
     """
     Defines the serializer for the django ACLInterfaceAssignment model & associates it to a view.
@@ -106,8 +343,8 @@ class ACLInterfaceAssignmentSerializer(NetBoxModelSerializer):
     url = serializers.HyperlinkedIdentityField(
         view_name="plugins-api:netbox_acls-api:aclinterfaceassignment-detail",
     )
-    access_list = NestedAccessListSerializer()
-    assigned_object_type = ContentTypeField(
+    access_list = PrefetchedAccessListField()
+    assigned_object_type = PrefetchedContentTypeField(
         queryset=ContentType.objects.filter(ACL_INTERFACE_ASSIGNMENT_MODELS),
     )
     assigned_object = serializers.SerializerMethodField(read_only=True)
@@ -118,6 +355,7 @@ class ACLInterfaceAssignmentSerializer(NetBoxModelSerializer):
         """
 
         model = ACLInterfaceAssignment
+        list_serializer_class = ACLInterfaceAssignmentListSerializer
         fields = (
             "id",
             "url",
@@ -134,41 +372,81 @@ class ACLInterfaceAssignmentSerializer(NetBoxModelSerializer):
 
     @extend_schema_field(serializers.DictField())
     def get_assigned_object(self, obj):
-        serializer = get_serializer_for_model(
-            obj.assigned_object,
-            prefix=NESTED_SERIALIZER_PREFIX,
-        )
+        if obj.assigned_object is None:
+            return None
+        serializer = get_nested_serializer(type(obj.assigned_object))
         context = {"request": self.context["request"]}
         return serializer(obj.assigned_object, context=context).data
 
+    def get_validators(self):
+        # The items of a list are checked for uniqueness all at once by the list serializer.
+        if isinstance(self.parent, ACLInterfaceAssignmentListSerializer):
+            return []
+        return super().get_validators()
+
     def validate(self, data):
         """
         Validate the AccessList django model's inputs before allowing it to update the instance.
           - Check that the GFK object is valid.
           - Check that the associated interface's parent host has the selected ACL defined.
+        The items of a list are validated all at once by the list serializer.
         """
-        error_message = {}
-        acl_host = data["access_list"].assigned_object
-
-        if data["assigned_object_type"].model == "interface":
-            interface_host = data["assigned_object_type"].get_object_for_this_type(id=data["assigned_object_id"]).device
-        elif data["assigned_object_type"].model == "vminterface":
-            interface_host = data["assigned_object_type"].get_object_for_this_type(id=data["assigned_object_id"]).virtual_machine
-        else:
-            interface_host = None
-        # Check that the associated interface's parent host has the selected ACL defined.
-        if acl_host != interface_host:
-            error_acl_not_assigned_to_host = "Access List not present on the selected interface's host."
-            error_message["access_list"] = [error_acl_not_assigned_to_host]
-            error_message["assigned_object_id"] = [error_acl_not_assigned_to_host]
+        if isinstance(self.parent, ACLInterfaceAssignmentListSerializer):
+            return data
 
+        interfaces = get_assigned_interfaces(data["assigned_object_type"], [data["assigned_object_id"]])
+        error_message = get_interface_assignment_errors(data["access_list"], interfaces.get(data["assigned_object_id"]))
         if error_message:
             raise serializers.ValidationError(error_message)
 
         return super().validate(data)
 
 
-class ACLIngressRuleSerializer(NetBoxModelSerializer):
+class BulkWriteSerializerMixin:
+    """
+    Leaves the model validation and uniqueness checks to the bulk write mode of the rule APIs
+    (see get_rule_errors), which performs them for a whole list at once, when the "bulk_write"
+    context flag is set.
+    """
+
+    def get_validators(self):
+        if self.context.get("bulk_write"):
+            return []
+        return super().get_validators()
+
+    def validate(self, data):
+        if self.context.get("bulk_write"):
+            return data
+        return super().validate(data)
+
+
+class RuleSequenceSerializerMixin(serializers.Serializer):
+    """
+    Inserts a rule without a sequence number after the given one, in the middle of the gap up to the
+    next rule (see ACLRule.get_sequence_after), rather than appending it to the Access List.
+    """
+
+    insert_after = serializers.IntegerField(
+        write_only=True,
+        required=False,
+        min_value=0,
+        help_text="Sequence number to insert the rule after, when no sequence is set",
+    )
+
+    def validate(self, data):
+        insert_after = data.pop("insert_after", None)
+        if insert_after is not None and data.get("sequence") is None:
+            if self.context.get("bulk_write"):
+                raise serializers.ValidationError({"insert_after": ["Set the sequence of each rule in bulk write mode."]})
+            access_list = data.get("access_list") or self.instance.access_list
+            try:
+                data["sequence"] = self.Meta.model.get_sequence_after(access_list.pk, insert_after)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError(e.message_dict)
+        return super().validate(data)
+
+
+class ACLIngressRuleSerializer(RuleSequenceSerializerMixin, BulkWriteSerializerMixin, NetBoxModelSerializer):
     """
     Defines the serializer for the django ACLIngressRule model & associates it to a view.
     """
@@ -176,7 +454,8 @@ class ACLIngressRuleSerializer(NetBoxModelSerializer):
     url = serializers.HyperlinkedIdentityField(
         view_name="plugins-api:netbox_acls-api:aclingressrule-detail",
     )
-    access_list = NestedAccessListSerializer()
+    access_list = PrefetchedAccessListField()
+    destination_ports = PortRangeListField(required=False, allow_null=True)
 
     class Meta:
         """
@@ -189,13 +468,17 @@ class ACLIngressRuleSerializer(NetBoxModelSerializer):
             "url",
             "display",
             "access_list",
+            "sequence",
+            "insert_after",
             "tags",
             "description",
             "created",
             "custom_fields",
             "last_updated",
             "source_prefix",
+            "destination_ports",
             "protocol",
+            "tcam_entry_count",
         )
 
     def validate(self, data):
@@ -225,7 +508,7 @@ class ACLIngressRuleSerializer(NetBoxModelSerializer):
         return super().validate(data)
 
 
-class ACLEgressRuleSerializer(NetBoxModelSerializer):
+class ACLEgressRuleSerializer(RuleSequenceSerializerMixin, BulkWriteSerializerMixin, NetBoxModelSerializer):
     """
     Defines the serializer for the django ACLEgressRule model & associates it to a view.
     """
@@ -233,7 +516,8 @@ class ACLEgressRuleSerializer(NetBoxModelSerializer):
     url = serializers.HyperlinkedIdentityField(
         view_name="plugins-api:netbox_acls-api:aclegressrule-detail",
     )
-    access_list = NestedAccessListSerializer()
+    access_list = PrefetchedAccessListField()
+    destination_ports = PortRangeListField(required=False, allow_null=True)
 
     class Meta:
         """
@@ -246,6 +530,8 @@ class ACLEgressRuleSerializer(NetBoxModelSerializer):
             "url",
             "display",
             "access_list",
+            "sequence",
+            "insert_after",
             "tags",
             "description",
             "created",
@@ -254,6 +540,7 @@ class ACLEgressRuleSerializer(NetBoxModelSerializer):
             "destination_prefix",
             "destination_ports",
             "protocol",
+            "tcam_entry_count",
         )
 
     def validate(self, data):
@@ -281,3 +568,447 @@ class ACLEgressRuleSerializer(NetBoxModelSerializer):
             raise serializers.ValidationError(error_message)
 
         return super().validate(data)
+
+
+class ACLFlowSerializer(serializers.Serializer):
+    """
+    Defines a flow to evaluate against an Access List.
+    Ingress Access Lists match the flow's source, egress Access Lists match its destination.
+    """
+
+    source = serializers.IPAddressField(required=False)
+    destination = serializers.IPAddressField(required=False)
+    protocol = ChoiceField(choices=ACLProtocolChoices)
+    port = serializers.IntegerField(required=False, min_value=0, max_value=MAX_PORT)
+
+    def validate(self, data):
+        """
+        Validates the flow before evaluating it:
+          - Check if protocol set to something other than icmp, but no destination port set.
+          - Check that the address matched by the Access List's type is set.
+        """
+        error_message = {}
+
+        # Check if protocol set to something other than icmp, but no destination port set.
+        if data.get("protocol") != ACLProtocolChoices.PROTOCOL_ICMP and data.get("port") is None:
+            error_message["port"] = [
+                "Protocol is set to TCP or UDP, Destination Port MUST be set.",
+            ]
+
+        # Check that the address matched by the Access List's type is set.
+        access_list = self.context.get("access_list")
+        if access_list:
+            if access_list.type == ACLAssignmentDirectionChoices.DIRECTION_EGRESS:
+                address_field = "destination"
+            else:
+                address_field = "source"
+            if not data.get(address_field):
+                error_message[address_field] = [
+                    f"This field is required to evaluate a flow against an {access_list.get_type_display()} Access List.",
+                ]
+
+        if error_message:
+            raise serializers.ValidationError(error_message)
+
+        return super().validate(data)
+
+
+class ACLFlowResultSerializer(serializers.Serializer):
+    """
+    Defines the result of evaluating a flow against an Access List.
+    """
+
+    access_list = NestedAccessListSerializer(read_only=True)
+    verdict = ChoiceField(choices=ACLVerdictChoices, read_only=True)
+    rule = serializers.IntegerField(read_only=True, allow_null=True)
+
+
+class ACLFlowSimulationSerializer(serializers.Serializer):
+    """
+    Defines a batch of flows to evaluate against the Access Lists assigned to an interface.
+    Each flow is a [source, destination, protocol, port] list.
+    """
+
+    assigned_object_type = ContentTypeField(
+        queryset=ContentType.objects.filter(ACL_INTERFACE_ASSIGNMENT_MODELS),
+    )
+    assigned_object_id = serializers.IntegerField(min_value=1)
+    direction = ChoiceField(choices=ACLAssignmentDirectionChoices, required=False)
+    flows = serializers.ListField(allow_empty=False)
+
+    def validate_flows(self, value):
+        """
+        Parse the flows once, so that they can be evaluated in a single batch.
+        """
+        try:
+            return parse_flows(value)
+        except ValueError as error:
+            raise serializers.ValidationError(str(error))
+
+
+class ACLRuleFindingSerializer(serializers.Serializer):
+    """
+    Defines a rule flagged by the analysis of an Access List.
+    """
+
+    rule = serializers.IntegerField(read_only=True)
+    kind = ChoiceField(choices=ACLRuleFindingChoices, read_only=True)
+    related = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+
+
+class ACLRenderSerializer(serializers.Serializer):
+    """
+    Defines the device platform to render an Access List for.
+    """
+
+    platform = ChoiceField(choices=ACLRenderPlatformChoices)
+
+
+class ACLRenumberSerializer(serializers.Serializer):
+    """
+    Defines the numbering of the rules of an Access List: the first sequence number and the step between rules.
+    """
+
+    start = serializers.IntegerField(default=ACL_RULE_SEQUENCE_STEP, min_value=0)
+    step = serializers.IntegerField(default=ACL_RULE_SEQUENCE_STEP, min_value=1)
+
+
+class ACLExportSerializer(serializers.Serializer):
+    """
+    Defines the format of a rule export. Named export_format, as "format" is reserved by the API.
+    """
+
+    export_format = ChoiceField(choices=ACLExportFormatChoices, default=ACLExportFormatChoices.FORMAT_NDJSON)
+
+
+class ACLEffectiveRuleSerializer(serializers.ModelSerializer):
+    """
+    Defines the read-only serializer for the django ACLEffectiveRule model & associates it to a view.
+    """
+
+    assigned_object_type = ContentTypeField(read_only=True)
+    direction = ChoiceField(choices=ACLAssignmentDirectionChoices, read_only=True)
+    access_list = NestedAccessListSerializer(read_only=True)
+    rule = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        """
+        Associates the django model ACLEffectiveRule & fields to the serializer.
+        """
+
+        model = ACLEffectiveRule
+        fields = (
+            "id",
+            "assigned_object_type",
+            "assigned_object_id",
+            "direction",
+            "assignment",
+            "access_list",
+            "rule",
+        )
+        read_only_fields = fields
+
+    @extend_schema_field(serializers.DictField())
+    def get_rule(self, obj):
+        rule = obj.rule
+        return {
+            "id": rule.pk,
+            "sequence": rule.sequence,
+            "description": rule.description,
+            "prefix": getattr(rule, rule.prefix_field),
+            "protocol": rule.protocol,
+            "destination_ports": rule.destination_ports,
+        }
+
+
+class ACLBulkWriteResultSerializer(serializers.Serializer):
+    """
+    Defines the outcome of a bulk write of rules: the number of rules written and the throughput.
+    """
+
+    action = serializers.CharField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+    duration = serializers.FloatField(read_only=True, help_text="Seconds")
+    rate = serializers.FloatField(read_only=True, help_text="Rules per second")
+
+
+class ACLChangeFeedSerializer(serializers.Serializer):
+    """
+    Defines the position and size of a page of the change feed.
+    """
+
+    cursor = serializers.CharField(required=False, help_text="Cursor returned by the previous page; omit to start over")
+    limit = serializers.IntegerField(default=100, min_value=1, max_value=1000)
+
+    def validate_cursor(self, value):
+        try:
+            decode_cursor(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+
+class ACLChangeSerializer(serializers.Serializer):
+    """
+    Defines an object created or changed, with its current representation, or deleted.
+    """
+
+    object_type = serializers.CharField(read_only=True)
+    object_id = serializers.IntegerField(read_only=True)
+    time = serializers.DateTimeField(read_only=True)
+    deleted = serializers.BooleanField(read_only=True)
+    object = serializers.DictField(read_only=True, allow_null=True)
+
+
+class ACLChangeFeedResultSerializer(serializers.Serializer):
+    """
+    Defines a page of the change feed and the cursor of the next one.
+    """
+
+    results = ACLChangeSerializer(many=True, read_only=True)
+    cursor = serializers.CharField(read_only=True, allow_null=True)
+    has_more = serializers.BooleanField(read_only=True)
+
+
+class ACLCoverageSerializer(serializers.Serializer):
+    """
+    Defines the address or prefix, and optionally the protocol and destination port, to find the covering rules of.
+    """
+
+    prefix = serializers.CharField(help_text="IP address or prefix")
+    protocol = ChoiceField(choices=ACLProtocolChoices, required=False)
+    port = serializers.IntegerField(required=False, min_value=0, max_value=MAX_PORT)
+    direction = ChoiceField(choices=ACLAssignmentDirectionChoices, required=False)
+    limit = serializers.IntegerField(default=100, min_value=1, max_value=1000, help_text="Maximum number of rules per direction")
+
+    def validate_prefix(self, value):
+        network = parse_prefix(value)
+        if network is None:
+            raise serializers.ValidationError(f"{value} is not a valid IPv4 or IPv6 address or prefix.")
+        return network
+
+    def validate(self, data):
+        if data.get("protocol") == ACLProtocolChoices.PROTOCOL_ICMP and data.get("port") is not None:
+            raise serializers.ValidationError({"port": ["Protocol is set to ICMP, Destination Port CANNOT be set."]})
+        return super().validate(data)
+
+
+class ACLCoveringRuleSerializer(serializers.Serializer):
+    """
+    Defines a rule covering the looked up prefix.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    sequence = serializers.IntegerField(read_only=True)
+    description = serializers.CharField(read_only=True)
+    prefix = serializers.CharField(read_only=True)
+    protocol = ChoiceField(choices=ACLProtocolChoices, read_only=True)
+    destination_ports = PortRangeListField(read_only=True, allow_null=True)
+
+
+class ACLCoveringAssignmentSerializer(serializers.Serializer):
+    """
+    Defines an interface or VM interface a covering Access List is assigned to.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    assigned_object_type = serializers.CharField(read_only=True)
+    assigned_object_id = serializers.IntegerField(read_only=True)
+    assigned_object = serializers.DictField(read_only=True, allow_null=True)
+
+
+class ACLCoveringAccessListSerializer(serializers.Serializer):
+    """
+    Defines an Access List with its rules covering the looked up prefix, and its interface assignments.
+    """
+
+    access_list = NestedAccessListSerializer(read_only=True)
+    rules = ACLCoveringRuleSerializer(many=True, read_only=True)
+    assignments = ACLCoveringAssignmentSerializer(many=True, read_only=True)
+
+
+class ACLCoverageResultSerializer(serializers.Serializer):
+    """
+    Defines the Access Lists covering a prefix, and whether covering rules were left out past the limit.
+    """
+
+    results = ACLCoveringAccessListSerializer(many=True, read_only=True)
+    truncated = serializers.BooleanField(read_only=True)
+
+
+class ACLImpactSerializer(serializers.Serializer):
+    """
+    Defines the proposed rules to compare an Access List's rules with. Each rule is a {prefix, protocol,
+    destination_ports} object; rules only permit traffic, so their order does not matter.
+    """
+
+    rules = serializers.ListField(child=serializers.DictField())
+    limit = serializers.IntegerField(default=1000, min_value=1, max_value=10000, help_text="Maximum number of regions")
+
+    def validate_rules(self, value):
+        """
+        Parse the rules once, so that they can be compared in a single pass.
+        """
+        try:
+            return parse_rule_entries(value)
+        except ValueError as error:
+            raise serializers.ValidationError(str(error))
+
+
+class ACLImpactRegionSerializer(serializers.Serializer):
+    """
+    Defines traffic permitted by only one of the compared sets of rules: the prefixes of an address range,
+    a protocol, and destination ports (null for ICMP).
+    """
+
+    prefixes = serializers.ListField(child=serializers.CharField(), read_only=True)
+    protocol = ChoiceField(choices=ACLProtocolChoices, read_only=True)
+    destination_ports = PortRangeListField(read_only=True, allow_null=True)
+
+
+class ACLImpactFlowSerializer(serializers.Serializer):
+    """
+    Defines a flow permitted by only one of the compared sets of rules.
+    """
+
+    address = serializers.CharField(read_only=True)
+    protocol = ChoiceField(choices=ACLProtocolChoices, read_only=True)
+    port = serializers.IntegerField(read_only=True, allow_null=True)
+    permitted_by_current = serializers.BooleanField(read_only=True)
+    permitted_by_proposed = serializers.BooleanField(read_only=True)
+
+
+class ACLImpactResultSerializer(serializers.Serializer):
+    """
+    Defines the impact of replacing the rules of an Access List with proposed ones.
+    """
+
+    access_list = NestedAccessListSerializer(read_only=True)
+    equivalent = serializers.BooleanField(read_only=True)
+    counterexample = ACLImpactFlowSerializer(read_only=True, allow_null=True)
+    added = ACLImpactRegionSerializer(many=True, read_only=True)
+    removed = ACLImpactRegionSerializer(many=True, read_only=True)
+    truncated = serializers.BooleanField(read_only=True)
+
+
+class ACLHistoryDiffSerializer(serializers.Serializer):
+    """
+    Defines the two points of the change history of an Access List to compare its rules at, as times or
+    change log entry IDs. The start defaults to the oldest change kept, the end to the latest change.
+    """
+
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    start_change = serializers.IntegerField(required=False, min_value=1, help_text="ID of the change log entry to start after")
+    end_change = serializers.IntegerField(required=False, min_value=1, help_text="ID of the change log entry to end at")
+    limit = serializers.IntegerField(default=10000, min_value=1, max_value=100000, help_text="Maximum number of changed rules")
+
+    def validate(self, data):
+        for field in ("start", "end"):
+            if data.get(field) is not None and data.get(f"{field}_change") is not None:
+                raise serializers.ValidationError({f"{field}_change": [f"Cannot be set along with {field}."]})
+        return super().validate(data)
+
+
+class ACLRuleVersionSerializer(serializers.Serializer):
+    """
+    Defines a rule at a point of the change history of its Access List.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    sequence = serializers.IntegerField(read_only=True, allow_null=True)
+    prefix = serializers.CharField(read_only=True)
+    protocol = ChoiceField(choices=ACLProtocolChoices, read_only=True, allow_null=True)
+    destination_ports = PortRangeListField(read_only=True)
+    description = serializers.CharField(read_only=True)
+
+
+class ACLRuleModificationSerializer(serializers.Serializer):
+    """
+    Defines a rule modified between two points of the change history of its Access List.
+    """
+
+    before = ACLRuleVersionSerializer(read_only=True)
+    after = ACLRuleVersionSerializer(read_only=True)
+
+
+class ACLHistoryDiffResultSerializer(serializers.Serializer):
+    """
+    Defines the rules added, removed and modified between two points of the change history of an Access List.
+    """
+
+    access_list = NestedAccessListSerializer(read_only=True)
+    added = ACLRuleVersionSerializer(many=True, read_only=True)
+    removed = ACLRuleVersionSerializer(many=True, read_only=True)
+    modified = ACLRuleModificationSerializer(many=True, read_only=True)
+    truncated = serializers.BooleanField(read_only=True)
+
+
+class ACLOptimizeSerializer(serializers.Serializer):
+    """
+    Defines whether to apply the optimization of an Access List, and to run it in a background job, as
+    it always does for large Access Lists.
+    """
+
+    apply = serializers.BooleanField(default=False, help_text="Replace the rules with the optimized rules")
+    background = serializers.BooleanField(default=False, help_text="Run in a background job")
+
+
+class ACLOptimizedRuleSerializer(serializers.Serializer):
+    """
+    Defines a rule of the optimized rules of an Access List.
+    """
+
+    prefix = serializers.CharField(read_only=True)
+    protocol = ChoiceField(choices=ACLProtocolChoices, read_only=True)
+    destination_ports = PortRangeListField(read_only=True, allow_null=True)
+
+
+class ACLOptimizationResultSerializer(serializers.Serializer):
+    """
+    Defines the result of the optimization of an Access List: the numbers of rules before and after, the
+    optimized rules, and the numbers of rules created and deleted when they were applied.
+    """
+
+    access_list = NestedAccessListSerializer(read_only=True)
+    before = serializers.IntegerField(read_only=True)
+    after = serializers.IntegerField(read_only=True)
+    applied = serializers.BooleanField(read_only=True)
+    created = serializers.IntegerField(read_only=True)
+    deleted = serializers.IntegerField(read_only=True)
+    rules = ACLOptimizedRuleSerializer(many=True, read_only=True)
+
+
+class ACLTCAMUsageSerializer(serializers.Serializer):
+    """
+    Defines how to aggregate the TCAM entries of the Access Lists: per device role or per interface.
+    """
+
+    group_by = serializers.ChoiceField(choices=TCAM_USAGE_GROUPS, default=TCAM_USAGE_GROUPS[0])
+    direction = ChoiceField(
+        choices=ACLAssignmentDirectionChoices,
+        required=False,
+        help_text="Type of the Access Lists, when grouped by interface",
+    )
+    limit = serializers.IntegerField(default=100, min_value=1, max_value=1000, help_text="Maximum number of objects")
+
+
+class ACLTCAMUsageEntrySerializer(serializers.Serializer):
+    """
+    Defines the TCAM entries of the Access Lists of a device role or interface.
+    """
+
+    assigned_object_type = serializers.CharField(read_only=True)
+    assigned_object_id = serializers.IntegerField(read_only=True)
+    assigned_object = serializers.DictField(read_only=True, allow_null=True)
+    access_list_count = serializers.IntegerField(read_only=True)
+    tcam_entry_count = serializers.IntegerField(read_only=True)
+
+
+class ACLTCAMUsageResultSerializer(serializers.Serializer):
+    """
+    Defines the TCAM usage of the device roles or interfaces, from the largest, and whether some were left out past the limit.
+    """
+
+    results = ACLTCAMUsageEntrySerializer(many=True, read_only=True)
+    truncated = serializers.BooleanField(read_only=True)
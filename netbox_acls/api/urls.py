@@ -13,5 +13,9 @@ router.register("access-lists", views.AccessListViewSet)
 router.register("interface-assignments", views.ACLInterfaceAssignmentViewSet)
 router.register("standard-acl-rules", views.ACLIngressRuleViewSet)
 router.register("extended-acl-rules", views.ACLEgressRuleViewSet)
+router.register("effective-rules", views.ACLEffectiveRuleViewSet)
+router.register("changes", views.ACLChangeViewSet, basename="change")
+router.register("coverage", views.ACLCoverageViewSet, basename="coverage")
+router.register("tcam-usage", views.ACLTCAMUsageViewSet, basename="tcam-usage")
 
 urlpatterns = router.urls
@@ -4,40 +4,596 @@ A view set is a single class that can handle the view, add, change,
 and delete operations which each require dedicated views under the UI.
 """
 
-from django.db.models import Count
+import hashlib
+import time
+
+from core.api.serializers import JobSerializer
+from core.models import Job
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import NON_FIELD_ERRORS, ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
+from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
+from netbox.api.serializers import BulkOperationSerializer
 from netbox.api.viewsets import NetBoxModelViewSet
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.viewsets import ReadOnlyModelViewSet, ViewSet
+from utilities.permissions import get_permission_for_model
 
 from .. import filtersets, models
+from ..bulk import bulk_create_rules, bulk_delete_objects, bulk_update_objects, get_rule_errors
+from ..changes import get_changes
+from ..coverage import get_coverage
+from ..choices import ACLAssignmentDirectionChoices, ACLVerdictChoices
+from ..constants import ACL_OPTIMIZE_BACKGROUND_RULE_COUNT
+from ..engine import (
+    RuleSet,
+    compare_rule_sets,
+    get_compiled_access_list,
+    get_counterexample,
+    get_region_prefixes,
+    get_rule_analysis,
+    get_rule_entries,
+    simulate_flows,
+)
+from ..exports import EXPORT_CONTENT_TYPES, get_rule_export_rows, stream_export
+from ..history import get_change_position, get_rule_history_diff
+from ..optimizer import OPTIMIZE_JOB_NAME, optimize_access_list, optimize_access_list_job
+from ..renderers import render_access_list
+from ..signals import defer_rule_updates, update_access_lists, update_effective_rules
+from ..tcam import get_tcam_usage
+from .nested_serializers import NestedAccessListSerializer
+from .pagination import RuleCursorPagination
 from .serializers import (
     AccessListSerializer,
+    ACLBulkWriteResultSerializer,
+    ACLChangeFeedResultSerializer,
+    ACLChangeFeedSerializer,
+    ACLCoverageResultSerializer,
+    ACLCoverageSerializer,
+    ACLEffectiveRuleSerializer,
+    ACLExportSerializer,
+    ACLFlowResultSerializer,
+    ACLFlowSerializer,
+    ACLFlowSimulationSerializer,
+    ACLHistoryDiffResultSerializer,
+    ACLHistoryDiffSerializer,
+    ACLImpactResultSerializer,
+    ACLImpactSerializer,
+    ACLOptimizationResultSerializer,
+    ACLOptimizeSerializer,
+    ACLRenderSerializer,
+    ACLRenumberSerializer,
+    ACLRuleFindingSerializer,
+    ACLTCAMUsageResultSerializer,
+    ACLTCAMUsageSerializer,
     ACLEgressRuleSerializer,
     ACLInterfaceAssignmentSerializer,
     ACLIngressRuleSerializer,
+    get_nested_serializer,
 )
 
 __all__ = [
     "AccessListViewSet",
+    "ACLChangeViewSet",
+    "ACLCoverageViewSet",
+    "ACLEffectiveRuleViewSet",
     "ACLIngressRuleViewSet",
     "ACLInterfaceAssignmentViewSet",
     "ACLEgressRuleViewSet",
+    "ACLTCAMUsageViewSet",
 ]
 
 
-class AccessListViewSet(NetBoxModelViewSet):
+class RuleUpdatesDeferredMixin:
     """
-    Defines the view set for the django AccessList model & associates it to a view.
+    Refresh the rule counters and rendered configurations of the touched Access Lists
+    once at the end of each request, so that bulk operations do not refresh them once per rule.
     """
 
-    queryset = (
-        models.AccessList.objects.prefetch_related("tags")
-        .annotate(
-            rule_count=Count("aclegressrules") + Count("aclingressrules"),
+    def dispatch(self, request, *args, **kwargs):
+        with defer_rule_updates():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class RuleExportMixin:
+    """
+    Stream every rule matching the view set's filters as NDJSON or CSV, in a single response.
+    """
+
+    @extend_schema(parameters=[ACLExportSerializer], responses={(200, "application/x-ndjson"): OpenApiTypes.STR})
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        params = ACLExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        export_format = params.validated_data["export_format"]
+
+        rows = get_rule_export_rows(self.filter_queryset(self.get_queryset()))
+        response = StreamingHttpResponse(
+            stream_export(rows, export_format),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
         )
-        .prefetch_related("tags")
-    )
+        response["Content-Disposition"] = f'attachment; filename="{rows.model._meta.model_name}s.{export_format}"'
+        return response
+
+
+class RuleCursorPaginationMixin:
+    """
+    Opt-in keyset pagination of rule lists (see RuleCursorPagination), enabled by the cursor query
+    parameter: pass an empty cursor for the first page, then follow the next and previous links.
+    Lists are otherwise paginated by offset.
+    """
+
+    @property
+    def paginator(self):
+        cursor_requested = RuleCursorPagination.cursor_query_param in self.request.query_params
+        if not hasattr(self, "_paginator") and self.action == "list" and cursor_requested:
+            self._paginator = RuleCursorPagination()
+        return super().paginator
+
+
+class RuleBulkWriteMixin:
+    """
+    Opt-in bulk write mode for lists of rules, enabled with the bulk_write=true query parameter on
+    list creations, updates and deletions. The whole list is validated at once, then written with
+    bulk_create, bulk_update or set-based deletes in a single transaction, with change log entries
+    and webhooks recorded in batches. Responds with the number of rules written and the throughput,
+    rather than the rules themselves.
+    """
+
+    def is_bulk_write(self):
+        return self.request.query_params.get("bulk_write", "").lower() in ("true", "1")
+
+    def get_bulk_write_response(self, action, write, status_code=status.HTTP_200_OK):
+        started = time.monotonic()
+        with transaction.atomic():
+            count = write()
+        duration = time.monotonic() - started
+        result = {
+            "action": action,
+            "count": count,
+            "duration": duration,
+            "rate": count / duration if duration else 0.0,
+        }
+        return Response(ACLBulkWriteResultSerializer(result).data, status=status_code)
+
+    def validate_bulk_write(self, data, instances=None, partial=False):
+        """
+        Validate a list of rules to create, or of changes to the given rules, returning the
+        (rule, tags) pairs to write and the names of the changed fields. Raises a ValidationError
+        holding the errors of each item.
+        """
+        model = self.queryset.model
+        context = self.get_serializer_context()
+        context["bulk_write"] = True
+        context["access_lists"] = models.AccessList.objects.in_bulk(
+            {item["access_list"] for item in data if isinstance(item, dict) and isinstance(item.get("access_list"), int)},
+        )
+        serializer_class = self.get_serializer_class()
+
+        objects = []
+        errors = []
+        fields = set(model.get_derived_fields())
+        for index, item in enumerate(data):
+            instance = instances[index] if instances else None
+            serializer = serializer_class(instance, data=item, partial=partial, context=context)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            attrs = dict(serializer.validated_data)
+            tags = attrs.pop("tags", None)
+            if instance is None:
+                instance = model(**attrs)
+                tags = tags or []
+            else:
+                instance.snapshot()
+                for name, value in attrs.items():
+                    setattr(instance, name, value)
+                fields.update(attrs)
+            instance.update_derived_fields()
+            objects.append((instance, tags))
+            errors.append({})
+
+        # Validate the models of the items which passed the serializer validation.
+        rule_errors = iter(get_rule_errors(model, [instance for instance, _ in objects]))
+        for item_errors in errors:
+            if not item_errors:
+                item_errors.update(next(rule_errors))
+                if NON_FIELD_ERRORS in item_errors:
+                    item_errors[api_settings.NON_FIELD_ERRORS_KEY] = item_errors.pop(NON_FIELD_ERRORS)
+        if any(errors):
+            raise ValidationError(errors)
+        return objects, fields
+
+    def validate_bulk_written_objects(self, instances):
+        # Enforce the object-level permissions on the written rules, as NetBoxModelViewSet does.
+        try:
+            self._validate_objects(instances)
+        except ObjectDoesNotExist:
+            raise PermissionDenied()
+
+    def create(self, request, *args, **kwargs):
+        if not self.is_bulk_write() or not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        def write():
+            model = self.queryset.model
+            objects, _ = self.validate_bulk_write(request.data)
+            instances = bulk_create_rules(model, objects, request)
+            self.validate_bulk_written_objects(instances)
+            update_access_lists({instance.access_list_id for instance in instances})
+            update_effective_rules(model, [instance.pk for instance in instances])
+            return len(instances)
+
+        return self.get_bulk_write_response(ObjectChangeActionChoices.ACTION_CREATE, write, status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, *args, **kwargs):
+        if not self.is_bulk_write():
+            return super().bulk_update(request, *args, **kwargs)
+        partial = kwargs.pop("partial", False)
+        serializer = BulkOperationSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        def write():
+            model = self.queryset.model
+            # Like NetBoxModelViewSet, skip the rules which do not exist or may not be changed.
+            instances = self.get_queryset().in_bulk([item["id"] for item in serializer.validated_data])
+            changed_instances = []
+            data = []
+            for operation, item in zip(serializer.validated_data, request.data):
+                if operation["id"] in instances:
+                    changed_instances.append(instances[operation["id"]])
+                    data.append({name: value for name, value in item.items() if name != "id"})
+            previous_access_list_ids = {instance.pk: instance.access_list_id for instance in changed_instances}
+
+            objects, fields = self.validate_bulk_write(data, changed_instances, partial=partial)
+            bulk_update_objects(model, objects, fields, request)
+            self.validate_bulk_written_objects(changed_instances)
+            update_access_lists({*previous_access_list_ids.values(), *(instance.access_list_id for instance in changed_instances)})
+            update_effective_rules(
+                model,
+                [instance.pk for instance in changed_instances if instance.access_list_id != previous_access_list_ids[instance.pk]],
+            )
+            return len(changed_instances)
+
+        return self.get_bulk_write_response(ObjectChangeActionChoices.ACTION_UPDATE, write)
+
+    def bulk_destroy(self, request, *args, **kwargs):
+        if not self.is_bulk_write():
+            return super().bulk_destroy(request, *args, **kwargs)
+        serializer = BulkOperationSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        def write():
+            model = self.queryset.model
+            # Like NetBoxModelViewSet, skip the rules which do not exist or may not be deleted.
+            rules = self.get_queryset().filter(pk__in=[item["id"] for item in serializer.validated_data])
+            access_list_ids = set(rules.order_by().values_list("access_list", flat=True).distinct())
+            count = bulk_delete_objects(model, list(rules.values_list("pk", flat=True)))
+            update_access_lists(access_list_ids)
+            return count
+
+        return self.get_bulk_write_response(ObjectChangeActionChoices.ACTION_DELETE, write)
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests for lists and objects with an ETag computed from a cheap aggregate of the
+    queried rows (see get_version()), and with 304 Not Modified when it matches the client's
+    If-None-Match, without fetching or serializing the rows. The Last-Modified header is set for
+    information only: deletions do not change it, so requests are only conditional on the ETag.
+
+    Related objects nested in the responses are covered through version_related_fields, whose last
+    update is folded into the ETag. Data of nested objects changing without updating them, e.g. their
+    counters, does not change it.
+    """
+
+    # Foreign keys to the related objects nested in the responses.
+    version_related_fields = ()
+
+    def get_version_aggregates(self):
+        return {
+            "count": Count("pk"),
+            "last_updated": Max("last_updated"),
+            **{f"{field}__last_updated": Max(f"{field}__last_updated") for field in self.version_related_fields},
+        }
+
+    def get_version(self, queryset):
+        """
+        Return a value changing whenever any of the rows of the queryset is created, changed or
+        deleted, and their last update.
+        """
+        version = queryset.order_by().aggregate(**self.get_version_aggregates())
+        return version, version["last_updated"]
+
+    def get_version_conditional_response(self, request, queryset, respond):
+        version, last_modified = self.get_version(queryset)
+        # The response also depends on the query string (filters, pagination, brief mode), the format and the user.
+        validator = repr((request.get_full_path(), request.accepted_renderer.format, request.user.pk, version))
+        etag = quote_etag(hashlib.sha1(validator.encode()).hexdigest())
+
+        response = get_conditional_response(request, etag=etag) or respond()
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_version_conditional_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_version_conditional_response(
+            request,
+            self.get_queryset().filter(pk=kwargs[self.lookup_field]),
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+
+class AccessListViewSet(RuleUpdatesDeferredMixin, ConditionalGetMixin, NetBoxModelViewSet):
+    """
+    Defines the view set for the django AccessList model & associates it to a view.
+    """
+
+    queryset = models.AccessList.objects.prefetch_related("tags").with_assigned_objects()
     serializer_class = AccessListSerializer
     filterset_class = filtersets.AccessListFilterSet
 
+    def get_version_aggregates(self):
+        # The rule counters are refreshed without touching last_updated.
+        return {
+            **super().get_version_aggregates(),
+            "rule_count": Sum("rule_count"),
+            "icmp_rule_count": Sum("icmp_rule_count"),
+            "tcp_rule_count": Sum("tcp_rule_count"),
+            "udp_rule_count": Sum("udp_rule_count"),
+            "tcam_entry_count": Sum("tcam_entry_count"),
+        }
+
+    def get_version(self, queryset):
+        # The rules' last update also tells rules moved between two of the Access Lists apart.
+        version, last_modified = super().get_version(queryset)
+        for model in (models.ACLIngressRule, models.ACLEgressRule):
+            rules = model.objects.filter(access_list__in=queryset.order_by().values("pk"))
+            version[model._meta.model_name] = rules.aggregate(last_updated=Max("last_updated"))["last_updated"]
+        # The assigned objects nested in the responses, e.g. renamed device roles, with a query per type.
+        assigned_objects = queryset.order_by().values_list("assigned_object_type", "assigned_object_id")
+        for content_type_id in set(assigned_objects.values_list("assigned_object_type", flat=True).distinct()):
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            object_ids = assigned_objects.filter(assigned_object_type=content_type_id).values("assigned_object_id")
+            last_updated = model.objects.filter(pk__in=object_ids).aggregate(last_updated=Max("last_updated"))["last_updated"]
+            version[model._meta.label_lower] = last_updated
+        return version, last_modified
+
+    @extend_schema(parameters=[ACLFlowSerializer], responses=ACLFlowResultSerializer)
+    @action(detail=True, methods=["get"], url_path="match")
+    def match(self, request, pk):
+        """
+        Evaluate a single flow against the Access List, using its compiled (and cached) matcher.
+        """
+        access_list = self.get_object()
+        flow = ACLFlowSerializer(data=request.query_params, context={"access_list": access_list})
+        flow.is_valid(raise_exception=True)
+
+        if access_list.type == ACLAssignmentDirectionChoices.DIRECTION_EGRESS:
+            address = flow.validated_data["destination"]
+        else:
+            address = flow.validated_data["source"]
+        rule_id = get_compiled_access_list(access_list).match(
+            address,
+            flow.validated_data["protocol"],
+            flow.validated_data.get("port"),
+        )
+
+        result = {
+            "access_list": access_list,
+            "verdict": ACLVerdictChoices.VERDICT_PERMIT if rule_id else ACLVerdictChoices.VERDICT_DENY,
+            "rule": rule_id,
+        }
+        return Response(ACLFlowResultSerializer(result, context={"request": request}).data)
+
+    @extend_schema(responses=ACLRuleFindingSerializer(many=True))
+    @action(detail=True, methods=["get"], url_path="analysis")
+    def analysis(self, request, pk):
+        """
+        Report the duplicate, shadowed and overlapping rules of the Access List.
+        """
+        access_list = self.get_object()
+        findings = get_rule_analysis(access_list)
+        return Response(
+            {
+                "access_list": NestedAccessListSerializer(access_list, context={"request": request}).data,
+                "findings": ACLRuleFindingSerializer(findings, many=True).data,
+            },
+        )
+
+    @extend_schema(parameters=[ACLRenderSerializer], responses={(200, "text/plain"): OpenApiTypes.STR})
+    @action(detail=True, methods=["get"], url_path="render")
+    def render_config(self, request, pk):
+        """
+        Stream the configuration of the Access List for a device platform, as plain text.
+        """
+        access_list = self.get_object()
+        params = ACLRenderSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return StreamingHttpResponse(
+            render_access_list(access_list, params.validated_data["platform"]),
+            content_type="text/plain; charset=utf-8",
+        )
+
+    @extend_schema(parameters=[ACLHistoryDiffSerializer], responses=ACLHistoryDiffResultSerializer)
+    @action(detail=True, methods=["get"], url_path="history-diff")
+    def history_diff(self, request, pk):
+        """
+        Compare the rules of the Access List at two points of its change history: the rules added, removed
+        and modified in between, rebuilt from the change log entries the user may view.
+        """
+        access_list = self.get_object()
+        params = ACLHistoryDiffSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        object_changes = ObjectChange.objects.restrict(request.user, "view")
+        bounds = {}
+        for field in ("start", "end"):
+            bounds[field] = params.validated_data.get(field)
+            change_id = params.validated_data.get(f"{field}_change")
+            if change_id is not None:
+                object_change = object_changes.filter(pk=change_id).first()
+                if object_change is None:
+                    raise ValidationError({f"{field}_change": [f"Change log entry {change_id} not found."]})
+                bounds[field] = get_change_position(object_change)
+
+        diff = get_rule_history_diff(access_list, object_changes, limit=params.validated_data["limit"], **bounds)
+        result = {
+            "access_list": access_list,
+            "added": diff.added,
+            "removed": diff.removed,
+            "modified": [{"before": before, "after": after} for before, after in diff.modified],
+            "truncated": diff.truncated,
+        }
+        return Response(ACLHistoryDiffResultSerializer(result, context={"request": request}).data)
+
+    @extend_schema(request=ACLImpactSerializer, responses=ACLImpactResultSerializer)
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="impact",
+        # Read-only: comparing rules only requires the view permission enforced below.
+        permission_classes=[IsAuthenticatedOrLoginNotRequired],
+    )
+    def impact(self, request, pk):
+        """
+        Compare the traffic permitted by the rules of the Access List with that permitted by proposed rules:
+        the traffic the proposed rules would newly permit, and no longer permit, whatever the rules' order.
+        """
+        access_list = get_object_or_404(models.AccessList.objects.restrict(request.user, "view"), pk=pk)
+        params = ACLImpactSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+
+        impact = compare_rule_sets(get_rule_entries(access_list), params.validated_data["rules"], params.validated_data["limit"])
+        counterexample = get_counterexample(impact)
+        if counterexample is not None:
+            address, protocol, port, permitted_by_proposed = counterexample
+            counterexample = {
+                "address": str(address),
+                "protocol": protocol,
+                "port": port,
+                "permitted_by_current": not permitted_by_proposed,
+                "permitted_by_proposed": permitted_by_proposed,
+            }
+
+        def get_regions(regions):
+            return [
+                {
+                    "prefixes": [str(prefix) for prefix in get_region_prefixes(region)],
+                    "protocol": region.protocol,
+                    "destination_ports": region.ports,
+                }
+                for region in regions
+            ]
+
+        return Response(
+            {
+                "access_list": NestedAccessListSerializer(access_list, context={"request": request}).data,
+                "equivalent": counterexample is None,
+                "counterexample": counterexample,
+                "added": get_regions(impact.added),
+                "removed": get_regions(impact.removed),
+                "truncated": impact.truncated,
+            },
+        )
+
+    @extend_schema(request=ACLOptimizeSerializer, responses={200: ACLOptimizationResultSerializer, 202: JobSerializer})
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="optimize",
+        # Applying changes the rules, not the Access List: the rule permissions are enforced below.
+        permission_classes=[IsAuthenticatedOrLoginNotRequired],
+    )
+    def optimize(self, request, pk):
+        """
+        Minimize the rules of the Access List into an equivalent, smaller set of rules, returned or applied
+        in place of the current rules. Large Access Lists, or those requested so, are optimized in a
+        background job, whose data holds the result once completed.
+        """
+        access_list = get_object_or_404(models.AccessList.objects.restrict(request.user, "view"), pk=pk)
+        params = ACLOptimizeSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        apply = params.validated_data["apply"]
+
+        if apply:
+            rules = access_list.get_rules()
+            for action_name in ("add", "delete"):
+                if not request.user.has_perm(get_permission_for_model(rules.model, action_name)):
+                    raise PermissionDenied()
+            if rules.exclude(pk__in=rules.restrict(request.user, "delete").values("pk")).exists():
+                raise PermissionDenied()
+
+        if params.validated_data["background"] or access_list.rule_count >= ACL_OPTIMIZE_BACKGROUND_RULE_COUNT:
+            job = Job.enqueue(
+                optimize_access_list_job,
+                access_list,
+                name=OPTIMIZE_JOB_NAME,
+                user=request.user,
+                apply=apply,
+            )
+            return Response(JobSerializer(job, context={"request": request}).data, status=status.HTTP_202_ACCEPTED)
+
+        try:
+            with transaction.atomic():
+                result = optimize_access_list(access_list, request, apply)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        result["access_list"] = access_list
+        return Response(ACLOptimizationResultSerializer(result, context={"request": request}).data)
+
+    @extend_schema(request=ACLRenumberSerializer, responses={200: dict})
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="renumber",
+        # Renumbering changes the rules, not the Access List: the rule change permission is enforced below.
+        permission_classes=[IsAuthenticatedOrLoginNotRequired],
+    )
+    def renumber(self, request, pk):
+        """
+        Renumber the rules of the Access List from start, step apart, keeping their order, with a single statement.
+        """
+        access_list = get_object_or_404(models.AccessList.objects.restrict(request.user, "view"), pk=pk)
+        rules = access_list.get_rules()
+        if not request.user.has_perm(get_permission_for_model(rules.model, "change")):
+            raise PermissionDenied()
+        if rules.exclude(pk__in=rules.restrict(request.user, "change").values("pk")).exists():
+            raise PermissionDenied()
+        params = ACLRenumberSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            count = access_list.renumber_rules(**params.validated_data)
+        update_access_lists([access_list.pk])
+        return Response(
+            {
+                "access_list": NestedAccessListSerializer(access_list, context={"request": request}).data,
+                "renumbered": count,
+            },
+        )
+
 
 class ACLInterfaceAssignmentViewSet(NetBoxModelViewSet):
     """
@@ -47,12 +603,75 @@ class ACLInterfaceAssignmentViewSet(NetBoxModelViewSet):
     queryset = models.ACLInterfaceAssignment.objects.prefetch_related(
         "access_list",
         "tags",
-    )
+    ).with_assigned_objects()
     serializer_class = ACLInterfaceAssignmentSerializer
     filterset_class = filtersets.ACLInterfaceAssignmentFilterSet
 
+    @extend_schema(request=ACLFlowSimulationSerializer, responses={200: dict})
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="simulate",
+        # Read-only: evaluating flows only requires the view permissions enforced below.
+        permission_classes=[IsAuthenticatedOrLoginNotRequired],
+    )
+    def simulate(self, request):
+        """
+        Evaluate a batch of flows against the Access Lists assigned to an interface or VM interface, in
+        each direction, or the given one. Ingress and egress Access Lists filter different traffic, so
+        each flow gets a verdict per direction: the Access Lists of a direction are evaluated by name, as
+        one list of rules. Ingress rules match the flows' source, egress rules their destination.
+        """
+        simulation = ACLFlowSimulationSerializer(data=request.data)
+        simulation.is_valid(raise_exception=True)
+        data = simulation.validated_data
+
+        assignments = models.ACLInterfaceAssignment.objects.restrict(request.user, "view").filter(
+            assigned_object_type=data["assigned_object_type"],
+            assigned_object_id=data["assigned_object_id"],
+        )
+        if data.get("direction"):
+            assignments = assignments.filter(access_list__type=data["direction"])
+        access_lists = models.AccessList.objects.restrict(request.user, "view").filter(
+            pk__in=assignments.values("access_list"),
+        )
+        access_lists = sorted(access_lists, key=lambda access_list: (access_list.type, access_list.name))
+
+        directions = [data["direction"]] if data.get("direction") else ACLAssignmentDirectionChoices.values()
+        results = [{} for _ in data["flows"]]
+        for direction in directions:
+            rule_sets = [
+                RuleSet(
+                    access_list.pk,
+                    direction == ACLAssignmentDirectionChoices.DIRECTION_EGRESS,
+                    list(get_rule_entries(access_list)),
+                )
+                for access_list in access_lists
+                if access_list.type == direction
+            ]
+            for result, (access_list_id, rule_id) in zip(results, simulate_flows(rule_sets, data["flows"])):
+                result[direction] = {
+                    "verdict": ACLVerdictChoices.VERDICT_PERMIT if rule_id else ACLVerdictChoices.VERDICT_DENY,
+                    "access_list": access_list_id,
+                    "rule": rule_id,
+                }
 
-class ACLIngressRuleViewSet(NetBoxModelViewSet):
+        return Response(
+            {
+                "access_lists": NestedAccessListSerializer(access_lists, many=True, context={"request": request}).data,
+                "results": results,
+            },
+        )
+
+
+class ACLIngressRuleViewSet(
+    RuleUpdatesDeferredMixin,
+    RuleBulkWriteMixin,
+    RuleExportMixin,
+    RuleCursorPaginationMixin,
+    ConditionalGetMixin,
+    NetBoxModelViewSet,
+):
     """
     Defines the view set for the django ACLIngressRule model & associates it to a view.
     """
@@ -63,9 +682,17 @@ class ACLIngressRuleViewSet(NetBoxModelViewSet):
     )
     serializer_class = ACLIngressRuleSerializer
     filterset_class = filtersets.ACLIngressRuleFilterSet
+    version_related_fields = ("access_list",)
 
 
-class ACLEgressRuleViewSet(NetBoxModelViewSet):
+class ACLEgressRuleViewSet(
+    RuleUpdatesDeferredMixin,
+    RuleBulkWriteMixin,
+    RuleExportMixin,
+    RuleCursorPaginationMixin,
+    ConditionalGetMixin,
+    NetBoxModelViewSet,
+):
     """
     Defines the view set for the django ACLEgressRule model & associates it to a view.
     """
@@ -76,3 +703,178 @@ class ACLEgressRuleViewSet(NetBoxModelViewSet):
     )
     serializer_class = ACLEgressRuleSerializer
     filterset_class = filtersets.ACLEgressRuleFilterSet
+    version_related_fields = ("access_list",)
+
+
+class ACLEffectiveRuleViewSet(ReadOnlyModelViewSet):
+    """
+    Defines the read-only view set for the materialized ACLEffectiveRule model.
+    Filtering on an interface or VM interface and a direction is a single indexed query.
+    """
+
+    queryset = models.ACLEffectiveRule.objects.select_related(
+        "assigned_object_type",
+        "access_list",
+        "ingress_rule",
+        "egress_rule",
+    )
+    serializer_class = ACLEffectiveRuleSerializer
+    filterset_class = filtersets.ACLEffectiveRuleFilterSet
+
+    def get_queryset(self):
+        return super().get_queryset().restrict(self.request.user, "view")
+
+
+class ACLChangeViewSet(ViewSet):
+    """
+    Incremental change feed of the Access Lists, rules and ACL Interface Assignments the user may view:
+    the objects created or changed since a cursor, with their current representation, and those deleted.
+    Clients pass the returned cursor to their next request, until has_more is false, and keep it for
+    their next sync. Objects changed again are listed again.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+    # Changed objects are serialized the way their own endpoints do.
+    object_viewsets = (AccessListViewSet, ACLIngressRuleViewSet, ACLEgressRuleViewSet, ACLInterfaceAssignmentViewSet)
+
+    def get_view_name(self):
+        return "Changes"
+
+    @extend_schema(parameters=[ACLChangeFeedSerializer], responses=ACLChangeFeedResultSerializer)
+    def list(self, request):
+        params = ACLChangeFeedSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        changes, cursor, has_more = get_changes(
+            request.user,
+            params.validated_data.get("cursor"),
+            params.validated_data["limit"],
+        )
+
+        changed_ids = {}
+        for _, model, object_id, deleted in changes:
+            if not deleted:
+                changed_ids.setdefault(model, []).append(object_id)
+        objects = {}
+        for viewset in self.object_viewsets:
+            model = viewset.queryset.model
+            if model in changed_ids:
+                instances = viewset.queryset.restrict(request.user, "view").filter(pk__in=changed_ids[model])
+                for data in viewset.serializer_class(instances, many=True, context={"request": request}).data:
+                    objects[model, data["id"]] = data
+
+        results = [
+            {
+                "object_type": model._meta.label_lower,
+                "object_id": object_id,
+                "time": time,
+                "deleted": deleted,
+                "object": objects.get((model, object_id)),
+            }
+            for time, model, object_id, deleted in changes
+            # Objects deleted since they were listed are left to their tombstone.
+            if deleted or (model, object_id) in objects
+        ]
+        return Response(
+            ACLChangeFeedResultSerializer({"results": results, "cursor": cursor, "has_more": has_more}).data,
+        )
+
+
+class ACLCoverageViewSet(ViewSet):
+    """
+    Reverse lookup of the rules the user may view covering an IP address or prefix, optionally for a
+    protocol and destination port, grouped by Access List along with the interfaces it is assigned to.
+    Ingress rules cover their source prefix, egress rules their destination prefix.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get_view_name(self):
+        return "Coverage"
+
+    @extend_schema(parameters=[ACLCoverageSerializer], responses=ACLCoverageResultSerializer)
+    def list(self, request):
+        params = ACLCoverageSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        coverage = get_coverage(
+            request.user,
+            data["prefix"],
+            protocol=data.get("protocol"),
+            port=data.get("port"),
+            direction=data.get("direction"),
+            limit=data["limit"],
+        )
+
+        context = {"request": request}
+        rules = {}
+        for rule in coverage.rules:
+            rules.setdefault(rule.access_list_id, []).append(
+                {
+                    "id": rule.pk,
+                    "sequence": rule.sequence,
+                    "description": rule.description,
+                    "prefix": getattr(rule, rule.prefix_field),
+                    "protocol": rule.protocol,
+                    "destination_ports": rule.destination_ports,
+                },
+            )
+        results = [
+            {
+                "access_list": access_list,
+                "rules": rules[access_list.pk],
+                "assignments": [
+                    {
+                        "id": assignment.pk,
+                        "assigned_object_type": assignment.assigned_object._meta.label_lower,
+                        "assigned_object_id": assignment.assigned_object_id,
+                        "assigned_object": get_nested_serializer(type(assignment.assigned_object))(
+                            assignment.assigned_object,
+                            context=context,
+                        ).data,
+                    }
+                    for assignment in coverage.assignments.get(access_list.pk, ())
+                    if assignment.assigned_object is not None
+                ],
+            }
+            for access_list in coverage.access_lists
+        ]
+        return Response(
+            ACLCoverageResultSerializer({"results": results, "truncated": coverage.truncated}, context=context).data,
+        )
+
+
+class ACLTCAMUsageViewSet(ViewSet):
+    """
+    Estimated TCAM entries of the Access Lists the user may view, summed up per device role they are
+    assigned to, or per interface through their ACL Interface Assignments, from the largest.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get_view_name(self):
+        return "TCAM Usage"
+
+    @extend_schema(parameters=[ACLTCAMUsageSerializer], responses=ACLTCAMUsageResultSerializer)
+    def list(self, request):
+        params = ACLTCAMUsageSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        usage = get_tcam_usage(request.user, data["group_by"], direction=data.get("direction"), limit=data["limit"])
+
+        context = {"request": request}
+        results = []
+        for result in usage.results:
+            content_type = result["assigned_object_type"]
+            assigned_object = result["assigned_object"]
+            if assigned_object is not None:
+                assigned_object = get_nested_serializer(type(assigned_object))(assigned_object, context=context).data
+            results.append(
+                {
+                    "assigned_object_type": f"{content_type.app_label}.{content_type.model}",
+                    "assigned_object_id": result["assigned_object_id"],
+                    "assigned_object": assigned_object,
+                    "access_list_count": result["access_list_count"],
+                    "tcam_entry_count": result["tcam_entry_count"],
+                },
+            )
+        return Response(ACLTCAMUsageResultSerializer({"results": results, "truncated": usage.truncated}).data)
@@ -0,0 +1,123 @@
+"""
+Cached counts displayed in the badges of the plugin's tabs on device, virtual machine and interface pages.
+"""
+
+import time
+
+from dcim.models import Interface
+from django.core.cache import cache
+from django.db.models import Count
+from virtualization.models import VMInterface
+
+from .models import AccessList
+
+__all__ = (
+    "get_badge_count",
+    "get_device_access_list_count",
+    "get_interface_assignment_count",
+    "get_virtual_chassis_access_list_count",
+    "get_virtual_machine_access_list_count",
+    "invalidate_badge_count",
+    "invalidate_badge_counts",
+    "prime_assignment_badge_counts",
+)
+
+# Badge counts are cached for an hour, unless invalidated by the plugin's signals.
+CACHE_TIMEOUT = 60 * 60
+
+# Changes which may affect any badge (e.g. an Access List assigned to a device role) bump
+# this generation, which is part of every badge cache key, instead of deleting each key.
+GENERATION_KEY = "netbox_acls:badges:generation"
+
+
+def _get_generation():
+    # The generation starts from the current time, so that it never goes back to an older
+    # value if it is evicted from the cache.
+    return cache.get_or_set(GENERATION_KEY, time.time_ns, None)
+
+
+def _get_cache_key(generation, model, pk):
+    return f"netbox_acls:badges:{generation}:{model._meta.label_lower}:{pk}"
+
+
+def get_badge_count(obj, count):
+    """
+    Return the cached badge count of an object, calling count() to compute it when it is not cached.
+    """
+    cache_key = _get_cache_key(_get_generation(), type(obj), obj.pk)
+    value = cache.get(cache_key)
+    if value is None:
+        value = count()
+        cache.set(cache_key, value, CACHE_TIMEOUT)
+    return value
+
+
+def prime_assignment_badge_counts(interfaces):
+    """
+    Cache the ACL interface assignment badge counts of a queryset of interfaces or VM interfaces
+    with a single aggregated query, so that their pages do not count them one at a time.
+    """
+    generation = _get_generation()
+    counts = interfaces.order_by().annotate(assignment_count=Count("accesslistassignments")).values_list(
+        "pk",
+        "assignment_count",
+    )
+    cache.set_many(
+        {_get_cache_key(generation, interfaces.model, pk): count for pk, count in counts},
+        CACHE_TIMEOUT,
+    )
+
+
+def get_device_access_list_count(device):
+    """
+    Badge of the device Access Lists tab. Computing it also primes the badges of the device's interfaces.
+    """
+
+    def count():
+        prime_assignment_badge_counts(Interface.objects.filter(device=device))
+        return AccessList.objects.for_device(device).count()
+
+    return get_badge_count(device, count)
+
+
+def get_virtual_chassis_access_list_count(virtual_chassis):
+    """
+    Badge of the virtual chassis Access Lists tab.
+    """
+    return get_badge_count(virtual_chassis, lambda: AccessList.objects.for_virtual_chassis(virtual_chassis).count())
+
+
+def get_virtual_machine_access_list_count(virtual_machine):
+    """
+    Badge of the virtual machine Access Lists tab. Computing it also primes the badges of the VM's interfaces.
+    """
+
+    def count():
+        prime_assignment_badge_counts(VMInterface.objects.filter(virtual_machine=virtual_machine))
+        return AccessList.objects.for_virtual_machine(virtual_machine).count()
+
+    return get_badge_count(virtual_machine, count)
+
+
+def get_interface_assignment_count(interface):
+    """
+    Badge of the interface and VM interface ACL Interface Assignments tabs.
+    """
+    return get_badge_count(interface, lambda: interface.accesslistassignments.count())
+
+
+def invalidate_badge_count(model, pk):
+    """
+    Drop the cached badge count of a single object.
+    """
+    cache.delete(_get_cache_key(_get_generation(), model, pk))
+
+
+def invalidate_badge_counts():
+    """
+    Drop every cached badge count.
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
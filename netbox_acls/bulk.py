@@ -0,0 +1,277 @@
+"""
+Batched writes of ACL rules and interface assignments, used by the bulk import views and APIs
+instead of saving, or deleting, one object at a time.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db.models import Max
+from django.utils import timezone
+from extras.choices import ObjectChangeActionChoices
+from extras.models import CustomField, ObjectChange, Tag, TaggedItem, Webhook
+from extras.webhooks import enqueue_object
+from netbox.context import webhooks_queue
+from netbox.signals import post_clean
+
+from .constants import ACL_RULE_SEQUENCE_STEP
+from .models import AccessList
+from .signals import defer_rule_updates
+
+__all__ = (
+    "BATCH_SIZE",
+    "allocate_rule_sequences",
+    "bulk_create_objects",
+    "bulk_create_rules",
+    "bulk_delete_objects",
+    "bulk_update_objects",
+    "get_access_lists_by_name",
+    "get_rule_errors",
+    "get_rule_unique_key",
+    "get_rule_unique_keys",
+)
+
+# Number of objects validated and written at once.
+BATCH_SIZE = 1000
+
+# Webhook field enabling each type of change.
+WEBHOOK_TYPE_FIELDS = {
+    ObjectChangeActionChoices.ACTION_CREATE: "type_create",
+    ObjectChangeActionChoices.ACTION_UPDATE: "type_update",
+    ObjectChangeActionChoices.ACTION_DELETE: "type_delete",
+}
+
+
+def get_access_lists_by_name(model, names):
+    """
+    Return the Access Lists a rule model can be assigned to, as a {name: [AccessList]} mapping,
+    with a single query. Names are not unique across devices, hence the lists.
+    """
+    limit_choices_to = model._meta.get_field("access_list").get_limit_choices_to()
+    access_lists = {}
+    for access_list in AccessList.objects.filter(name__in=names).complex_filter(limit_choices_to):
+        access_lists.setdefault(access_list.name, []).append(access_list)
+    return access_lists
+
+
+def get_rule_unique_key(rule):
+    """
+    Return the unique_together key of a rule, or None when it includes a NULL value,
+    which the database does not consider for uniqueness.
+    """
+    if rule.access_list_id is None or rule.destination_ports is None or rule.protocol is None:
+        return None
+    return rule.access_list_id, tuple(map(tuple, rule.destination_ports)), rule.protocol
+
+
+def get_rule_unique_keys(model, access_list_ids, exclude=()):
+    """
+    Return the unique_together keys of the existing rules of the given Access Lists, with a single query.
+    Rules whose primary key is in exclude, e.g. being updated, are left out.
+    """
+    rules = model.objects.filter(access_list__in=access_list_ids, destination_ports__isnull=False)
+    return {
+        (access_list_id, tuple(map(tuple, destination_ports)), protocol)
+        for pk, access_list_id, destination_ports, protocol in rules.values_list("pk", "access_list", "destination_ports", "protocol")
+        if pk not in exclude
+    }
+
+
+def _validate_custom_field_data(instance, custom_fields):
+    """
+    Validate the custom field data of an instance the way CustomFieldsMixin.clean() does,
+    against custom fields fetched once for a whole batch.
+    """
+    for name, value in instance.custom_field_data.items():
+        if name not in custom_fields:
+            raise ValidationError(f"Unknown field name '{name}' in custom field data.")
+        try:
+            custom_fields[name].validate(value)
+        except ValidationError as e:
+            raise ValidationError(f"Invalid value for custom field '{name}': {e.message}")
+    for custom_field in custom_fields.values():
+        if custom_field.required and custom_field.name not in instance.custom_field_data:
+            raise ValidationError(f"Missing required custom field '{custom_field.name}'.")
+
+
+def get_rule_errors(model, rules):
+    """
+    Validate a batch of new or changed rules the way full_clean() validates each of them, with a
+    fixed number of queries: the Access List type, the fields, the prefix, custom fields, custom
+    validators and the uniqueness of the rules, among themselves and against the existing ones.
+    The rules' Access Lists must already be fetched. Returns a list of {field: [errors]} dicts,
+    empty for the valid rules.
+    """
+    limit_choices_to = model._meta.get_field("access_list").get_limit_choices_to()
+    custom_fields = {custom_field.name: custom_field for custom_field in CustomField.objects.get_for_model(model)}
+    unique_keys = get_rule_unique_keys(
+        model,
+        {rule.access_list_id for rule in rules},
+        exclude={rule.pk for rule in rules if rule.pk},
+    )
+
+    errors = []
+    for rule in rules:
+        rule_errors = {}
+        if any(getattr(rule.access_list, field) != value for field, value in limit_choices_to.items()):
+            rule_errors["access_list"] = ["Provided parent Access List is not of right type."]
+        try:
+            rule.clean_fields(exclude=["access_list"])
+            rule.validate_prefix()
+            _validate_custom_field_data(rule, custom_fields)
+            # Runs the custom validators, as NetBoxModel.clean() does.
+            post_clean.send(sender=model, instance=rule)
+        except ValidationError as e:
+            rule_errors = e.update_error_dict(rule_errors)
+
+        unique_key = get_rule_unique_key(rule)
+        if unique_key is not None:
+            if unique_key in unique_keys:
+                rule_errors.setdefault(NON_FIELD_ERRORS, []).append(
+                    rule.unique_error_message(model, ("access_list", "destination_ports", "protocol")).messages[0]
+                )
+            unique_keys.add(unique_key)
+        errors.append(rule_errors)
+    return errors
+
+
+def _set_conflicting_pks(model, instances):
+    """
+    Set the primary keys of instances inserted with ignore_conflicts, which the database does not
+    return, by looking them up with their unique_together key.
+    """
+    fields = model._meta.unique_together[0]
+    attnames = [model._meta.get_field(field).attname for field in fields]
+    filters = {f"{field}__in": {getattr(instance, attname) for instance in instances} for field, attname in zip(fields, attnames)}
+    pks = {tuple(key): pk for *key, pk in model.objects.filter(**filters).values_list(*fields, "pk")}
+    for instance in instances:
+        instance.pk = pks.get(tuple(getattr(instance, attname) for attname in attnames))
+
+
+def _record_object_changes(instances, action, request):
+    """
+    Record the change log entries of a batch of instances, serializing their tags from
+    memory (see bulk_create_objects) or from prefetched tags.
+    """
+    object_changes = []
+    for instance in instances:
+        object_change = instance.to_objectchange(action)
+        object_change.user = request.user
+        object_change.request_id = request.id
+        object_changes.append(object_change)
+    ObjectChange.objects.bulk_create(object_changes, batch_size=BATCH_SIZE)
+
+
+def _enqueue_webhooks(model, instances, request, action):
+    # Serializing each instance for webhooks is costly: only do it when a webhook would receive them.
+    content_type = ContentType.objects.get_for_model(model)
+    if Webhook.objects.filter(content_types=content_type, enabled=True, **{WEBHOOK_TYPE_FIELDS[action]: True}).exists():
+        queue = webhooks_queue.get()
+        for instance in instances:
+            enqueue_object(queue, instance, request.user, request.id, action)
+
+
+def _set_tags(model, objects, replace=False):
+    """
+    Record, or replace, the tags of (instance, tags) pairs, and cache them on the instances for serialization.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    if replace:
+        TaggedItem.objects.filter(content_type=content_type, object_id__in=[instance.pk for instance, _ in objects]).delete()
+    TaggedItem.objects.bulk_create(
+        [TaggedItem(content_type=content_type, object_id=instance.pk, tag=tag) for instance, tags in objects for tag in tags],
+        batch_size=BATCH_SIZE,
+    )
+    for instance, tags in objects:
+        # Serialize the tags from memory rather than querying them back for each instance.
+        instance._tags = tags
+        instance._prefetched_objects_cache = {**getattr(instance, "_prefetched_objects_cache", {}), "tags": Tag.objects.none()}
+
+
+def bulk_create_objects(model, objects, request, ignore_conflicts=False):
+    """
+    Insert validated (instance, tags) pairs with bulk_create, then record their tags, change log
+    entries and webhooks in batches, the way saving each instance would have. Returns the created instances.
+
+    With ignore_conflicts, rows conflicting with the model's unique_together are skipped by the database.
+    Callers are expected to have validated that none existed, so that a conflict only happens with an
+    identical row inserted concurrently since then, which is returned in place of the skipped instance.
+    """
+    instances = model.objects.bulk_create(
+        [instance for instance, _ in objects],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=ignore_conflicts,
+    )
+    if ignore_conflicts:
+        for batch_start in range(0, len(instances), BATCH_SIZE):
+            _set_conflicting_pks(model, instances[batch_start:batch_start + BATCH_SIZE])
+        objects = [(instance, tags) for instance, tags in objects if instance.pk is not None]
+        instances = [instance for instance, _ in objects]
+
+    _set_tags(model, objects)
+    _record_object_changes(instances, ObjectChangeActionChoices.ACTION_CREATE, request)
+    _enqueue_webhooks(model, instances, request, ObjectChangeActionChoices.ACTION_CREATE)
+    return instances
+
+
+def bulk_update_objects(model, objects, fields, request):
+    """
+    Save validated (instance, tags) pairs with bulk_update, then record their tags, change log
+    entries and webhooks in batches. Tags are left unchanged when None. The instances must have
+    been snapshot() before being changed, for their change log entries.
+    """
+    instances = [instance for instance, _ in objects]
+    now = timezone.now()
+    for instance in instances:
+        instance.last_updated = now
+    model.objects.bulk_update(instances, [*fields, "last_updated"], batch_size=BATCH_SIZE)
+
+    _set_tags(model, [(instance, tags) for instance, tags in objects if tags is not None], replace=True)
+    _record_object_changes(instances, ObjectChangeActionChoices.ACTION_UPDATE, request)
+    _enqueue_webhooks(model, instances, request, ObjectChangeActionChoices.ACTION_UPDATE)
+    return instances
+
+
+def bulk_delete_objects(model, pks):
+    """
+    Delete objects in batches of set-based deletions through Django's deletion collector, so that the
+    objects referencing them are handled as their relations require. The deletion signals record the
+    change log entries, webhooks and change feed tombstones, while the data derived from deleted rules
+    is refreshed once for all of them (see defer_rule_updates()). Returns the number of deleted objects.
+    """
+    count = 0
+    with defer_rule_updates():
+        for batch_start in range(0, len(pks), BATCH_SIZE):
+            batch = pks[batch_start:batch_start + BATCH_SIZE]
+            _, deleted = model.objects.filter(pk__in=batch).delete()
+            count += deleted.get(model._meta.label, 0)
+    return count
+
+
+def allocate_rule_sequences(model, rules):
+    """
+    Number the rules without a sequence number after the last rule of their Access List, in order, the way
+    saving each of them would have, with a single query. Rules after a numbered rule of the batch follow it.
+    """
+    access_list_ids = {rule.access_list_id for rule in rules if rule.sequence is None}
+    if not access_list_ids:
+        return
+    last_sequences = dict(
+        model.objects.filter(access_list__in=access_list_ids).order_by().values("access_list").annotate(
+            last=Max("sequence"),
+        ).values_list("access_list", "last"),
+    )
+    for rule in rules:
+        last_sequence = last_sequences.get(rule.access_list_id) or 0
+        if rule.sequence is None:
+            rule.sequence = last_sequence + ACL_RULE_SEQUENCE_STEP
+        last_sequences[rule.access_list_id] = max(last_sequence, rule.sequence)
+
+
+def bulk_create_rules(model, rules, request):
+    """
+    Insert validated (rule, tags) pairs with bulk_create_objects. Returns the created rules.
+    """
+    for rule, _ in rules:
+        rule.update_derived_fields()
+    allocate_rule_sequences(model, [rule for rule, _ in rules])
+    return bulk_create_objects(model, rules, request)
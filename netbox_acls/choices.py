@@ -6,8 +6,12 @@ from utilities.choices import ChoiceSet
 
 __all__ = (
     "ACLAssignmentDirectionChoices",
+    "ACLExportFormatChoices",
     "ACLProtocolChoices",
     "ACLProtocolChoices",
+    "ACLRenderPlatformChoices",
+    "ACLRuleFindingChoices",
+    "ACLVerdictChoices",
 )
 
 
@@ -39,3 +43,68 @@ class ACLProtocolChoices(ChoiceSet):
         (PROTOCOL_TCP, "TCP", "blue"),
         (PROTOCOL_UDP, "UDP", "orange"),
     ]
+
+
+class ACLVerdictChoices(ChoiceSet):
+    """
+    Defines the outcome of evaluating a flow against Access Lists.
+    Rules only permit traffic, anything not matched by a rule is implicitly denied.
+    """
+
+    VERDICT_PERMIT = "permit"
+    VERDICT_DENY = "deny"
+
+    CHOICES = [
+        (VERDICT_PERMIT, "Permit", "green"),
+        (VERDICT_DENY, "Deny", "red"),
+    ]
+
+
+class ACLRuleFindingChoices(ChoiceSet):
+    """
+    Defines the kinds of findings reported by the analysis of an Access List's rules.
+    """
+
+    FINDING_DUPLICATE = "duplicate"
+    FINDING_SHADOWED = "shadowed"
+    FINDING_OVERLAP = "overlap"
+
+    CHOICES = [
+        (FINDING_DUPLICATE, "Duplicate", "red"),
+        (FINDING_SHADOWED, "Shadowed", "orange"),
+        (FINDING_OVERLAP, "Overlap", "yellow"),
+    ]
+
+
+class ACLRenderPlatformChoices(ChoiceSet):
+    """
+    Defines the device platforms an Access List can be rendered for.
+    """
+
+    PLATFORM_CISCO_IOS = "cisco_ios"
+    PLATFORM_CISCO_NXOS = "cisco_nxos"
+    PLATFORM_JUNOS = "junos"
+    PLATFORM_ARISTA_EOS = "arista_eos"
+    PLATFORM_NFTABLES = "nftables"
+
+    CHOICES = [
+        (PLATFORM_CISCO_IOS, "Cisco IOS"),
+        (PLATFORM_CISCO_NXOS, "Cisco NX-OS"),
+        (PLATFORM_JUNOS, "Junos"),
+        (PLATFORM_ARISTA_EOS, "Arista EOS"),
+        (PLATFORM_NFTABLES, "nftables"),
+    ]
+
+
+class ACLExportFormatChoices(ChoiceSet):
+    """
+    Defines the formats the rules can be exported in.
+    """
+
+    FORMAT_NDJSON = "ndjson"
+    FORMAT_CSV = "csv"
+
+    CHOICES = [
+        (FORMAT_NDJSON, "NDJSON"),
+        (FORMAT_CSV, "CSV"),
+    ]
@@ -8,3 +8,13 @@ ACL_HOST_ASSIGNMENT_MODELS = Q(Q(app_label="dcim", model="devicerole"),)
 ACL_INTERFACE_ASSIGNMENT_MODELS = Q(
     Q(app_label="dcim", model="interface") | Q(app_label="virtualization", model="vminterface"),
 )
+
+# Increment between the sequence numbers of the rules appended to an Access List, or renumbered,
+# leaving gaps to insert rules between two others without renumbering them.
+ACL_RULE_SEQUENCE_STEP = 10
+
+# Description of the rules created by applying an optimization of an Access List.
+ACL_OPTIMIZED_RULE_DESCRIPTION = "Optimized rule"
+
+# Number of rules from which Access Lists are optimized in a background job rather than during the request.
+ACL_OPTIMIZE_BACKGROUND_RULE_COUNT = 5000
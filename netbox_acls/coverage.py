@@ -0,0 +1,77 @@
+"""
+Reverse lookup of the rules covering an address or prefix, with their Access Lists and the interfaces
+these are assigned to: ingress rules cover their source, egress rules their destination.
+
+Rules are selected with a containment condition on their network column, answered by its GiST index,
+rather than by evaluating the rules of every Access List.
+"""
+
+from collections import namedtuple
+
+from django.db.models import Q
+
+from .choices import ACLAssignmentDirectionChoices, ACLProtocolChoices
+from .models import AccessList, ACLEgressRule, ACLIngressRule, ACLInterfaceAssignment
+
+__all__ = (
+    "Coverage",
+    "get_coverage",
+    "get_covering_rule_filter",
+)
+
+RULE_MODELS = {
+    ACLAssignmentDirectionChoices.DIRECTION_INGRESS: ACLIngressRule,
+    ACLAssignmentDirectionChoices.DIRECTION_EGRESS: ACLEgressRule,
+}
+
+# The covering rules, ordered by Access List and sequence, their Access Lists in the same order, the
+# ACL Interface Assignments of each Access List by ID, and whether rules were left out past the limit.
+Coverage = namedtuple("Coverage", ("rules", "access_lists", "assignments", "truncated"))
+
+
+def get_covering_rule_filter(model, network, protocol=None, port=None):
+    """
+    Return the condition selecting the rules of a model whose network contains every address of a
+    network, and matching the protocol and destination port when set. Rules without destination
+    ports match any port, and ICMP rules, which have none, no port.
+    """
+    condition = Q(**{f"{model.network_field}__net_contains_or_equals": str(network)})
+    if protocol:
+        condition &= Q(protocol=protocol)
+    if port is not None:
+        condition &= ~Q(protocol=ACLProtocolChoices.PROTOCOL_ICMP) & (
+            Q(destination_ports__isnull=True)
+            | Q(destination_ports=[])
+            | Q(destination_port_span__contains=port, destination_ports__port_overlaps=(port, port))
+        )
+    return condition
+
+
+def get_coverage(user, network, protocol=None, port=None, direction=None, limit=100):
+    """
+    Return the Coverage of a network by the rules of the given direction, or both, which the user
+    may view, up to limit rules per direction.
+    """
+    access_lists = AccessList.objects.restrict(user, "view")
+    rules = []
+    truncated = False
+    for rule_direction, model in RULE_MODELS.items():
+        if direction and direction != rule_direction:
+            continue
+        queryset = model.objects.restrict(user, "view").filter(
+            get_covering_rule_filter(model, network, protocol, port),
+            access_list__in=access_lists,
+        )
+        model_rules = list(queryset.select_related("access_list").order_by("access_list", "sequence", "pk")[:limit + 1])
+        truncated |= len(model_rules) > limit
+        rules.extend(model_rules[:limit])
+
+    covering_access_lists = list({rule.access_list_id: rule.access_list for rule in rules}.values())
+    assignments = {}
+    if covering_access_lists:
+        queryset = ACLInterfaceAssignment.objects.restrict(user, "view").filter(
+            access_list__in=[access_list.pk for access_list in covering_access_lists],
+        )
+        for assignment in queryset.with_assigned_objects().order_by("pk"):
+            assignments.setdefault(assignment.access_list_id, []).append(assignment)
+    return Coverage(rules, covering_access_lists, assignments, truncated)
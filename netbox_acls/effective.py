@@ -0,0 +1,99 @@
+"""
+Incremental maintenance of the materialized effective rules of interfaces and VM interfaces (see ACLEffectiveRule).
+"""
+
+from itertools import islice
+
+from .choices import ACLAssignmentDirectionChoices
+from .models import ACLEffectiveRule, ACLEgressRule, ACLIngressRule, ACLInterfaceAssignment
+
+__all__ = (
+    "BATCH_SIZE",
+    "sync_assignment_effective_rules",
+    "sync_rule_effective_rules",
+)
+
+# Number of rule IDs looked up, and of effective rules inserted, at once.
+BATCH_SIZE = 1000
+
+RULE_MODELS = {
+    ACLAssignmentDirectionChoices.DIRECTION_INGRESS: ACLIngressRule,
+    ACLAssignmentDirectionChoices.DIRECTION_EGRESS: ACLEgressRule,
+}
+
+
+def _batched(iterable):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, BATCH_SIZE)):
+        yield batch
+
+
+def _get_effective_rules(assignment, model, rule_ids):
+    """
+    Yield the effective rules applying the given rules through an assignment, given as a values() dict.
+    """
+    for rule_id in rule_ids:
+        yield ACLEffectiveRule(
+            assigned_object_type_id=assignment["assigned_object_type"],
+            assigned_object_id=assignment["assigned_object_id"],
+            direction=assignment["access_list__type"],
+            assignment_id=assignment["pk"],
+            access_list_id=assignment["access_list"],
+            **{f"{model.effective_rule_field}_id": rule_id},
+        )
+
+
+def _create_effective_rules(effective_rules):
+    for batch in _batched(effective_rules):
+        ACLEffectiveRule.objects.bulk_create(batch)
+
+
+def _get_assignments(**filters):
+    return ACLInterfaceAssignment.objects.filter(**filters).order_by().values(
+        "pk",
+        "access_list",
+        "access_list__type",
+        "assigned_object_type",
+        "assigned_object_id",
+    )
+
+
+def sync_rule_effective_rules(model, rule_ids):
+    """
+    Re-materialize rules of the given model (created, edited or moved to another Access List)
+    on every interface their Access List is assigned to. Deleted rules cascade on their own.
+    """
+    field = model.effective_rule_field
+    for batch in _batched(rule_ids):
+        ACLEffectiveRule.objects.filter(**{f"{field}__in": batch}).delete()
+
+        rule_ids_by_access_list = {}
+        for access_list_id, rule_id in model.objects.filter(pk__in=batch).values_list("access_list", "pk"):
+            rule_ids_by_access_list.setdefault(access_list_id, []).append(rule_id)
+
+        assignments = _get_assignments(access_list__in=rule_ids_by_access_list)
+        _create_effective_rules(
+            effective_rule
+            for assignment in assignments
+            for effective_rule in _get_effective_rules(assignment, model, rule_ids_by_access_list[assignment["access_list"]])
+        )
+
+
+def sync_assignment_effective_rules(assignment_ids):
+    """
+    Re-materialize the rules applied through the given ACL Interface Assignments (created, or
+    moved to another interface or Access List), querying the rules once per Access List.
+    Deleted assignments cascade on their own.
+    """
+    ACLEffectiveRule.objects.filter(assignment__in=assignment_ids).delete()
+
+    assignments_by_access_list = {}
+    for assignment in _get_assignments(pk__in=assignment_ids):
+        assignments_by_access_list.setdefault(assignment["access_list"], []).append(assignment)
+
+    for access_list_id, assignments in assignments_by_access_list.items():
+        model = RULE_MODELS[assignments[0]["access_list__type"]]
+        rule_ids = list(model.objects.filter(access_list=access_list_id).order_by().values_list("pk", flat=True))
+        _create_effective_rules(
+            effective_rule for assignment in assignments for effective_rule in _get_effective_rules(assignment, model, rule_ids)
+        )
@@ -0,0 +1,14 @@
+# flake8: noqa
+"""
+Import each of the directory's scripts.
+"""
+
+from .analysis import *
+from .impact import *
+from .matcher import *
+from .optimizer import *
+from .ports import *
+from .prefixes import *
+from .rules import *
+from .simulation import *
+from .tcam import *
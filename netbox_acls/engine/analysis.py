@@ -0,0 +1,110 @@
+"""
+Report the duplicate, shadowed and overlapping rules of an Access List.
+"""
+
+from collections import defaultdict, namedtuple
+
+from django.core.cache import cache
+
+from ..choices import ACLRuleFindingChoices
+from .ports import IntervalSet
+from .rules import get_rule_entries, get_rules_cache_key
+
+__all__ = (
+    "RuleFinding",
+    "analyze_rules",
+    "get_rule_analysis",
+)
+
+# A rule flagged by the analysis, with a few of the related (duplicated or covering) rule IDs.
+RuleFinding = namedtuple("RuleFinding", ("rule", "kind", "related"))
+
+# Rule analyses are cached for a day; the cache key changes whenever the rules change.
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class _Frame:
+    """
+    The rules sharing one prefix during the sweep. A frame references the port coverage of its
+    ancestors rather than copying it; the chain is bounded by the address length.
+    """
+
+    __slots__ = ("chain", "end", "network", "own", "version")
+
+    def __init__(self, network, parent):
+        self.network = network
+        self.version = network.version
+        self.end = int(network.broadcast_address)
+        self.own = defaultdict(IntervalSet)
+        self.chain = (parent.chain if parent else ()) + (self.own,)
+
+
+def analyze_rules(entries):
+    """
+    Analyze rule entries, given in rule order, and return the RuleFindings in rule order:
+      - duplicate: same prefix, protocol and ports as an earlier rule.
+      - shadowed: every flow of the rule is matched by earlier rules of the same prefix or by rules of broader prefixes.
+      - overlap: some flows of the rule are matched by such rules, with the same protocol and overlapping ports.
+
+    The rules are swept once per address family, sorted by prefix start then from the broadest
+    to the narrowest prefix, so that the stack of open prefixes always holds the ancestors of the
+    current prefix. Port coverage is accumulated in interval sets along that stack, which keeps the
+    analysis at O(n log n) instead of comparing every pair of rules.
+    """
+    findings = {}
+    first_rules = {}
+    ordered = []
+    for order, entry in enumerate(entries):
+        key = (entry.network, entry.protocol, entry.ports)
+        if key in first_rules:
+            findings[order] = RuleFinding(entry.id, ACLRuleFindingChoices.FINDING_DUPLICATE, [first_rules[key]])
+        else:
+            first_rules[key] = entry.id
+        ordered.append((entry.network.version, int(entry.network.network_address), entry.network.prefixlen, order, entry))
+    ordered.sort(key=lambda item: item[:4])
+
+    stack = []
+    for version, start, _, order, entry in ordered:
+        network = entry.network
+        # Close the prefixes which do not contain this rule's prefix. As prefixes are sorted by start,
+        # an open prefix contains this one as long as it does not end before it starts.
+        while stack and (stack[-1].version != version or stack[-1].end < start):
+            stack.pop()
+        if not stack or stack[-1].network != network:
+            stack.append(_Frame(network, stack[-1] if stack else None))
+        frame = stack[-1]
+
+        # The port coverage of the rules with a broader prefix, or the same prefix and an earlier order.
+        protocols = (entry.protocol, None) if entry.protocol else (None,)
+        coverage = [own[protocol] for own in frame.chain for protocol in protocols if own.get(protocol)]
+
+        if order not in findings and coverage:
+            uncovered = list(entry.ports)
+            for interval_set in coverage:
+                uncovered = interval_set.subtract(uncovered)
+                if not uncovered:
+                    break
+            if uncovered != list(entry.ports):
+                related = []
+                for interval_set in coverage:
+                    related.extend(owner for owner in interval_set.owners(entry.ports) if owner not in related)
+                kind = ACLRuleFindingChoices.FINDING_OVERLAP if uncovered else ACLRuleFindingChoices.FINDING_SHADOWED
+                findings[order] = RuleFinding(entry.id, kind, related)
+
+        own = frame.own[entry.protocol]
+        for low, high in entry.ports:
+            own.add(low, high, (entry.id,))
+
+    return [findings[order] for order in sorted(findings)]
+
+
+def get_rule_analysis(access_list):
+    """
+    Return the RuleFindings of an Access List, cached until its rules change.
+    """
+    cache_key = get_rules_cache_key("analysis", access_list)
+    findings = cache.get(cache_key)
+    if findings is None:
+        findings = analyze_rules(get_rule_entries(access_list))
+        cache.set(cache_key, findings, CACHE_TIMEOUT)
+    return findings
@@ -0,0 +1,230 @@
+"""
+Compare the traffic permitted by two sets of rules, e.g. the rules of an Access List and a proposed
+replacement, rather than their text.
+
+Rules only permit traffic, so the traffic a set of rules permits is the union of the (address range,
+protocol, port ranges) boxes of its rules, whatever their order. The differences between two sets of
+rules are computed by sweeping the address axis, per address family and protocol, through the boxes of
+the rules overlapping those found in one set only: traffic outside of them is permitted by both sets or
+by neither. Changing a few rules of a large Access List thus only sweeps the addresses around them.
+"""
+
+import ipaddress
+from bisect import bisect_right
+from collections import namedtuple
+
+from ..choices import ACLProtocolChoices
+from .ports import ALL_PORTS, parse_port_range, subtract_intervals, to_intervals
+from .rules import get_protocol_ports, make_rule_entry
+
+__all__ = (
+    "ImpactRegion",
+    "RuleSetImpact",
+    "compare_rule_sets",
+    "get_counterexample",
+    "get_region_prefixes",
+    "parse_rule_entries",
+)
+
+# Traffic permitted by one set of rules only: the addresses from start to end, as integers, of an address
+# family, for a protocol and the given port intervals (None for ICMP, which has no ports).
+ImpactRegion = namedtuple("ImpactRegion", ("family", "start", "end", "protocol", "ports"))
+
+# The regions newly permitted by the proposed rules, those no longer permitted, and whether regions were
+# left out past the limit.
+RuleSetImpact = namedtuple("RuleSetImpact", ("added", "removed", "truncated"))
+
+_PROTOCOLS = tuple(ACLProtocolChoices.values())
+
+
+def parse_rule_entries(raw_rules):
+    """
+    Parse {"prefix", "protocol", "destination_ports"} mappings into RuleEntries, identified by their index.
+    Raises ValueError, mentioning the offending rule's index, when a rule is malformed.
+    """
+    entries = []
+    for index, raw_rule in enumerate(raw_rules):
+        try:
+            protocol = raw_rule.get("protocol")
+            if protocol not in _PROTOCOLS:
+                raise ValueError
+            ports = [parse_port_range(port) if isinstance(port, str) else port for port in raw_rule.get("destination_ports") or ()]
+            if protocol == ACLProtocolChoices.PROTOCOL_ICMP and ports:
+                raise ValueError
+            entry = make_rule_entry(index, raw_rule.get("prefix"), protocol, ports)
+            if entry is None or any(not 0 <= low <= high <= ALL_PORTS[0][1] for low, high in entry.ports):
+                raise ValueError
+            entries.append(entry)
+        except (AttributeError, TypeError, ValueError):
+            raise ValueError(
+                f"Rule {index}: expected a valid prefix and protocol, and destination ports as ports or "
+                f"[low, high] ranges for TCP and UDP only.",
+            )
+    return entries
+
+
+def _get_port_maps(entries):
+    """
+    Return the ports permitted by rule entries for each address range, as a {(family, protocol):
+    {(start, end): port intervals}} mapping. As rule networks are prefixes, address ranges are nested
+    or disjoint: an address is in at most one range per prefix length.
+    """
+    port_lists = {}
+    for entry in entries:
+        network = entry.network
+        address_range = (int(network.network_address), int(network.broadcast_address))
+        for protocol, ports in get_protocol_ports(entry):
+            port_lists.setdefault((network.version, protocol), {}).setdefault(address_range, []).extend(ports)
+    return {
+        group: {address_range: to_intervals(ports) for address_range, ports in ranges.items()}
+        for group, ranges in port_lists.items()
+    }
+
+
+def _union(interval_lists):
+    intervals = [interval for intervals in interval_lists for interval in intervals]
+    return to_intervals(intervals) if intervals else ()
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _overlaps(merged, start, end):
+    """
+    Return whether the address range overlaps one of the merged, sorted ranges.
+    """
+    position = bisect_right(merged, [start, float("inf")]) - 1
+    if position >= 0 and merged[position][1] >= start:
+        return True
+    return position + 1 < len(merged) and merged[position + 1][0] <= end
+
+
+def _get_relevant_ranges(current, proposed):
+    """
+    Return the address ranges, with their port intervals, of the current and proposed sides of a
+    (family, protocol) group which may differ: those overlapping a range whose ports changed, with
+    their ports restricted to the ports which changed in any range. Returns None when no range changed.
+    """
+    changed = [
+        address_range for address_range in current.keys() | proposed.keys() if current.get(address_range) != proposed.get(address_range)
+    ]
+    if not changed:
+        return None
+
+    changed_ports = _union(
+        subtract_intervals(*sides) + subtract_intervals(*reversed(sides))
+        for sides in ((current.get(address_range, ()), proposed.get(address_range, ())) for address_range in changed)
+    )
+
+    merged = _merge_ranges(changed)
+    sides = []
+    for ranges in (current, proposed):
+        side = {}
+        for address_range, ports in ranges.items():
+            if _overlaps(merged, *address_range):
+                ports = subtract_intervals(ports, subtract_intervals(ports, changed_ports))
+                if ports:
+                    side[address_range] = ports
+        sides.append(side)
+    return sides
+
+
+def _sweep(current, proposed):
+    """
+    Yield the (start, end, added ports, removed ports) segments of the address axis where the port
+    intervals permitted by the current and proposed {(start, end): ports} ranges differ.
+    """
+    events = {}
+    for side, ranges in enumerate((current, proposed)):
+        for address_range in ranges:
+            start, end = address_range
+            events.setdefault(start, []).append((side, address_range, True))
+            events.setdefault(end + 1, []).append((side, address_range, False))
+
+    active = (set(), set())
+    cache = {}
+    boundaries = sorted(events)
+    for position, address in enumerate(boundaries[:-1]):
+        for side, address_range, starting in events[address]:
+            if starting:
+                active[side].add(address_range)
+            else:
+                active[side].discard(address_range)
+        if not active[0] and not active[1]:
+            continue
+
+        key = (frozenset(active[0]), frozenset(active[1]))
+        if key not in cache:
+            current_ports, proposed_ports = (
+                _union(ranges[address_range] for address_range in side_ranges) for side_ranges, ranges in zip(key, (current, proposed))
+            )
+            cache[key] = (subtract_intervals(proposed_ports, current_ports), subtract_intervals(current_ports, proposed_ports))
+        added, removed = cache[key]
+        if added or removed:
+            yield address, boundaries[position + 1] - 1, added, removed
+
+
+def _add_region(regions, family, protocol, start, end, ports):
+    if not ports:
+        return
+    ports = None if protocol == ACLProtocolChoices.PROTOCOL_ICMP else ports
+    last = regions[-1] if regions else None
+    if last and (last.family, last.protocol, last.ports) == (family, protocol, ports) and last.end + 1 == start:
+        regions[-1] = last._replace(end=end)
+    else:
+        regions.append(ImpactRegion(family, start, end, protocol, ports))
+
+
+def compare_rule_sets(current_entries, proposed_entries, limit=None):
+    """
+    Return the RuleSetImpact of replacing the current rules with the proposed ones, given as RuleEntries.
+    Regions are ordered by address family, protocol and address; adjacent addresses with the same port
+    differences are merged. With a limit, the comparison stops once more regions were found.
+    """
+    current_maps = _get_port_maps(current_entries)
+    proposed_maps = _get_port_maps(proposed_entries)
+
+    added = []
+    removed = []
+    for family, protocol in sorted(current_maps.keys() | proposed_maps.keys()):
+        sides = _get_relevant_ranges(current_maps.get((family, protocol), {}), proposed_maps.get((family, protocol), {}))
+        if sides is None:
+            continue
+        for start, end, added_ports, removed_ports in _sweep(*sides):
+            _add_region(added, family, protocol, start, end, added_ports)
+            _add_region(removed, family, protocol, start, end, removed_ports)
+            if limit is not None and len(added) + len(removed) > limit:
+                return RuleSetImpact(added, removed, True)
+    return RuleSetImpact(added, removed, False)
+
+
+def _get_address_class(region):
+    return ipaddress.IPv4Address if region.family == 4 else ipaddress.IPv6Address
+
+
+def get_counterexample(impact):
+    """
+    Return a (address, protocol, port, permitted_by_proposed) flow permitted by one set of rules only,
+    or None when the compared sets of rules are equivalent. The port is None for ICMP.
+    """
+    for regions, permitted_by_proposed in ((impact.added, True), (impact.removed, False)):
+        if regions:
+            region = regions[0]
+            port = region.ports[0][0] if region.ports else None
+            return _get_address_class(region)(region.start), region.protocol, port, permitted_by_proposed
+    return None
+
+
+def get_region_prefixes(region):
+    """
+    Return the prefixes covering the addresses of an ImpactRegion.
+    """
+    address_class = _get_address_class(region)
+    return list(ipaddress.summarize_address_range(address_class(region.start), address_class(region.end)))
@@ -0,0 +1,97 @@
+"""
+Compile Access Lists into in-memory matchers answering "does this flow match" queries.
+"""
+
+import ipaddress
+import threading
+from collections import OrderedDict
+
+from .ports import PortIndex
+from .prefixes import PrefixTrie
+from .rules import get_rule_entries
+
+__all__ = (
+    "CompiledAccessList",
+    "get_compiled_access_list",
+)
+
+# Maximum number of compiled Access Lists kept in memory by each worker process.
+CACHE_SIZE = 256
+
+
+class CompiledAccessList:
+    """
+    In-memory matcher of an Access List.
+
+    Prefixes are indexed in one radix trie per address family. Each trie node holds, per
+    protocol, a PortIndex of the rules using that prefix. Matching a flow walks the trie once
+    and does one binary search per protocol on each node along the path.
+    """
+
+    def __init__(self, entries):
+        self._tries = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        self.rule_count = 0
+
+        for order, entry in enumerate(entries):
+            node = self._tries[entry.network.version].setdefault(entry.network, {})
+            intervals = node.setdefault(entry.protocol, [])
+            intervals.extend((low, high, order, entry.id) for low, high in entry.ports)
+            self.rule_count += 1
+
+        # Replace the raw interval lists by their port indexes.
+        for trie in self._tries.values():
+            for node in trie.payloads():
+                for protocol, intervals in node.items():
+                    node[protocol] = PortIndex(intervals)
+
+    @classmethod
+    def from_access_list(cls, access_list):
+        return cls(get_rule_entries(access_list))
+
+    def match(self, address, protocol, port=0):
+        """
+        Return the ID of the first rule matching the flow, or None when the flow is implicitly denied.
+        """
+        address = ipaddress.ip_address(address)
+        port = port or 0
+        best = None
+        for node in self._tries[address.version].covering(int(address)):
+            for key in (protocol, None):
+                index = node.get(key)
+                if index is None:
+                    continue
+                hit = index.lookup(port)
+                if hit is not None and (best is None or hit < best):
+                    best = hit
+        return best[1] if best else None
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_compiled_access_list(access_list):
+    """
+    Return the compiled matcher of an Access List, reusing the cached one while its rules are unchanged.
+
+    The cache is keyed on the Access List ID and its rules version (rule count and newest
+    last_updated), so any rule change is picked up without explicit invalidation.
+    """
+    key = (access_list.pk, access_list.get_rules_version())
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+
+    compiled = CompiledAccessList.from_access_list(access_list)
+
+    with _cache_lock:
+        # Drop the stale versions of this Access List before caching the new one.
+        for stale_key in [cached_key for cached_key in _cache if cached_key[0] == access_list.pk]:
+            del _cache[stale_key]
+        _cache[key] = compiled
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return compiled
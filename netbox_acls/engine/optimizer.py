@@ -0,0 +1,104 @@
+"""
+Minimize the rules of an Access List into an equivalent, smaller set of rules.
+
+Rules only permit traffic, so a set of rules can be rewritten as any other set permitting the same
+(network, protocol, port) boxes, whatever their order. Per protocol, the optimizer:
+  - merges the ports of the rules sharing a network;
+  - aggregates the adjacent networks, or those nested in one another, with the same ports;
+  - removes the ports permitted by rules of containing networks, dropping the rules left without any;
+until no rule changes. Networks are handled as (family, first address, prefix length) integers.
+"""
+
+import ipaddress
+from collections import namedtuple
+
+from .ports import subtract_intervals, to_intervals
+from .rules import RuleEntry, get_protocol_ports
+
+__all__ = (
+    "RuleSetOptimization",
+    "optimize_rules",
+)
+
+# The optimized rules, as RuleEntries without IDs ordered by protocol and network, and the number of rules
+# before and after the optimization.
+RuleSetOptimization = namedtuple("RuleSetOptimization", ("rules", "before", "after"))
+
+_NETWORK_CLASSES = {4: ipaddress.IPv4Network, 6: ipaddress.IPv6Network}
+_ADDRESS_BITS = {4: 32, 6: 128}
+
+
+def _get_mask(family, prefixlen):
+    bits = _ADDRESS_BITS[family]
+    return ((1 << bits) - 1) ^ ((1 << (bits - prefixlen)) - 1)
+
+
+def _trim_covered(networks):
+    """
+    Remove from the ports of a {(family, start, prefixlen): ports} mapping those permitted by the containing
+    networks, dropping the networks left without ports. Ports are only trimmed when it does not split their
+    ranges, which would take more entries. Only the prefix lengths in use are looked up for supernets.
+    """
+    prefixlens = {}
+    for family, _, prefixlen in networks:
+        prefixlens.setdefault(family, set()).add(prefixlen)
+    prefixlens = {family: sorted(lengths) for family, lengths in prefixlens.items()}
+
+    trimmed = {}
+    for (family, start, prefixlen), ports in networks.items():
+        supernet_ports = []
+        for length in prefixlens[family]:
+            if length >= prefixlen:
+                break
+            supernet_ports.extend(networks.get((family, start & _get_mask(family, length), length), ()))
+        if supernet_ports:
+            remaining = subtract_intervals(ports, to_intervals(supernet_ports))
+            if not remaining:
+                continue
+            if len(remaining) <= len(ports):
+                ports = remaining
+        trimmed[family, start, prefixlen] = ports
+    return trimmed
+
+
+def _aggregate(networks):
+    """
+    Aggregate the adjacent networks of a {(family, start, prefixlen): ports} mapping with the same ports.
+    """
+    groups = {}
+    for (family, start, prefixlen), ports in networks.items():
+        groups.setdefault((family, ports), []).append(_NETWORK_CLASSES[family]((start, prefixlen)))
+
+    port_lists = {}
+    for (family, ports), group in groups.items():
+        for network in ipaddress.collapse_addresses(group):
+            key = (family, int(network.network_address), network.prefixlen)
+            port_lists.setdefault(key, []).extend(ports)
+    return {key: to_intervals(ports) for key, ports in port_lists.items()}
+
+
+def optimize_rules(entries):
+    """
+    Return the RuleSetOptimization of RuleEntries. Rules matching any protocol are split into rules of
+    each protocol, as Access List rules have one.
+    """
+    entries = list(entries)
+    port_lists = {}
+    for entry in entries:
+        network = entry.network
+        key = (network.version, int(network.network_address), network.prefixlen)
+        for protocol, ports in get_protocol_ports(entry):
+            port_lists.setdefault(protocol, {}).setdefault(key, []).extend(ports)
+
+    rules = []
+    for protocol, networks in sorted(port_lists.items()):
+        networks = {key: to_intervals(ports) for key, ports in networks.items()}
+        while True:
+            optimized = _trim_covered(_aggregate(networks))
+            if optimized == networks:
+                break
+            networks = optimized
+        for family, start, prefixlen in sorted(networks):
+            ports = networks[family, start, prefixlen]
+            rules.append(RuleEntry(None, _NETWORK_CLASSES[family]((start, prefixlen)), protocol, ports))
+    return RuleSetOptimization(rules, len(entries), len(rules))
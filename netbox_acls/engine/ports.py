@@ -0,0 +1,247 @@
+"""
+Helpers to handle destination ports as sorted sets of inclusive port intervals.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from heapq import heappop, heappush
+
+__all__ = (
+    "ALL_PORTS",
+    "MAX_PORT",
+    "IntervalSet",
+    "PortIndex",
+    "format_port_ranges",
+    "merge_port_ranges",
+    "parse_port_range",
+    "parse_port_ranges",
+    "subtract_intervals",
+    "to_intervals",
+)
+
+MAX_PORT = 65535
+
+# Interval covering every port, used for rules which do not restrict the destination port.
+ALL_PORTS = ((0, MAX_PORT),)
+
+# A port or port range, e.g. "443" or "1024-65535", or a [low, high] pair as the API returns them.
+PORT_RANGE_RE = re.compile(r"^\s*\[?\s*(\d+)\s*(?:[-,]\s*(\d+)\s*)?\]?\s*$")
+
+
+def to_intervals(ports):
+    """
+    Convert destination ports into a sorted tuple of merged, inclusive (low, high) intervals.
+    Returns ALL_PORTS when no port is set.
+    """
+    if not ports:
+        return ALL_PORTS
+
+    intervals = []
+    for low, high in sorted((port, port) if isinstance(port, int) else tuple(port) for port in ports):
+        if intervals and low <= intervals[-1][1] + 1:
+            if high > intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], high)
+        else:
+            intervals.append((low, high))
+    return tuple(intervals)
+
+
+def subtract_intervals(intervals, other):
+    """
+    Return the parts of the sorted, merged intervals not covered by the other sorted, merged intervals,
+    walking both at once.
+    """
+    remaining = []
+    position = 0
+    for low, high in intervals:
+        while position < len(other) and other[position][1] < low:
+            position += 1
+        index = position
+        while index < len(other) and other[index][0] <= high:
+            if low < other[index][0]:
+                remaining.append((low, other[index][0] - 1))
+            low = other[index][1] + 1
+            index += 1
+        if low <= high:
+            remaining.append((low, high))
+    return tuple(remaining)
+
+
+def merge_port_ranges(ports):
+    """
+    Convert destination ports, given as ports or (low, high) ranges, into the sorted list of merged
+    [low, high] ranges they are stored as. Returns an empty list when no port is set. Raises ValueError
+    when a port is out of bounds or a range is reversed.
+    """
+    if not ports:
+        return []
+    ranges = []
+    for port in ports:
+        low, high = (port, port) if isinstance(port, int) else port
+        low, high = int(low), int(high)
+        if not 0 <= low <= high <= MAX_PORT:
+            raise ValueError(f"{low}-{high} is not a valid port range.")
+        ranges.append((low, high))
+    return [list(interval) for interval in to_intervals(ranges)]
+
+
+def parse_port_range(value):
+    """
+    Parse a port or port range, e.g. "443" or "1024-65535", into a (low, high) tuple.
+    Raises ValueError when the value is not a valid port range.
+    """
+    match = PORT_RANGE_RE.match(str(value))
+    if match is None:
+        raise ValueError(f"{value} is not a valid port or port range.")
+    low = int(match.group(1))
+    high = int(match.group(2) or low)
+    if not low <= high <= MAX_PORT:
+        raise ValueError(f"{value} is not a valid port or port range.")
+    return low, high
+
+
+def parse_port_ranges(value):
+    """
+    Parse comma-separated ports and port ranges, e.g. "22,80,1024-65535", into merged [low, high] ranges.
+    Pairs in brackets are accepted as well. Raises ValueError when an item is not a valid port range.
+    """
+    # Split on the commas separating items, not on those inside brackets.
+    items = re.findall(r"\[[^\]]*\]|[^,]+", str(value))
+    return merge_port_ranges([parse_port_range(item) for item in items if item.strip()])
+
+
+def format_port_ranges(ranges, separator=", "):
+    """
+    Format [low, high] port ranges as "22, 80, 1024-65535".
+    """
+    return separator.join(str(low) if low == high else f"{low}-{high}" for low, high in ranges or ())
+
+
+class PortIndex:
+    """
+    Index of the port intervals of several rules, answering "which rule comes first for this port"
+    with a binary search over disjoint port segments.
+    """
+
+    def __init__(self, entries):
+        """
+        Build the index from (low, high, order, rule_id) entries. Each port segment keeps the
+        entry with the lowest order covering it.
+        """
+        events = sorted(entries)
+        boundaries = sorted({low for low, *_ in events} | {high + 1 for _, high, *_ in events})
+
+        self._starts = []
+        self._hits = []
+        active = []
+        position = 0
+        for start in boundaries:
+            while position < len(events) and events[position][0] <= start:
+                _, high, order, rule_id = events[position]
+                heappush(active, (order, high, rule_id))
+                position += 1
+            # Drop the intervals which ended before this segment.
+            while active and active[0][1] < start:
+                heappop(active)
+            hit = (active[0][0], active[0][2]) if active else None
+            if self._hits and self._hits[-1] == hit:
+                continue
+            self._starts.append(start)
+            self._hits.append(hit)
+
+    def segments(self):
+        """
+        Iterate over the (start, hit) port segments of the index, hit being None for uncovered segments.
+        """
+        return zip(self._starts, self._hits)
+
+    def lookup(self, port):
+        """
+        Return the (order, rule_id) of the first rule covering the port, or None.
+        """
+        position = bisect_right(self._starts, port) - 1
+        if position < 0:
+            return None
+        return self._hits[position]
+
+
+class IntervalSet:
+    """
+    Mutable union of inclusive integer intervals, kept as sorted disjoint intervals.
+
+    Each interval remembers a few of the owners (e.g. rule IDs) whose intervals were merged into it.
+    """
+
+    MAX_OWNERS = 5
+
+    __slots__ = ("_highs", "_lows", "_owners")
+
+    def __init__(self):
+        self._lows = []
+        self._highs = []
+        self._owners = []
+
+    def __bool__(self):
+        return bool(self._lows)
+
+    def __iter__(self):
+        return zip(self._lows, self._highs)
+
+    def copy(self):
+        interval_set = IntervalSet()
+        interval_set._lows = self._lows.copy()
+        interval_set._highs = self._highs.copy()
+        interval_set._owners = self._owners.copy()
+        return interval_set
+
+    def add(self, low, high, owners=()):
+        """
+        Add an interval, merging it with the overlapping or adjacent intervals.
+        """
+        start = bisect_left(self._highs, low - 1)
+        end = bisect_right(self._lows, high + 1)
+        if start < end:
+            low = min(low, self._lows[start])
+            high = max(high, self._highs[end - 1])
+            merged = []
+            for interval_owners in self._owners[start:end]:
+                merged.extend(owner for owner in interval_owners if owner not in merged)
+            owners = tuple(merged + [owner for owner in owners if owner not in merged])[: self.MAX_OWNERS]
+        self._lows[start:end] = [low]
+        self._highs[start:end] = [high]
+        self._owners[start:end] = [tuple(owners)[: self.MAX_OWNERS]]
+
+    def update(self, other):
+        """
+        Add every interval of another IntervalSet.
+        """
+        for low, high, owners in zip(other._lows, other._highs, other._owners):
+            self.add(low, high, owners)
+
+    def subtract(self, intervals):
+        """
+        Return the parts of the given sorted intervals which are not covered by the set.
+        """
+        remaining = []
+        for low, high in intervals:
+            position = bisect_left(self._highs, low)
+            while position < len(self._lows) and self._lows[position] <= high:
+                if low < self._lows[position]:
+                    remaining.append((low, self._lows[position] - 1))
+                low = self._highs[position] + 1
+                position += 1
+            if low <= high:
+                remaining.append((low, high))
+        return remaining
+
+    def owners(self, intervals):
+        """
+        Return the owners of the set's intervals overlapping the given sorted intervals.
+        """
+        owners = []
+        for low, high in intervals:
+            position = bisect_left(self._highs, low)
+            while position < len(self._lows) and self._lows[position] <= high:
+                owners.extend(owner for owner in self._owners[position] if owner not in owners)
+                position += 1
+        return owners
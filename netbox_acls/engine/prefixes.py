@@ -0,0 +1,148 @@
+"""
+Helpers to parse the free-form rule prefixes and index them in a radix trie.
+"""
+
+import ipaddress
+
+__all__ = (
+    "PrefixTrie",
+    "get_network_range",
+    "network_from_range",
+    "parse_address_range",
+    "parse_prefix",
+    "split_address",
+)
+
+# Addresses are stored as two signed 64-bit halves, bits 127-64 and 63-0 each offset by -2**63, so
+# that comparing (high, low) pairs of bigint columns orders them as the addresses themselves.
+HALF_OFFSET = 1 << 63
+HALF_MASK = (1 << 64) - 1
+
+
+def parse_prefix(value):
+    """
+    Parse a rule prefix into an IPv4Network/IPv6Network, ignoring host bits.
+    Returns None when the value is not a valid prefix.
+    """
+    if not value:
+        return None
+    try:
+        return ipaddress.ip_network(str(value).strip(), strict=False)
+    except ValueError:
+        return None
+
+
+def split_address(address):
+    """
+    Split an integer address into its (high, low) signed 64-bit halves.
+    """
+    return (address >> 64) - HALF_OFFSET, (address & HALF_MASK) - HALF_OFFSET
+
+
+def _join_address(high, low):
+    return ((high + HALF_OFFSET) << 64) | (low + HALF_OFFSET)
+
+
+def get_network_range(network):
+    """
+    Return the numeric range of a network, as (family, start_high, start_low, end_high, end_low),
+    or a tuple of None when there is no network.
+    """
+    if network is None:
+        return (None,) * 5
+    return (
+        network.version,
+        *split_address(int(network.network_address)),
+        *split_address(int(network.broadcast_address)),
+    )
+
+
+def network_from_range(family, start_high, start_low, end_high, end_low):
+    """
+    Rebuild the IPv4Network/IPv6Network of a numeric range returned by get_network_range(), without
+    parsing text. Returns None when the family is None.
+    """
+    if family is None:
+        return None
+    start = _join_address(start_high, start_low)
+    size = _join_address(end_high, end_low) - start + 1
+    if family == 4:
+        return ipaddress.IPv4Network((start, ipaddress.IPV4LENGTH - size.bit_length() + 1))
+    return ipaddress.IPv6Network((start, ipaddress.IPV6LENGTH - size.bit_length() + 1))
+
+
+def parse_address_range(value):
+    """
+    Parse an address range, given as a prefix or as "<first address>-<last address>", into its
+    (family, start, end) integer bounds. Returns None when the value is not a valid range.
+    """
+    if not value:
+        return None
+    first, separator, last = str(value).partition("-")
+    if not separator:
+        network = parse_prefix(value)
+        if network is None:
+            return None
+        return network.version, int(network.network_address), int(network.broadcast_address)
+    try:
+        first = ipaddress.ip_address(first.strip())
+        last = ipaddress.ip_address(last.strip())
+    except ValueError:
+        return None
+    if first.version != last.version or first > last:
+        return None
+    return first.version, int(first), int(last)
+
+
+class PrefixTrie:
+    """
+    Binary radix trie keyed on the bits of IP prefixes, for a single address family.
+
+    Each node is a [child_0, child_1, payload] list. Looking up an address walks at most
+    one node per prefix bit and yields the payload of every prefix containing it, from the
+    least to the most specific.
+    """
+
+    def __init__(self, max_prefixlen):
+        self.max_prefixlen = max_prefixlen
+        self._root = [None, None, None]
+
+    def setdefault(self, network, default):
+        """
+        Return the payload stored for a network, storing the default first if there is none.
+        """
+        node = self._root
+        address = int(network.network_address)
+        for depth in range(network.prefixlen):
+            bit = (address >> (self.max_prefixlen - 1 - depth)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        if node[2] is None:
+            node[2] = default
+        return node[2]
+
+    def payloads(self):
+        """
+        Iterate over every payload stored in the trie.
+        """
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node[2] is not None:
+                yield node[2]
+            stack.extend(child for child in node[:2] if child is not None)
+
+    def covering(self, address):
+        """
+        Iterate over the payloads of every prefix containing the integer address.
+        """
+        node = self._root
+        shift = self.max_prefixlen - 1
+        while node is not None:
+            if node[2] is not None:
+                yield node[2]
+            if shift < 0:
+                break
+            node = node[(address >> shift) & 1]
+            shift -= 1
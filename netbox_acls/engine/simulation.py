@@ -0,0 +1,212 @@
+"""
+Evaluate large batches of flows against ordered sets of Access Lists.
+
+The evaluation is vectorized with NumPy when it is installed: flow addresses become integer
+arrays and the rules are indexed as sorted integer keys per prefix length, so each prefix
+length costs a couple of binary searches over the whole batch of flows. Without NumPy, the
+flows are evaluated one by one with the compiled matchers.
+"""
+
+import ipaddress
+from collections import namedtuple
+
+from ..choices import ACLProtocolChoices
+from .matcher import CompiledAccessList
+from .ports import MAX_PORT, PortIndex
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = (
+    "Flow",
+    "FlowVerdict",
+    "RuleSet",
+    "parse_flows",
+    "simulate_flows",
+)
+
+# A flow to evaluate. Port may be None for ICMP flows.
+Flow = namedtuple("Flow", ("source", "destination", "protocol", "port"))
+
+# The first rule matching a flow, or (None, None) when the flow is implicitly denied.
+FlowVerdict = namedtuple("FlowVerdict", ("access_list", "rule"))
+
+# The rules of an Access List, matched against either the source or the destination of the flows.
+RuleSet = namedtuple("RuleSet", ("access_list", "match_destination", "entries"))
+
+# Protocols are encoded as small integers, 0 standing for rules matching any protocol.
+_ANY_PROTOCOL = 0
+_PROTOCOL_CODES = {protocol: code for code, protocol in enumerate(ACLProtocolChoices.values(), start=1)}
+_PROTOCOL_SLOTS = len(_PROTOCOL_CODES) + 1
+_PORT_SLOTS = MAX_PORT + 2
+
+_LOW_64 = (1 << 64) - 1
+_MAX_PREFIXLEN = {4: 32, 6: 128}
+
+
+def parse_flows(raw_flows):
+    """
+    Parse (source, destination, protocol, port) sequences into Flows.
+    Raises ValueError, mentioning the offending flow's index, when a flow is malformed.
+    """
+    flows = []
+    for index, raw_flow in enumerate(raw_flows):
+        try:
+            source, destination, protocol, *port = raw_flow
+            if len(port) > 1 or protocol not in _PROTOCOL_CODES:
+                raise ValueError
+            port = int(port[0]) if port and port[0] is not None else None
+            if protocol != ACLProtocolChoices.PROTOCOL_ICMP and (port is None or not 0 <= port <= MAX_PORT):
+                raise ValueError
+            flows.append(
+                Flow(ipaddress.ip_address(source), ipaddress.ip_address(destination), protocol, port),
+            )
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"Flow {index}: expected [source, destination, protocol, port] with a valid protocol and port.",
+            )
+    return flows
+
+
+def simulate_flows(rule_sets, flows):
+    """
+    Evaluate each flow against the concatenated rules of the rule sets, in order, and
+    return one FlowVerdict per flow.
+    """
+    if numpy is None:
+        return _simulate_compiled(rule_sets, flows)
+    return _simulate_vectorized(rule_sets, flows)
+
+
+def _simulate_compiled(rule_sets, flows):
+    """
+    Fallback evaluation, one flow at a time against each compiled Access List.
+    """
+    compiled = [
+        (rule_set.access_list, rule_set.match_destination, CompiledAccessList(rule_set.entries))
+        for rule_set in rule_sets
+    ]
+    verdicts = []
+    for flow in flows:
+        verdict = FlowVerdict(None, None)
+        for access_list, match_destination, matcher in compiled:
+            address = flow.destination if match_destination else flow.source
+            rule_id = matcher.match(address, flow.protocol, flow.port)
+            if rule_id is not None:
+                verdict = FlowVerdict(access_list, rule_id)
+                break
+        verdicts.append(verdict)
+    return verdicts
+
+
+def _split(value):
+    """
+    Split a 128-bit integer into its (high, low) 64-bit halves.
+    """
+    return value >> 64, value & _LOW_64
+
+
+def _address_arrays(addresses):
+    """
+    Convert addresses into (version, high, low) integer arrays.
+    """
+    halves = [_split(int(address)) for address in addresses]
+    return (
+        numpy.fromiter((address.version for address in addresses), dtype=numpy.uint8, count=len(addresses)),
+        numpy.fromiter((high for high, _ in halves), dtype=numpy.uint64, count=len(halves)),
+        numpy.fromiter((low for _, low in halves), dtype=numpy.uint64, count=len(halves)),
+    )
+
+
+def _group_rules(rule_sets):
+    """
+    Group the port intervals of the rules by (match_destination, version, prefixlen), then by
+    network address and protocol code. Rules are numbered in evaluation order across all rule sets.
+    """
+    verdicts = []
+    groups = {}
+    for rule_set in rule_sets:
+        for entry in rule_set.entries:
+            order = len(verdicts)
+            verdicts.append(FlowVerdict(rule_set.access_list, entry.id))
+            network = entry.network
+            networks = groups.setdefault((rule_set.match_destination, network.version, network.prefixlen), {})
+            protocols = networks.setdefault(int(network.network_address), {})
+            intervals = protocols.setdefault(_PROTOCOL_CODES.get(entry.protocol, _ANY_PROTOCOL), [])
+            intervals.extend((low, high, order, order) for low, high in entry.ports)
+    return verdicts, groups
+
+
+def _simulate_vectorized(rule_sets, flows):
+    """
+    Vectorized evaluation.
+
+    For each prefix length used by the rules, the flow addresses are masked and looked up among
+    the rules' network addresses with a binary search, then the (network, protocol, port) segment
+    is looked up with a second binary search. The lowest rule order found across all prefix lengths
+    is the first matching rule.
+    """
+    verdicts, groups = _group_rules(rule_sets)
+    if not flows or not verdicts:
+        return [FlowVerdict(None, None)] * len(flows)
+
+    no_match = len(verdicts)
+    best = numpy.full(len(flows), no_match, dtype=numpy.int64)
+    addresses = {
+        False: _address_arrays([flow.source for flow in flows]),
+        True: _address_arrays([flow.destination for flow in flows]),
+    }
+    flow_protocols = numpy.fromiter(
+        (_PROTOCOL_CODES[flow.protocol] for flow in flows), dtype=numpy.int64, count=len(flows),
+    )
+    flow_ports = numpy.fromiter((flow.port or 0 for flow in flows), dtype=numpy.int64, count=len(flows))
+
+    for (match_destination, version, prefixlen), networks in groups.items():
+        flow_version, flow_high, flow_low = addresses[match_destination]
+        max_prefixlen = _MAX_PREFIXLEN[version]
+        mask_high, mask_low = _split(((1 << prefixlen) - 1) << (max_prefixlen - prefixlen))
+
+        # Rank the network addresses of the group on each 64-bit half, to turn them into small integer keys.
+        network_halves = [_split(network) for network in networks]
+        high_values = numpy.unique(numpy.array([high for high, _ in network_halves], dtype=numpy.uint64))
+        low_values = numpy.unique(numpy.array([low for _, low in network_halves], dtype=numpy.uint64))
+
+        # Flatten the port segments of each (network, protocol) into sorted integer keys.
+        segment_keys = []
+        segment_orders = []
+        for (high, low), protocols in zip(network_halves, networks.values()):
+            network_key = (
+                int(numpy.searchsorted(high_values, numpy.uint64(high))) * len(low_values)
+                + int(numpy.searchsorted(low_values, numpy.uint64(low)))
+            )
+            for protocol, intervals in protocols.items():
+                base = (network_key * _PROTOCOL_SLOTS + protocol) * _PORT_SLOTS
+                for start, hit in PortIndex(intervals).segments():
+                    segment_keys.append(base + start)
+                    segment_orders.append(hit[0] if hit else no_match)
+        segment_keys = numpy.array(segment_keys, dtype=numpy.int64)
+        segment_orders = numpy.array(segment_orders, dtype=numpy.int64)
+        sort = numpy.argsort(segment_keys, kind="stable")
+        segment_keys = segment_keys[sort]
+        segment_orders = segment_orders[sort]
+
+        # Look up the masked flow addresses among the group's network addresses.
+        masked_high = flow_high & numpy.uint64(mask_high)
+        masked_low = flow_low & numpy.uint64(mask_low)
+        high_rank = numpy.minimum(numpy.searchsorted(high_values, masked_high), len(high_values) - 1)
+        low_rank = numpy.minimum(numpy.searchsorted(low_values, masked_low), len(low_values) - 1)
+        found = (flow_version == version) & (high_values[high_rank] == masked_high) & (low_values[low_rank] == masked_low)
+        network_keys = high_rank.astype(numpy.int64) * len(low_values) + low_rank.astype(numpy.int64)
+
+        # Look up the port segment, both for the flow's protocol and for rules matching any protocol.
+        for protocols in (flow_protocols, _ANY_PROTOCOL):
+            bases = (network_keys * _PROTOCOL_SLOTS + protocols) * _PORT_SLOTS
+            position = numpy.searchsorted(segment_keys, bases + flow_ports, side="right") - 1
+            valid = found & (position >= 0)
+            position = numpy.maximum(position, 0)
+            valid &= segment_keys[position] >= bases
+            best = numpy.where(valid, numpy.minimum(best, segment_orders[position]), best)
+
+    return [verdicts[order] if order < no_match else FlowVerdict(None, None) for order in best.tolist()]
@@ -0,0 +1,44 @@
+"""
+Estimate the number of TCAM entries a rule takes once programmed in hardware.
+
+TCAM entries match fields with a value and a mask, so a port range which is not a single aligned power
+of two is expanded into several (port, mask) entries, e.g. 1-65535 into 16 of them. A rule takes one entry
+per (protocol, port prefix) combination of its prefix.
+"""
+
+from ..choices import ACLProtocolChoices
+
+__all__ = (
+    "count_port_range_prefixes",
+    "get_tcam_entry_count",
+)
+
+# Bits of a port number.
+PORT_BITS = 16
+
+
+def count_port_range_prefixes(low, high):
+    """
+    Return the number of (port, mask) prefixes covering exactly the inclusive port range: the largest
+    aligned block starting at low is taken, until the range is covered.
+    """
+    count = 0
+    while low <= high:
+        size = low & -low if low else 1 << PORT_BITS
+        while size > high - low + 1:
+            size >>= 1
+        low += size
+        count += 1
+    return count
+
+
+def get_tcam_entry_count(protocol, ports):
+    """
+    Return the number of TCAM entries of a rule, given its protocol and destination ports as [low, high]
+    ranges. Rules matching any port take a single entry per protocol; rules matching any protocol on
+    given ports take entries for both TCP and UDP.
+    """
+    if protocol == ACLProtocolChoices.PROTOCOL_ICMP or not ports:
+        return 1
+    count = sum(count_port_range_prefixes(low, high) for low, high in ports)
+    return count if protocol else count * 2
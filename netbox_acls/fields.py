@@ -0,0 +1,92 @@
+"""
+Custom model and form fields for the plugin.
+"""
+
+import json
+
+from django import forms
+from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import ValidationError
+from django.db import models
+from ipam.fields import IPNetworkField
+
+from .engine import format_port_ranges, merge_port_ranges, parse_port_ranges
+from .lookups import NetOverlaps, PortRangesOverlap
+
+__all__ = (
+    "PortRangesField",
+    "PortRangesFormField",
+    "RuleNetworkField",
+)
+
+
+class RuleNetworkField(IPNetworkField):
+    """
+    PostgreSQL cidr column holding the parsed network of a rule's free-form prefix. It supports
+    NetBox's network lookups (net_contains_or_equals, net_contained_or_equal, ...) plus net_overlaps.
+    """
+
+
+RuleNetworkField.register_lookup(NetOverlaps)
+
+
+class PortRangesFormField(forms.CharField):
+    """
+    Form field entering port ranges as comma-separated ports and port ranges, e.g. "22,80,1024-65535".
+    """
+
+    def prepare_value(self, value):
+        if isinstance(value, (list, tuple)):
+            return format_port_ranges(merge_port_ranges(value))
+        return value
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return []
+        try:
+            return parse_port_ranges(value)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+
+class PortRangesField(ArrayField):
+    """
+    PostgreSQL two-dimensional integer array holding destination ports as the sorted list of their merged,
+    inclusive [low, high] ranges: a range of ports is stored as two integers rather than one per port.
+    Ports are merged into ranges when the field is cleaned or saved. It supports the port_overlaps lookup.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["base_field"] = ArrayField(models.PositiveIntegerField(), size=2)
+        super().__init__(**kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs["base_field"]
+        return name, path, args, kwargs
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            value = json.loads(value)
+        if value is None:
+            return None
+        try:
+            return merge_port_ranges(value)
+        except (TypeError, ValueError) as e:
+            raise ValidationError(str(e), code="invalid")
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if isinstance(value, (list, tuple)):
+            value = merge_port_ranges(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj))
+
+    def formfield(self, **kwargs):
+        # Skip ArrayField's, which would build a form field per dimension.
+        return super(ArrayField, self).formfield(**{"form_class": PortRangesFormField, **kwargs})
+
+
+PortRangesField.register_lookup(PortRangesOverlap)
@@ -4,19 +4,93 @@ when filtering the sites list by status or region, for instance.
 """
 import django_filters
 from dcim.models import DeviceRole, Interface
-from netbox.filtersets import NetBoxModelFilterSet
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields.ranges import NumericRange
+from django.db.models import Q
+from django_filters.constants import EMPTY_VALUES
+from netbox.filtersets import BaseFilterSet, NetBoxModelFilterSet
+from utilities.filters import MultiValueNumberFilter
 from virtualization.models import VMInterface
 
-from .models import AccessList, ACLEgressRule, ACLInterfaceAssignment, ACLIngressRule
+from .engine import parse_address_range, parse_port_range, parse_prefix, split_address
+from .models import AccessList, ACLEffectiveRule, ACLEgressRule, ACLInterfaceAssignment, ACLIngressRule
 
 __all__ = (
     "AccessListFilterSet",
     "ACLIngressRuleFilterSet",
+    "ACLEffectiveRuleFilterSet",
     "ACLInterfaceAssignmentFilterSet",
     "ACLEgressRuleFilterSet",
 )
 
 
+class NetworkFilter(django_filters.CharFilter):
+    """
+    Filter a rule network column with a network lookup. Values which are not valid prefixes match nothing.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        network = parse_prefix(value)
+        if network is None:
+            return qs.none()
+        return super().filter(qs, str(network))
+
+
+def _get_range_bound_filter(bound, lookup, address):
+    """
+    Compare the (high, low) columns of the start or end bound of the rules' network range with an
+    integer address, lookup being "lte" or "gte". The leading condition on the high half is the
+    range the bound's index is scanned with.
+    """
+    high, low = split_address(address)
+    return Q(**{f"network_{bound}_high__{lookup}": high}) & (
+        Q(**{f"network_{bound}_high__{lookup[:2]}": high}) | Q(**{f"network_{bound}_low__{lookup}": low})
+    )
+
+
+class NetworkRangeFilter(django_filters.CharFilter):
+    """
+    Filter rules on the numeric range of their network with an address range, given as a prefix or as
+    "<first address>-<last address>": the "overlaps" lookup matches networks sharing an address with it,
+    the "within" lookup networks inside it. Values which are not valid ranges match nothing.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        address_range = parse_address_range(value)
+        if address_range is None:
+            return qs.none()
+        family, start, end = address_range
+        if self.lookup_expr == "within":
+            condition = _get_range_bound_filter("start", "gte", start) & _get_range_bound_filter("end", "lte", end)
+        else:
+            condition = _get_range_bound_filter("start", "lte", end) & _get_range_bound_filter("end", "gte", start)
+        return qs.filter(condition, network_family=family)
+
+
+class PortRangeFilter(django_filters.CharFilter):
+    """
+    Filter rules on their destination ports with a port or port range, e.g. "443" or "1024-65535",
+    matching rules with a port in it. The GiST index on the port span narrows down the rules whose
+    ranges are then checked. Values which are not valid port ranges match nothing.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        try:
+            low, high = parse_port_range(value)
+        except ValueError:
+            return qs.none()
+        return qs.filter(
+            destination_port_span__overlap=NumericRange(low, high, "[]"),
+            destination_ports__port_overlaps=(low, high),
+        )
+
+
 class AccessListFilterSet(NetBoxModelFilterSet):
     """
     Define the filter set for the django model AccessList.
@@ -111,13 +185,40 @@ class ACLIngressRuleFilterSet(NetBoxModelFilterSet):
     Define the filter set for the django model ACLIngressRule.
     """
 
+    source_prefix__net_contains_or_equals = NetworkFilter(
+        field_name="source_network",
+        lookup_expr="net_contains_or_equals",
+        label="Source Prefix (contains or equals)",
+    )
+    source_prefix__net_contained_or_equal = NetworkFilter(
+        field_name="source_network",
+        lookup_expr="net_contained_or_equal",
+        label="Source Prefix (contained by or equals)",
+    )
+    source_prefix__net_overlaps = NetworkFilter(
+        field_name="source_network",
+        lookup_expr="net_overlaps",
+        label="Source Prefix (overlaps)",
+    )
+    source_prefix__range_overlaps = NetworkRangeFilter(
+        lookup_expr="overlaps",
+        label="Source Prefix (overlaps address range)",
+    )
+    source_prefix__range_within = NetworkRangeFilter(
+        lookup_expr="within",
+        label="Source Prefix (within address range)",
+    )
+    destination_ports__overlaps = PortRangeFilter(
+        label="Destination Ports (overlap port range)",
+    )
+
     class Meta:
         """
         Associates the django model ACLIngressRule & fields to the filter set.
         """
 
         model = ACLIngressRule
-        fields = ("id", "access_list", "source_prefix", "protocol")
+        fields = ("id", "access_list", "sequence", "source_prefix", "protocol")
 
     def search(self, queryset, name, value):
         """
@@ -131,16 +232,104 @@ class ACLEgressRuleFilterSet(NetBoxModelFilterSet):
     Define the filter set for the django model ACLEgressRule.
     """
 
+    destination_prefix__net_contains_or_equals = NetworkFilter(
+        field_name="destination_network",
+        lookup_expr="net_contains_or_equals",
+        label="Destination Prefix (contains or equals)",
+    )
+    destination_prefix__net_contained_or_equal = NetworkFilter(
+        field_name="destination_network",
+        lookup_expr="net_contained_or_equal",
+        label="Destination Prefix (contained by or equals)",
+    )
+    destination_prefix__net_overlaps = NetworkFilter(
+        field_name="destination_network",
+        lookup_expr="net_overlaps",
+        label="Destination Prefix (overlaps)",
+    )
+    destination_prefix__range_overlaps = NetworkRangeFilter(
+        lookup_expr="overlaps",
+        label="Destination Prefix (overlaps address range)",
+    )
+    destination_prefix__range_within = NetworkRangeFilter(
+        lookup_expr="within",
+        label="Destination Prefix (within address range)",
+    )
+    destination_ports__overlaps = PortRangeFilter(
+        label="Destination Ports (overlap port range)",
+    )
+
     class Meta:
         """
         Associates the django model ACLEgressRule & fields to the filter set.
         """
 
         model = ACLEgressRule
-        fields = ("id", "access_list", "destination_prefix", "protocol")
+        fields = ("id", "access_list", "sequence", "destination_prefix", "protocol")
 
     def search(self, queryset, name, value):
         """
         Override the default search behavior for the django model.
         """
         return queryset.filter(description__icontains=value)
+
+
+class ACLEffectiveRuleFilterSet(BaseFilterSet):
+    """
+    Define the filter set for the django model ACLEffectiveRule.
+    """
+
+    interface_id = MultiValueNumberFilter(
+        method="filter_interface",
+        label="Interface (ID)",
+    )
+    vminterface_id = MultiValueNumberFilter(
+        method="filter_interface",
+        label="VM Interface (ID)",
+    )
+    device_id = MultiValueNumberFilter(
+        method="filter_host",
+        label="Device (ID)",
+    )
+    virtual_machine_id = MultiValueNumberFilter(
+        method="filter_host",
+        label="Virtual Machine (ID)",
+    )
+
+    class Meta:
+        """
+        Associates the django model ACLEffectiveRule & fields to the filter set.
+        """
+
+        model = ACLEffectiveRule
+        fields = (
+            "id",
+            "direction",
+            "access_list",
+            "assignment",
+            "ingress_rule",
+            "egress_rule",
+        )
+
+    def filter_interface(self, queryset, name, value):
+        """
+        Filter on the assigned interfaces or VM interfaces, matching the indexed columns directly.
+        """
+        model = Interface if name == "interface_id" else VMInterface
+        return queryset.filter(
+            assigned_object_type=ContentType.objects.get_for_model(model),
+            assigned_object_id__in=value,
+        )
+
+    def filter_host(self, queryset, name, value):
+        """
+        Filter on the interfaces of devices or virtual machines.
+        """
+        if name == "device_id":
+            interfaces = Interface.objects.filter(device__in=value)
+        else:
+            interfaces = VMInterface.objects.filter(virtual_machine__in=value)
+        return queryset.filter(
+            assigned_object_type=ContentType.objects.get_for_model(interfaces.model),
+            assigned_object_id__in=interfaces.values("pk"),
+        )
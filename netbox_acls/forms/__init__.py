@@ -8,7 +8,9 @@ Import each of the directory's scripts.
 
 # from .bulk_import import *
 # from .connections import *
+from .coverage import *
 from .filtersets import *
+from .history import *
 
 # from .formsets import *
 from .models import *
@@ -0,0 +1,48 @@
+"""
+Defines the GUI form of the reverse lookup of the rules covering an address or prefix.
+"""
+
+from django import forms
+from utilities.forms import BootstrapMixin
+from utilities.forms.utils import add_blank_choice
+
+from ..choices import ACLAssignmentDirectionChoices, ACLProtocolChoices
+from ..engine import MAX_PORT, parse_prefix
+
+__all__ = ("ACLCoverageForm",)
+
+
+class ACLCoverageForm(BootstrapMixin, forms.Form):
+    """
+    GUI form to look up the rules covering an IP address or prefix.
+    """
+
+    prefix = forms.CharField(
+        label="IP Address or Prefix",
+        help_text="e.g. 192.0.2.10 or 192.0.2.0/24",
+    )
+    protocol = forms.ChoiceField(
+        choices=add_blank_choice(ACLProtocolChoices),
+        required=False,
+    )
+    port = forms.IntegerField(
+        min_value=0,
+        max_value=MAX_PORT,
+        required=False,
+        label="Destination Port",
+    )
+    direction = forms.ChoiceField(
+        choices=add_blank_choice(ACLAssignmentDirectionChoices),
+        required=False,
+    )
+
+    def clean_prefix(self):
+        network = parse_prefix(self.cleaned_data["prefix"])
+        if network is None:
+            raise forms.ValidationError(f"{self.cleaned_data['prefix']} is not a valid IPv4 or IPv6 address or prefix.")
+        return network
+
+    def clean(self):
+        super().clean()
+        if self.cleaned_data.get("protocol") == ACLProtocolChoices.PROTOCOL_ICMP and self.cleaned_data.get("port") is not None:
+            raise forms.ValidationError({"port": "Protocol is set to ICMP, Destination Port CANNOT be set."})
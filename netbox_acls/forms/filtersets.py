@@ -174,9 +174,14 @@ class ACLIngressRuleFilterForm(NetBoxModelFilterSetForm):
         required=False,
         label="Source Prefix",
     )
+    destination_ports__overlaps = forms.CharField(
+        required=False,
+        label="Destination Ports",
+        help_text="Port or port range, e.g. 1024-65535",
+    )
     fieldsets = (
         (None, ("q", "tag")),
-        ("Rule Details", ("access_list", "source_prefix")),
+        ("Rule Details", ("access_list", "source_prefix", "destination_ports__overlaps")),
     )
 
 
@@ -205,6 +210,11 @@ class ACLEgressRuleFilterForm(NetBoxModelFilterSetForm):
         choices=add_blank_choice(ACLProtocolChoices),
         required=False,
     )
+    destination_ports__overlaps = forms.CharField(
+        required=False,
+        label="Destination Ports",
+        help_text="Port or port range, e.g. 1024-65535",
+    )
 
     fieldsets = (
         (None, ("q", "tag")),
@@ -213,6 +223,7 @@ class ACLEgressRuleFilterForm(NetBoxModelFilterSetForm):
             (
                 "access_list",
                 "destination_prefix",
+                "destination_ports__overlaps",
                 "protocol",
             ),
         ),
@@ -0,0 +1,44 @@
+"""
+Defines the GUI form of the diff of an Access List's rules between two points of its change history.
+"""
+
+from django import forms
+from utilities.forms import BootstrapMixin
+from utilities.forms.widgets import DateTimePicker
+
+__all__ = ("ACLHistoryDiffForm",)
+
+
+class ACLHistoryDiffForm(BootstrapMixin, forms.Form):
+    """
+    GUI form to select the two points of an Access List's change history to compare its rules at.
+    """
+
+    start = forms.DateTimeField(
+        required=False,
+        widget=DateTimePicker(),
+        help_text="Defaults to the oldest change kept",
+    )
+    start_change = forms.IntegerField(
+        min_value=1,
+        required=False,
+        label="Start Change ID",
+        help_text="Change log entry to start after, instead of a start time",
+    )
+    end = forms.DateTimeField(
+        required=False,
+        widget=DateTimePicker(),
+        help_text="Defaults to the latest change",
+    )
+    end_change = forms.IntegerField(
+        min_value=1,
+        required=False,
+        label="End Change ID",
+        help_text="Change log entry to end at, instead of an end time",
+    )
+
+    def clean(self):
+        super().clean()
+        for field in ("start", "end"):
+            if self.cleaned_data.get(field) is not None and self.cleaned_data.get(f"{field}_change") is not None:
+                raise forms.ValidationError({f"{field}_change": f"Cannot be set along with the {field} time."})
@@ -38,6 +38,49 @@ __all__ = (
 error_message_no_ports = "When TCP or UDP are selected, you must provide port numbers as well."
 error_message_icmp_ports = "When ICMP is selected, you CANNOT provide port numbers."
 
+
+class AccessListCSVField(CSVModelChoiceField):
+    """
+    CSVModelChoiceField resolving access lists by name from a prefetched {name: [AccessList]}
+    mapping when one is set, instead of querying the database for each row.
+    """
+
+    access_lists = None
+
+    def to_python(self, value):
+        if self.access_lists is None or value in self.empty_values:
+            return super().to_python(value)
+        matches = self.access_lists.get(value, ())
+        if not matches:
+            raise forms.ValidationError(self.error_messages["invalid_choice"], code="invalid_choice")
+        if len(matches) > 1:
+            raise forms.ValidationError(f'"{value}" is not a unique value for this field; multiple objects were found')
+        return matches[0]
+
+
+class ACLRuleImportFormMixin:
+    """
+    Lets the bulk import views validate rules in batches. When the access lists are given,
+    they are resolved from that mapping (already restricted to the rule's ACL type), and the
+    per-row uniqueness query is skipped: the view checks uniqueness once per batch.
+    """
+
+    def __init__(self, *args, access_lists=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["access_list"].access_lists = access_lists
+        self.batched = access_lists is not None
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        if self.batched:
+            # Skip the per-row query validating the access list's type.
+            exclude.add("access_list")
+        return exclude
+
+    def validate_unique(self):
+        if not self.batched:
+            super().validate_unique()
+
 class AccessListForm(NetBoxModelForm):
     """
     GUI form to add or edit an AccessList.
@@ -248,7 +291,7 @@ class ACLIngressRuleForm(NetBoxModelForm):
     )
 
     fieldsets = (
-        ("Access List Details", ("access_list", "description", "tags")),
+        ("Access List Details", ("access_list", "sequence", "description", "tags")),
         ("Rule Definition", ("source_prefix", "destination_ports", "protocol")),
     )
 
@@ -256,6 +299,7 @@ class ACLIngressRuleForm(NetBoxModelForm):
         model = ACLIngressRule
         fields = (
             "access_list",
+            "sequence",
             "source_prefix",
             "destination_ports", 
             "protocol",
@@ -292,14 +336,14 @@ class ACLIngressRuleForm(NetBoxModelForm):
         return self.cleaned_data
 
 
-class ACLIngressRuleImportForm(NetBoxModelImportForm):
+class ACLIngressRuleImportForm(ACLRuleImportFormMixin, NetBoxModelImportForm):
     """
     GUI form to add or edit Standard Access List.
     Requires an access_list  and ACL rule type.
     See the clean function for logic on other field requirements.
     """
 
-    access_list = CSVModelChoiceField(
+    access_list = AccessListCSVField(
         queryset=AccessList.objects.all(),
         to_field_name="name",
         required=True,
@@ -307,7 +351,7 @@ class ACLIngressRuleImportForm(NetBoxModelImportForm):
     )
 
     fieldsets = (
-        ("Access List Details", ("access_list", "description", "tags")),
+        ("Access List Details", ("access_list", "sequence", "description", "tags")),
         ("Rule Definition", ("source_prefix", "destination_ports", "protocol")),
     )
 
@@ -315,6 +359,7 @@ class ACLIngressRuleImportForm(NetBoxModelImportForm):
         model = ACLIngressRule
         fields = (
             "access_list",
+            "sequence",
             "source_prefix",
             "destination_ports", 
             "protocol",
@@ -370,7 +415,7 @@ class ACLEgressRuleForm(NetBoxModelForm):
     )
 
     fieldsets = (
-        ("Access List Details", ("access_list", "description", "tags")),
+        ("Access List Details", ("access_list", "sequence", "description", "tags")),
         (
             "Rule Definition",
             (
@@ -385,6 +430,7 @@ class ACLEgressRuleForm(NetBoxModelForm):
         model = ACLEgressRule
         fields = (
             "access_list",
+            "sequence",
             "destination_prefix",
             "destination_ports",
             "protocol",
@@ -422,14 +468,14 @@ class ACLEgressRuleForm(NetBoxModelForm):
         return self.cleaned_data
 
 
-class ACLEgressRuleImportForm(NetBoxModelImportForm):
+class ACLEgressRuleImportForm(ACLRuleImportFormMixin, NetBoxModelImportForm):
     """
     GUI form to import Egress rules.
     Requires an access_list.
     See the clean function for logic on other field requirements.
     """
 
-    access_list = CSVModelChoiceField(
+    access_list = AccessListCSVField(
         queryset=AccessList.objects.all(),
         to_field_name="name",
         required=True,
@@ -437,7 +483,7 @@ class ACLEgressRuleImportForm(NetBoxModelImportForm):
     )
 
     fieldsets = (
-        ("Access List Details", ("access_list", "description", "tags")),
+        ("Access List Details", ("access_list", "sequence", "description", "tags")),
         ("Rule Definition", ("destination_prefix", "destination_ports", "protocol")),
     )
 
@@ -445,6 +491,7 @@ class ACLEgressRuleImportForm(NetBoxModelImportForm):
         model = ACLEgressRule
         fields = (
             "access_list",
+            "sequence",
             "destination_prefix",
             "destination_ports", 
             "protocol",
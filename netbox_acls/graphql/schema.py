@@ -1,8 +1,73 @@
+import base64
+
+import graphene
 from graphene import ObjectType
+from graphene_django.filter.utils import get_filtering_args_from_filterset
+from graphql import GraphQLError
 from netbox.graphql.fields import ObjectField, ObjectListField
 
 from .types import *
 
+# Default and maximum number of rules per page.
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(pk):
+    return base64.urlsafe_b64encode(f"pk:{pk}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        prefix, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        if prefix == "pk":
+            return int(pk)
+    except ValueError:
+        pass
+    raise GraphQLError(f"Invalid cursor: {cursor}")
+
+
+class ObjectPageField(graphene.Field):
+    """
+    Lists objects in pages of up to `first` items following the `after` cursor, ordered by ID.
+    Pages are fetched with a keyset condition, whose cost does not grow with the page depth.
+    Accepts the filters of the object type's filterset, like ObjectListField.
+    """
+
+    def __init__(self, page_type, object_type, **kwargs):
+        self.object_type = object_type
+        filterset_class = object_type._meta.filterset_class
+        super().__init__(
+            page_type,
+            first=graphene.Int(),
+            after=graphene.String(),
+            **get_filtering_args_from_filterset(filterset_class, object_type),
+            **kwargs,
+        )
+
+    def wrap_resolve(self, parent_resolver):
+        return self.resolve_page
+
+    def resolve_page(self, root, info, first=PAGE_SIZE, after=None, **filters):
+        if not 0 < first <= MAX_PAGE_SIZE:
+            raise GraphQLError(f"first must be between 1 and {MAX_PAGE_SIZE}.")
+
+        object_type = self.object_type
+        queryset = object_type.get_queryset(object_type._meta.model.objects.all(), info, ("items",))
+        filterset = object_type._meta.filterset_class(data=filters, queryset=queryset, request=info.context)
+        queryset = filterset.qs if filterset.is_valid() else queryset.none()
+        if after is not None:
+            queryset = queryset.filter(pk__gt=decode_cursor(after))
+
+        items = list(queryset.order_by("pk")[:first + 1])
+        has_next_page = len(items) > first
+        items = items[:first]
+        return {
+            "items": items,
+            "end_cursor": encode_cursor(items[-1].pk) if items else None,
+            "has_next_page": has_next_page,
+        }
+
 
 class Query(ObjectType):
     """
@@ -12,11 +77,16 @@ class Query(ObjectType):
     access_list = ObjectField(AccessListType)
     access_list_list = ObjectListField(AccessListType)
 
+    acl_interface_assignment = ObjectField(ACLInterfaceAssignmentType)
+    acl_interface_assignment_list = ObjectListField(ACLInterfaceAssignmentType)
+
     acl_egress_rule = ObjectField(ACLEgressRuleType)
     acl_egress_rule_list = ObjectListField(ACLEgressRuleType)
+    acl_egress_rule_page = ObjectPageField(ACLEgressRulePageType, ACLEgressRuleType)
 
     acl_ingress_rule = ObjectField(ACLIngressRuleType)
     acl_ingress_rule_list = ObjectListField(ACLIngressRuleType)
+    acl_ingress_rule_page = ObjectPageField(ACLIngressRulePageType, ACLIngressRuleType)
 
 
 schema = Query
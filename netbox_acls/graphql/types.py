@@ -2,23 +2,158 @@
 Define the object types and queries availble via the graphql api.
 """
 
+import graphene
+from dcim.graphql.types import DeviceRoleType, InterfaceType
+from dcim.models import DeviceRole, Interface
+from django.db.models import Prefetch
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
 from netbox.graphql.types import NetBoxObjectType
+from virtualization.graphql.types import VMInterfaceType
+from virtualization.models import VMInterface
 
 from .. import filtersets, models
 
 __all__ = (
     "AccessListType",
+    "ACLEgressRulePageType",
+    "ACLHostAssignmentType",
+    "ACLInterfaceAssignmentObjectType",
     "ACLInterfaceAssignmentType",
     "ACLEgressRuleType",
+    "ACLIngressRulePageType",
     "ACLIngressRuleType",
+    "BatchedRelationsMixin",
+    "get_selected_fields",
 )
 
 
-class AccessListType(NetBoxObjectType):
+class ACLHostAssignmentType(graphene.Union):
+    """
+    Defines the objects an AccessList can be assigned to.
+    """
+
+    class Meta:
+        types = (DeviceRoleType,)
+
+    @classmethod
+    def resolve_type(cls, instance, info):
+        if type(instance) is DeviceRole:
+            return DeviceRoleType
+
+
+class ACLInterfaceAssignmentObjectType(graphene.Union):
+    """
+    Defines the interfaces an AccessList can be assigned to.
+    """
+
+    class Meta:
+        types = (InterfaceType, VMInterfaceType)
+
+    @classmethod
+    def resolve_type(cls, instance, info):
+        if type(instance) is Interface:
+            return InterfaceType
+        if type(instance) is VMInterface:
+            return VMInterfaceType
+
+
+def _get_field_nodes(selection_set, info):
+    for selection in selection_set.selections if selection_set else ():
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, FragmentSpreadNode):
+            yield from _get_field_nodes(info.fragments[selection.name.value].selection_set, info)
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _get_field_nodes(selection.selection_set, info)
+
+
+def get_selected_fields(info, *path):
+    """
+    Return the names of the fields selected under the field being resolved, or under
+    the given path of nested fields, fragments included.
+    """
+    nodes = info.field_nodes
+    for name in path:
+        nodes = [child for node in nodes for child in _get_field_nodes(node.selection_set, info) if child.name.value == name]
+    return {child.name.value for node in nodes for child in _get_field_nodes(node.selection_set, info)}
+
+
+def get_related_object(instance, name, info):
+    """
+    Resolve a foreign key loaded by BatchedRelationsMixin, or query it when the instance was not listed.
+    """
+    field = instance._meta.get_field(name)
+    if field.is_cached(instance):
+        return getattr(instance, name)
+    return field.related_model.objects.restrict(info.context.user, "view").filter(pk=getattr(instance, field.attname)).first()
+
+
+def get_related_objects(instance, name, info):
+    """
+    Resolve a reverse foreign key loaded by BatchedRelationsMixin, or query it when the instance was not listed.
+    """
+    if name in getattr(instance, "_prefetched_objects_cache", {}):
+        return list(getattr(instance, name).all())
+    return getattr(instance, name).restrict(info.context.user, "view")
+
+
+class BatchedRelationsMixin:
+    """
+    Loads the relations selected by a query along with the listed objects, DataLoader-style:
+    one permission-restricted query per relation for the whole list, instead of one per object,
+    recursively for the relations selected under them. The relations' fields must be resolved
+    with get_related_object() or get_related_objects().
+    """
+
+    # Relations which may be batched, mapped to a callable returning the related object type.
+    batched_relations = {}
+
+    @classmethod
+    def get_queryset(cls, queryset, info, path=()):
+        """
+        Return the queryset of the objects listed by the field being resolved, or by the given
+        path of nested fields under it.
+        """
+        queryset = super().get_queryset(queryset, info)
+        selected_fields = get_selected_fields(info, *path)
+        lookups = []
+        for name, get_object_type in cls.batched_relations.items():
+            if name in selected_fields:
+                object_type = get_object_type()
+                related_queryset = object_type.get_queryset(object_type._meta.model.objects.all(), info, (*path, name))
+                lookups.append(Prefetch(name, queryset=related_queryset))
+        return queryset.prefetch_related(*lookups)
+
+
+class AssignedObjectTypeMixin:
+    """
+    Bulk loads the assigned objects of the listed objects, instead of resolving them one at a time.
+    """
+
+    @classmethod
+    def get_queryset(cls, queryset, info, *args):
+        return super().get_queryset(queryset, info, *args).with_assigned_objects()
+
+    def resolve_assigned_object(self, info):
+        return self.assigned_object
+
+
+class AccessListType(AssignedObjectTypeMixin, BatchedRelationsMixin, NetBoxObjectType):
     """
     Defines the object type for the django model AccessList.
     """
 
+    assigned_object = graphene.Field(ACLHostAssignmentType)
+    aclingressrules = graphene.List(graphene.NonNull(lambda: ACLIngressRuleType))
+    aclegressrules = graphene.List(graphene.NonNull(lambda: ACLEgressRuleType))
+    aclinterfaceassignment_set = graphene.List(graphene.NonNull(lambda: ACLInterfaceAssignmentType))
+
+    batched_relations = {
+        "aclingressrules": lambda: ACLIngressRuleType,
+        "aclegressrules": lambda: ACLEgressRuleType,
+        "aclinterfaceassignment_set": lambda: ACLInterfaceAssignmentType,
+    }
+
     class Meta:
         """
         Associates the filterset, fields, and model for the django model AccessList.
@@ -28,12 +163,28 @@ class AccessListType(NetBoxObjectType):
         fields = "__all__"
         filterset_class = filtersets.AccessListFilterSet
 
+    def resolve_aclingressrules(self, info):
+        return get_related_objects(self, "aclingressrules", info)
+
+    def resolve_aclegressrules(self, info):
+        return get_related_objects(self, "aclegressrules", info)
+
+    def resolve_aclinterfaceassignment_set(self, info):
+        return get_related_objects(self, "aclinterfaceassignment_set", info)
+
 
-class ACLInterfaceAssignmentType(NetBoxObjectType):
+class ACLInterfaceAssignmentType(AssignedObjectTypeMixin, BatchedRelationsMixin, NetBoxObjectType):
     """
     Defines the object type for the django model AccessList.
     """
 
+    assigned_object = graphene.Field(ACLInterfaceAssignmentObjectType)
+    access_list = graphene.Field(AccessListType)
+
+    batched_relations = {
+        "access_list": lambda: AccessListType,
+    }
+
     class Meta:
         """
         Associates the filterset, fields, and model for the django model ACLInterfaceAssignment.
@@ -43,12 +194,23 @@ class ACLInterfaceAssignmentType(NetBoxObjectType):
         fields = "__all__"
         filterset_class = filtersets.ACLInterfaceAssignmentFilterSet
 
+    def resolve_access_list(self, info):
+        return get_related_object(self, "access_list", info)
 
-class ACLEgressRuleType(NetBoxObjectType):
+
+class ACLEgressRuleType(BatchedRelationsMixin, NetBoxObjectType):
     """
     Defines the object type for the django model ACLEgressRule.
     """
 
+    access_list = graphene.Field(AccessListType)
+    # The first and last destination ports, rather than the bounds of the half-open range.
+    destination_port_span = graphene.List(graphene.Int)
+
+    batched_relations = {
+        "access_list": lambda: AccessListType,
+    }
+
     class Meta:
         """
         Associates the filterset, fields, and model for the django model ACLEgressRule.
@@ -58,12 +220,27 @@ class ACLEgressRuleType(NetBoxObjectType):
         fields = "__all__"
         filterset_class = filtersets.ACLEgressRuleFilterSet
 
+    def resolve_access_list(self, info):
+        return get_related_object(self, "access_list", info)
+
+    def resolve_destination_port_span(self, info):
+        span = self.destination_port_span
+        return None if span is None else [span.lower, span.upper - 1]
+
 
-class ACLIngressRuleType(NetBoxObjectType):
+class ACLIngressRuleType(BatchedRelationsMixin, NetBoxObjectType):
     """
     Defines the object type for the django model ACLIngressRule.
     """
 
+    access_list = graphene.Field(AccessListType)
+    # The first and last destination ports, rather than the bounds of the half-open range.
+    destination_port_span = graphene.List(graphene.Int)
+
+    batched_relations = {
+        "access_list": lambda: AccessListType,
+    }
+
     class Meta:
         """
         Associates the filterset, fields, and model for the django model ACLIngressRule.
@@ -72,3 +249,30 @@ class ACLIngressRuleType(NetBoxObjectType):
         model = models.ACLIngressRule
         fields = "__all__"
         filterset_class = filtersets.ACLIngressRuleFilterSet
+
+    def resolve_access_list(self, info):
+        return get_related_object(self, "access_list", info)
+
+    def resolve_destination_port_span(self, info):
+        span = self.destination_port_span
+        return None if span is None else [span.lower, span.upper - 1]
+
+
+class ACLEgressRulePageType(graphene.ObjectType):
+    """
+    Defines a page of ACLEgressRules, paginated with an opaque cursor.
+    """
+
+    items = graphene.NonNull(graphene.List(graphene.NonNull(ACLEgressRuleType)))
+    end_cursor = graphene.String()
+    has_next_page = graphene.NonNull(graphene.Boolean)
+
+
+class ACLIngressRulePageType(graphene.ObjectType):
+    """
+    Defines a page of ACLIngressRules, paginated with an opaque cursor.
+    """
+
+    items = graphene.NonNull(graphene.List(graphene.NonNull(ACLIngressRuleType)))
+    end_cursor = graphene.String()
+    has_next_page = graphene.NonNull(graphene.Boolean)
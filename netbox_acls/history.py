@@ -0,0 +1,162 @@
+"""
+Differences between the rules of an Access List at two points of its change history.
+
+The rules are rebuilt from the change log entries recorded between both points only: the state of a
+rule before the first of its changes in that window is the entry's pre-change data, and its state after
+the last one the post-change data. Rules left unchanged in the window are the same at both points, so the
+cost grows with the number of changes between both points, not with the size of the Access List or the
+length of its history. Rules renumbered by AccessList.renumber_rules(), which logs no change, are not seen.
+"""
+
+import json
+from collections import namedtuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from extras.choices import ObjectChangeActionChoices
+
+from .engine import merge_port_ranges
+
+__all__ = (
+    "RuleHistoryDiff",
+    "RuleVersion",
+    "get_change_position",
+    "get_rule_history_diff",
+    "get_rule_version",
+)
+
+# The canonical, hashable form of a rule at a point of the history. Versions of a rule are compared
+# without their id: a rule deleted then recreated identically is unchanged.
+RuleVersion = namedtuple("RuleVersion", ("id", "sequence", "prefix", "protocol", "destination_ports", "description"))
+
+# The RuleVersions added and removed between both points of the history, the (before, after) pairs of
+# those modified, and whether changes were left out past the limit.
+RuleHistoryDiff = namedtuple("RuleHistoryDiff", ("added", "removed", "modified", "truncated"))
+
+
+def get_change_position(object_change):
+    """
+    Return the (time, id) position of the history right after a change log entry.
+    """
+    return object_change.time, object_change.pk
+
+
+def _get_position_filter(position, after):
+    """
+    Return the condition selecting the change log entries after, or up to, a (time, id) position or a time.
+    Entries recorded at a time are up to it.
+    """
+    if isinstance(position, tuple):
+        time, pk = position
+        condition = Q(time__gt=time) | Q(time=time, pk__gt=pk)
+    else:
+        condition = Q(time__gt=position)
+    return condition if after else ~condition
+
+
+def get_rule_version(model, pk, data):
+    """
+    Return the RuleVersion of a rule's serialized data. Ports are merged into ranges, so that versions
+    recorded by different versions of the plugin, e.g. ports stored one by one or as ranges, compare equal.
+    """
+    ports = data.get("destination_ports") or []
+    try:
+        # Array fields are serialized as JSON strings.
+        ports = tuple(map(tuple, merge_port_ranges(json.loads(ports) if isinstance(ports, str) else ports)))
+    except (TypeError, ValueError):
+        ports = ()
+    return RuleVersion(
+        pk,
+        data.get("sequence"),
+        (data.get(model.prefix_field) or "").strip(),
+        data.get("protocol"),
+        ports,
+        data.get("description") or "",
+    )
+
+
+def _get_previous_data(object_changes, content_type, pks, start):
+    """
+    Return the post-change data of the last change log entry, up to the start, of each of the given rules,
+    as a {id: data} mapping, with a single query.
+    """
+    if start is None or not pks:
+        return {}
+    queryset = object_changes.filter(
+        _get_position_filter(start, after=False),
+        changed_object_type=content_type,
+        changed_object_id__in=pks,
+    )
+    last_changes = queryset.order_by("changed_object_id", "-time", "-pk").distinct("changed_object_id")
+    return dict(last_changes.values_list("changed_object_id", "postchange_data"))
+
+
+def get_rule_history_diff(access_list, object_changes, start=None, end=None, limit=None):
+    """
+    Return the RuleHistoryDiff of the rules of an Access List between a start and an end: (time, id)
+    positions, as returned by get_change_position(), or times. Without a start, the diff begins at the
+    oldest change kept; without an end, it extends to the latest change. object_changes is the queryset
+    of the change log entries to read, e.g. restricted to those a user may view. With a limit, at most
+    that many rules are compared.
+    """
+    model = access_list.get_rules().model
+    content_type = ContentType.objects.get_for_model(model)
+    queryset = object_changes.filter(
+        Q(prechange_data__access_list=access_list.pk) | Q(postchange_data__access_list=access_list.pk),
+        changed_object_type=content_type,
+    )
+    if start is not None:
+        queryset = queryset.filter(_get_position_filter(start, after=True))
+    if end is not None:
+        queryset = queryset.filter(_get_position_filter(end, after=False))
+
+    # {id: data} of each changed rule before its first change of the window, and after its last one.
+    before = {}
+    after = {}
+    # Rules whose first change of the window recorded no pre-change data.
+    unknown = set()
+    truncated = False
+    values = queryset.order_by("time", "pk").values_list("changed_object_id", "action", "prechange_data", "postchange_data")
+    for pk, action, prechange_data, postchange_data in values.iterator(chunk_size=2000):
+        if pk not in after:
+            if limit is not None and len(after) >= limit:
+                truncated = True
+                continue
+            if action == ObjectChangeActionChoices.ACTION_CREATE:
+                before[pk] = None
+            elif prechange_data is None:
+                unknown.add(pk)
+            else:
+                before[pk] = prechange_data
+        after[pk] = None if action == ObjectChangeActionChoices.ACTION_DELETE else postchange_data
+    before.update(_get_previous_data(object_changes, content_type, unknown, start))
+
+    def get_versions(states):
+        # A rule may have been moved to, or away from, the Access List.
+        return {
+            pk: get_rule_version(model, pk, data)
+            for pk, data in states.items()
+            if data is not None and data.get("access_list") == access_list.pk
+        }
+
+    before_versions = get_versions(before)
+    after_versions = get_versions(after)
+    modified = [
+        (before_versions[pk], version)
+        for pk, version in after_versions.items()
+        if pk in before_versions and before_versions[pk][1:] != version[1:]
+    ]
+    before_keys = {version[1:] for pk, version in before_versions.items() if pk not in after_versions}
+    after_keys = {version[1:] for pk, version in after_versions.items() if pk not in before_versions}
+    added = [version for pk, version in after_versions.items() if pk not in before_versions and version[1:] not in before_keys]
+    removed = [version for pk, version in before_versions.items() if pk not in after_versions and version[1:] not in after_keys]
+
+    def get_sort_key(version):
+        return version.sequence or 0, version.id
+
+    return RuleHistoryDiff(
+        sorted(added, key=get_sort_key),
+        sorted(removed, key=get_sort_key),
+        sorted(modified, key=lambda versions: get_sort_key(versions[1])),
+        truncated,
+    )
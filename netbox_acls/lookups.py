@@ -0,0 +1,39 @@
+"""
+Custom database lookups for the plugin's fields.
+"""
+
+from django.db.models import Lookup
+
+__all__ = (
+    "NetOverlaps",
+    "PortRangesOverlap",
+)
+
+
+class NetOverlaps(Lookup):
+    """
+    Match networks sharing at least one address with the given network (PostgreSQL "&&" operator).
+    """
+
+    lookup_name = "net_overlaps"
+
+    def as_sql(self, qn, connection):
+        lhs, lhs_params = self.process_lhs(qn, connection)
+        rhs, rhs_params = self.process_rhs(qn, connection)
+        params = lhs_params + rhs_params
+        return f"{lhs} && {rhs}::cidr", params
+
+
+class PortRangesOverlap(Lookup):
+    """
+    Match port range arrays (see PortRangesField) with a range overlapping the given (low, high) range.
+    """
+
+    lookup_name = "port_overlaps"
+    prepare_rhs = False
+
+    def as_sql(self, qn, connection):
+        lhs, lhs_params = self.process_lhs(qn, connection)
+        low, high = self.rhs
+        sql = f"EXISTS (SELECT 1 FROM generate_subscripts({lhs}, 1) AS i WHERE ({lhs})[i][1] <= %s AND ({lhs})[i][2] >= %s)"
+        return sql, [*lhs_params, *lhs_params, high, *lhs_params, low]
@@ -0,0 +1,48 @@
+"""
+Management command repairing drift in the denormalized Access List rule counters.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from netbox_acls.models import AccessList
+
+COUNTER_FIELDS = ("rule_count", "icmp_rule_count", "tcp_rule_count", "udp_rule_count", "tcam_entry_count")
+
+
+class Command(BaseCommand):
+    help = "Recompute the rule counters stored on Access Lists and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the Access Lists with drifted counters, do not repair them",
+        )
+
+    def handle(self, *args, **options):
+        expressions = AccessList.objects.rule_count_expressions()
+        annotations = {f"expected_{field}": expression for field, expression in expressions.items()}
+        drift = Q()
+        for field in COUNTER_FIELDS:
+            drift |= ~Q(**{field: F(f"expected_{field}")})
+
+        drifted = AccessList.objects.annotate(**annotations).filter(drift)
+        drifted_ids = []
+        for access_list in drifted.only("pk", "name", *COUNTER_FIELDS):
+            drifted_ids.append(access_list.pk)
+            self.stdout.write(
+                f"{access_list.name} (ID {access_list.pk}): stored {access_list.rule_count} rules, "
+                f"counted {access_list.expected_rule_count}",
+            )
+
+        if not drifted_ids:
+            self.stdout.write(self.style.SUCCESS("All Access List rule counters are accurate."))
+            return
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{len(drifted_ids)} Access List(s) have drifted rule counters."))
+            return
+
+        AccessList.objects.filter(pk__in=drifted_ids).update_rule_counts()
+        self.stdout.write(self.style.SUCCESS(f"Repaired the rule counters of {len(drifted_ids)} Access List(s)."))
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+POPULATE_RULE_COUNTS = """
+UPDATE netbox_acls_accesslist AS acl SET
+    rule_count = (
+        (SELECT COUNT(*) FROM netbox_acls_aclingressrule AS rule WHERE rule.access_list_id = acl.id)
+        + (SELECT COUNT(*) FROM netbox_acls_aclegressrule AS rule WHERE rule.access_list_id = acl.id)
+    ),
+    icmp_rule_count = (
+        (SELECT COUNT(*) FROM netbox_acls_aclingressrule AS rule WHERE rule.access_list_id = acl.id AND rule.protocol = 'icmp')
+        + (SELECT COUNT(*) FROM netbox_acls_aclegressrule AS rule WHERE rule.access_list_id = acl.id AND rule.protocol = 'icmp')
+    ),
+    tcp_rule_count = (
+        (SELECT COUNT(*) FROM netbox_acls_aclingressrule AS rule WHERE rule.access_list_id = acl.id AND rule.protocol = 'tcp')
+        + (SELECT COUNT(*) FROM netbox_acls_aclegressrule AS rule WHERE rule.access_list_id = acl.id AND rule.protocol = 'tcp')
+    ),
+    udp_rule_count = (
+        (SELECT COUNT(*) FROM netbox_acls_aclingressrule AS rule WHERE rule.access_list_id = acl.id AND rule.protocol = 'udp')
+        + (SELECT COUNT(*) FROM netbox_acls_aclegressrule AS rule WHERE rule.access_list_id = acl.id AND rule.protocol = 'udp')
+    );
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_acls', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accesslist',
+            name='rule_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Rule Count'),
+        ),
+        migrations.AddField(
+            model_name='accesslist',
+            name='icmp_rule_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='ICMP Rule Count'),
+        ),
+        migrations.AddField(
+            model_name='accesslist',
+            name='tcp_rule_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='TCP Rule Count'),
+        ),
+        migrations.AddField(
+            model_name='accesslist',
+            name='udp_rule_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='UDP Rule Count'),
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_RULE_COUNTS,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
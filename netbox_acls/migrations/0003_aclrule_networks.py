@@ -0,0 +1,61 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+import netbox_acls.fields
+from netbox_acls.engine import parse_prefix
+
+BATCH_SIZE = 1000
+
+
+def populate_networks(apps, schema_editor):
+    """
+    Parse the existing rule prefixes into the network columns. Invalid prefixes are left NULL.
+    """
+    for model_name, prefix_field, network_field in (
+        ("ACLIngressRule", "source_prefix", "source_network"),
+        ("ACLEgressRule", "destination_prefix", "destination_network"),
+    ):
+        model = apps.get_model("netbox_acls", model_name)
+        rules = []
+        for rule in model.objects.only("pk", prefix_field).iterator(chunk_size=BATCH_SIZE):
+            network = parse_prefix(getattr(rule, prefix_field))
+            if network is None:
+                continue
+            setattr(rule, network_field, str(network))
+            rules.append(rule)
+            if len(rules) >= BATCH_SIZE:
+                model.objects.bulk_update(rules, [network_field])
+                rules = []
+        model.objects.bulk_update(rules, [network_field])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_acls', '0002_accesslist_rule_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='source_network',
+            field=netbox_acls.fields.RuleNetworkField(blank=True, editable=False, null=True, verbose_name='Source Network'),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='destination_network',
+            field=netbox_acls.fields.RuleNetworkField(blank=True, editable=False, null=True, verbose_name='Destination Network'),
+        ),
+        migrations.RunPython(
+            code=populate_networks,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='aclingressrule',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['source_network'], name='netbox_acls_ingress_network_gist', opclasses=['inet_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='aclegressrule',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['destination_network'], name='netbox_acls_egress_network_gist', opclasses=['inet_ops']),
+        ),
+    ]
@@ -0,0 +1,60 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_EFFECTIVE_RULES = """
+INSERT INTO netbox_acls_acleffectiverule
+    (assigned_object_type_id, assigned_object_id, direction, assignment_id, access_list_id, {rule_field}_id)
+SELECT assignment.assigned_object_type_id, assignment.assigned_object_id, acl.type, assignment.id, acl.id, rule.id
+FROM netbox_acls_aclinterfaceassignment AS assignment
+JOIN netbox_acls_accesslist AS acl ON acl.id = assignment.access_list_id
+JOIN netbox_acls_acl{rule_field}rule AS rule ON rule.access_list_id = acl.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('netbox_acls', '0003_aclrule_networks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ACLEffectiveRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('assigned_object_id', models.PositiveBigIntegerField()),
+                ('direction', models.CharField(max_length=30)),
+                ('access_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_rules', to='netbox_acls.accesslist')),
+                ('assigned_object_type', models.ForeignKey(limit_choices_to=models.Q(models.Q(models.Q(('app_label', 'dcim'), ('model', 'interface')), models.Q(('app_label', 'virtualization'), ('model', 'vminterface')), _connector='OR')), on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_rules', to='netbox_acls.aclinterfaceassignment')),
+                ('egress_rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='effective_rules', to='netbox_acls.aclegressrule')),
+                ('ingress_rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='effective_rules', to='netbox_acls.aclingressrule')),
+            ],
+            options={
+                'verbose_name': 'ACL Effective Rule',
+                'verbose_name_plural': 'ACL Effective Rules',
+                'ordering': ['assigned_object_type', 'assigned_object_id', 'direction', 'access_list__name', 'ingress_rule__destination_ports', 'ingress_rule__protocol', 'egress_rule__destination_ports', 'egress_rule__protocol'],
+            },
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_EFFECTIVE_RULES.format(rule_field='ingress'),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_EFFECTIVE_RULES.format(rule_field='egress'),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='acleffectiverule',
+            index=models.Index(fields=['assigned_object_type', 'assigned_object_id', 'direction'], name='netbox_acls_effective_iface'),
+        ),
+        migrations.AddConstraint(
+            model_name='acleffectiverule',
+            constraint=models.UniqueConstraint(fields=('assignment', 'ingress_rule'), name='netbox_acls_effective_ingress_rule'),
+        ),
+        migrations.AddConstraint(
+            model_name='acleffectiverule',
+            constraint=models.UniqueConstraint(fields=('assignment', 'egress_rule'), name='netbox_acls_effective_egress_rule'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('netbox_acls', '0004_acleffectiverule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ACLTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('deleted', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('object_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'ACL Tombstone',
+                'verbose_name_plural': 'ACL Tombstones',
+                'ordering': ['deleted', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='acltombstone',
+            index=models.Index(fields=['deleted', 'id'], name='netbox_acls_tombstone_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslist',
+            index=models.Index(fields=['last_updated', 'id'], name='netbox_acls_accesslist_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='aclinterfaceassignment',
+            index=models.Index(fields=['last_updated', 'id'], name='netbox_acls_assignment_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='aclingressrule',
+            index=models.Index(fields=['last_updated', 'id'], name='netbox_acls_ingress_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='aclegressrule',
+            index=models.Index(fields=['last_updated', 'id'], name='netbox_acls_egress_feed'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_acls', '0005_change_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aclingressrule',
+            index=models.Index(fields=['access_list', 'id'], name='netbox_acls_ingress_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='aclegressrule',
+            index=models.Index(fields=['access_list', 'id'], name='netbox_acls_egress_keyset'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations, models
+
+# Number the existing rules of each Access List in their previous order, 10 apart.
+POPULATE_SEQUENCES = """
+UPDATE netbox_acls_acl{direction}rule AS rule
+SET sequence = numbered.sequence
+FROM (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY access_list_id ORDER BY destination_ports, protocol, id) * 10 AS sequence
+    FROM netbox_acls_acl{direction}rule
+) AS numbered
+WHERE rule.id = numbered.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_acls', '0006_aclrule_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='sequence',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='sequence',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_SEQUENCES.format(direction='ingress'),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_SEQUENCES.format(direction='egress'),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='aclingressrule',
+            name='sequence',
+            field=models.PositiveIntegerField(blank=True, help_text='Position of the rule in the Access List. Leave empty to append the rule.', verbose_name='Sequence'),
+        ),
+        migrations.AlterField(
+            model_name='aclegressrule',
+            name='sequence',
+            field=models.PositiveIntegerField(blank=True, help_text='Position of the rule in the Access List. Leave empty to append the rule.', verbose_name='Sequence'),
+        ),
+        migrations.AddIndex(
+            model_name='aclingressrule',
+            index=models.Index(fields=['access_list', 'sequence'], name='netbox_acls_ingress_sequence'),
+        ),
+        migrations.AddIndex(
+            model_name='aclegressrule',
+            index=models.Index(fields=['access_list', 'sequence'], name='netbox_acls_egress_sequence'),
+        ),
+        migrations.AlterModelOptions(
+            name='aclingressrule',
+            options={'ordering': ['access_list', 'sequence', 'pk'], 'verbose_name': 'ACL Ingress Rule', 'verbose_name_plural': 'ACL Ingress Rules'},
+        ),
+        migrations.AlterModelOptions(
+            name='aclegressrule',
+            options={'ordering': ['access_list', 'sequence', 'pk'], 'verbose_name': 'ACL Egress Rule', 'verbose_name_plural': 'ACL Egress Rules'},
+        ),
+        migrations.AlterModelOptions(
+            name='acleffectiverule',
+            options={'ordering': ['assigned_object_type', 'assigned_object_id', 'direction', 'access_list__name', 'ingress_rule__sequence', 'egress_rule__sequence', 'pk'], 'verbose_name': 'ACL Effective Rule', 'verbose_name_plural': 'ACL Effective Rules'},
+        ),
+    ]
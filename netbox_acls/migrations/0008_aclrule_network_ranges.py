@@ -0,0 +1,116 @@
+from django.db import migrations, models
+
+from netbox_acls.engine import get_network_range, parse_prefix
+
+BATCH_SIZE = 1000
+
+NETWORK_RANGE_FIELDS = (
+    "network_family",
+    "network_start_high",
+    "network_start_low",
+    "network_end_high",
+    "network_end_low",
+)
+
+
+def populate_network_ranges(apps, schema_editor):
+    """
+    Store the numeric ranges of the existing rule prefixes. Invalid prefixes are left NULL.
+    """
+    for model_name, prefix_field in (
+        ("ACLIngressRule", "source_prefix"),
+        ("ACLEgressRule", "destination_prefix"),
+    ):
+        model = apps.get_model("netbox_acls", model_name)
+        rules = []
+        for rule in model.objects.only("pk", prefix_field).iterator(chunk_size=BATCH_SIZE):
+            network = parse_prefix(getattr(rule, prefix_field))
+            if network is None:
+                continue
+            for field, value in zip(NETWORK_RANGE_FIELDS, get_network_range(network)):
+                setattr(rule, field, value)
+            rules.append(rule)
+            if len(rules) >= BATCH_SIZE:
+                model.objects.bulk_update(rules, NETWORK_RANGE_FIELDS)
+                rules = []
+        model.objects.bulk_update(rules, NETWORK_RANGE_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_acls', '0007_aclrule_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='network_family',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='network_start_high',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='network_start_low',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='network_end_high',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='network_end_low',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='network_family',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='network_start_high',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='network_start_low',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='network_end_high',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='network_end_low',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(
+            code=populate_network_ranges,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='aclingressrule',
+            index=models.Index(fields=['network_family', 'network_start_high', 'network_start_low'], name='netbox_acls_ingress_range_start'),
+        ),
+        migrations.AddIndex(
+            model_name='aclingressrule',
+            index=models.Index(fields=['network_family', 'network_end_high', 'network_end_low'], name='netbox_acls_ingress_range_end'),
+        ),
+        migrations.AddIndex(
+            model_name='aclegressrule',
+            index=models.Index(fields=['network_family', 'network_start_high', 'network_start_low'], name='netbox_acls_egress_range_start'),
+        ),
+        migrations.AddIndex(
+            model_name='aclegressrule',
+            index=models.Index(fields=['network_family', 'network_end_high', 'network_end_low'], name='netbox_acls_egress_range_end'),
+        ),
+    ]
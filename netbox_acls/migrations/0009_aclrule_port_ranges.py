@@ -0,0 +1,71 @@
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.fields.ranges import NumericRange
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+import netbox_acls.fields
+from netbox_acls.engine import merge_port_ranges
+
+BATCH_SIZE = 1000
+
+
+def merge_destination_ports(apps, schema_editor):
+    """
+    Convert the existing lists of destination ports into merged [low, high] ranges, and store their span.
+    """
+    for model_name in ("ACLIngressRule", "ACLEgressRule"):
+        model = apps.get_model("netbox_acls", model_name)
+        rules = []
+        for rule in model.objects.filter(destination_ports__isnull=False).only("pk", "destination_ports").iterator(chunk_size=BATCH_SIZE):
+            if not rule.destination_ports:
+                continue
+            # Rows read back from the former one-dimensional column are lists of ports.
+            rule.destination_ports = merge_port_ranges(rule.destination_ports)
+            rule.destination_port_span = NumericRange(rule.destination_ports[0][0], rule.destination_ports[-1][1], "[]")
+            rules.append(rule)
+            if len(rules) >= BATCH_SIZE:
+                model.objects.bulk_update(rules, ["destination_ports", "destination_port_span"])
+                rules = []
+        model.objects.bulk_update(rules, ["destination_ports", "destination_port_span"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_acls', '0008_aclrule_network_ranges'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aclingressrule',
+            name='destination_ports',
+            field=netbox_acls.fields.PortRangesField(blank=True, help_text='Ports and port ranges, e.g. 22,80,1024-65535', null=True, size=None, verbose_name='Destination Ports'),
+        ),
+        migrations.AlterField(
+            model_name='aclegressrule',
+            name='destination_ports',
+            field=netbox_acls.fields.PortRangesField(blank=True, help_text='Ports and port ranges, e.g. 22,80,1024-65535', null=True, size=None, verbose_name='Destination Ports'),
+        ),
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='destination_port_span',
+            field=django.contrib.postgres.fields.ranges.IntegerRangeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='destination_port_span',
+            field=django.contrib.postgres.fields.ranges.IntegerRangeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(
+            code=merge_destination_ports,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='aclingressrule',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['destination_port_span'], name='netbox_acls_ingress_port_gist'),
+        ),
+        migrations.AddIndex(
+            model_name='aclegressrule',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['destination_port_span'], name='netbox_acls_egress_port_gist'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations, models
+
+from netbox_acls.engine import get_tcam_entry_count
+
+BATCH_SIZE = 1000
+
+POPULATE_ACCESS_LIST_TCAM_ENTRY_COUNTS = """
+UPDATE netbox_acls_accesslist AS acl SET
+    tcam_entry_count = (
+        COALESCE((SELECT SUM(rule.tcam_entry_count) FROM netbox_acls_aclingressrule AS rule WHERE rule.access_list_id = acl.id), 0)
+        + COALESCE((SELECT SUM(rule.tcam_entry_count) FROM netbox_acls_aclegressrule AS rule WHERE rule.access_list_id = acl.id), 0)
+    );
+"""
+
+
+def populate_rule_tcam_entry_counts(apps, schema_editor):
+    """
+    Compute the TCAM entry count of the existing rules with destination ports; the others take a single entry.
+    """
+    for model_name in ("ACLIngressRule", "ACLEgressRule"):
+        model = apps.get_model("netbox_acls", model_name)
+        rules = []
+        queryset = model.objects.filter(destination_ports__isnull=False).only("pk", "protocol", "destination_ports")
+        for rule in queryset.iterator(chunk_size=BATCH_SIZE):
+            rule.tcam_entry_count = get_tcam_entry_count(rule.protocol, rule.destination_ports)
+            if rule.tcam_entry_count == 1:
+                continue
+            rules.append(rule)
+            if len(rules) >= BATCH_SIZE:
+                model.objects.bulk_update(rules, ["tcam_entry_count"])
+                rules = []
+        model.objects.bulk_update(rules, ["tcam_entry_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_acls', '0009_aclrule_port_ranges'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aclingressrule',
+            name='tcam_entry_count',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='TCAM Entries'),
+        ),
+        migrations.AddField(
+            model_name='aclegressrule',
+            name='tcam_entry_count',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='TCAM Entries'),
+        ),
+        migrations.AddField(
+            model_name='accesslist',
+            name='tcam_entry_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Estimated number of TCAM entries of the rules', verbose_name='TCAM Entries'),
+        ),
+        migrations.RunPython(
+            code=populate_rule_tcam_entry_counts,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_ACCESS_LIST_TCAM_ENTRY_COUNTS,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
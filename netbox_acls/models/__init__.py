@@ -5,3 +5,5 @@ Import each of the directory's scripts.
 
 from .access_list_rules import *
 from .access_lists import *
+from .effective_rules import *
+from .tombstones import *
@@ -3,12 +3,20 @@ Define the django models for this plugin.
 """
 
 from django.apps import apps
-from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.fields import IntegerRangeField
+# Imported from psycopg2 or psycopg depending on the Django version.
+from django.contrib.postgres.fields.ranges import NumericRange
+from django.contrib.postgres.indexes import GistIndex
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Max, Min
 from django.urls import reverse
 from netbox.models import NetBoxModel
 
 from ..choices import ACLProtocolChoices, ACLAssignmentDirectionChoices
+from ..constants import ACL_RULE_SEQUENCE_STEP
+from ..engine import format_port_ranges, get_network_range, get_tcam_entry_count, merge_port_ranges, parse_prefix
+from ..fields import PortRangesField, RuleNetworkField
 from .access_lists import AccessList
 
 __all__ = (
@@ -30,15 +38,34 @@ class ACLRule(NetBoxModel):
         verbose_name="Access List",
         related_name="rules",
     )
+    sequence = models.PositiveIntegerField(
+        blank=True,
+        verbose_name="Sequence",
+        help_text="Position of the rule in the Access List. Leave empty to append the rule.",
+    )
     description = models.CharField(
         max_length=500,
         #blank=True,
     )
-    destination_ports = ArrayField(
-        base_field=models.PositiveIntegerField(),
+    destination_ports = PortRangesField(
         blank=True,
         null=True,
         verbose_name="Destination Ports",
+        help_text="Ports and port ranges, e.g. 22,80,1024-65535",
+    )
+    # Range from the lowest to the highest destination port, maintained with the ports for the GiST
+    # index narrowing down port overlap lookups.
+    destination_port_span = IntegerRangeField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    # Estimated number of TCAM entries of the rule (see get_tcam_entry_count()), maintained with the ports
+    # and summed up on the Access List.
+    tcam_entry_count = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        verbose_name="TCAM Entries",
     )
     protocol = models.CharField(
         #blank=True,
@@ -47,10 +74,146 @@ class ACLRule(NetBoxModel):
         max_length=30,
     )
 
+    # Numeric range of the parsed network (see get_network_range()), maintained with the network
+    # column: the address family, then the first and last addresses split in signed 64-bit halves.
+    network_family = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    network_start_high = models.BigIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    network_start_low = models.BigIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    network_end_high = models.BigIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    network_end_low = models.BigIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+
     clone_fields = ("access_list", "destination_ports", "protocol")
 
+    # Names of the fields holding the rule's matched prefix, as entered and as parsed into
+    # an indexed network column, defined by each concrete rule model.
+    prefix_field = None
+    network_field = None
+    # Name of the ACLEffectiveRule foreign key referencing the concrete rule model.
+    effective_rule_field = None
+    network_range_fields = (
+        "network_family",
+        "network_start_high",
+        "network_start_low",
+        "network_end_high",
+        "network_end_low",
+    )
+
     def __str__(self):
-        return f"{self.access_list} Rule "
+        return f"{self.access_list} Rule {self.sequence}"
+
+    def clean(self):
+        super().clean()
+        self.validate_prefix()
+        self.update_derived_fields()
+
+    def validate_prefix(self):
+        """
+        Validate the prefix, which must parse for the rule to match any traffic.
+        """
+        prefix = getattr(self, self.prefix_field)
+        if prefix and parse_prefix(prefix) is None:
+            raise ValidationError({self.prefix_field: f"{prefix} is not a valid IPv4 or IPv6 prefix."})
+
+    def save(self, *args, **kwargs):
+        self.update_derived_fields()
+        if self.sequence is None:
+            self.sequence = self.get_next_sequence(self.access_list_id)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def get_next_sequence(cls, access_list_id):
+        """
+        Return the sequence number appending a rule to an Access List, a step after its last rule.
+        """
+        last = cls.objects.filter(access_list_id=access_list_id).aggregate(last=Max("sequence"))["last"]
+        return (last or 0) + ACL_RULE_SEQUENCE_STEP
+
+    @classmethod
+    def get_sequence_after(cls, access_list_id, sequence):
+        """
+        Return the sequence number inserting a rule after the given sequence number of an Access List:
+        the middle of the gap up to the next rule, so that no other rule is renumbered. Raises a
+        ValidationError if there is no gap left, in which case the Access List must be renumbered.
+        """
+        rules = cls.objects.filter(access_list_id=access_list_id, sequence__gt=sequence)
+        following = rules.aggregate(following=Min("sequence"))["following"]
+        if following is None:
+            return sequence + ACL_RULE_SEQUENCE_STEP
+        if following - sequence < 2:
+            raise ValidationError(
+                {"sequence": f"There is no free sequence number between {sequence} and {following}: renumber the Access List."},
+            )
+        return sequence + (following - sequence) // 2
+
+    def update_network(self):
+        """
+        Sync the network and network range columns with the prefix. Must be called before inserting
+        rules with bulk_create. Host bits are ignored, the way the rules are matched.
+        """
+        network = parse_prefix(getattr(self, self.prefix_field))
+        setattr(self, self.network_field, str(network) if network else None)
+        for field, value in zip(self.network_range_fields, get_network_range(network)):
+            setattr(self, field, value)
+
+    @classmethod
+    def get_network_fields(cls):
+        """
+        Return the names of the columns derived from the prefix by update_network().
+        """
+        return [cls.network_field, *cls.network_range_fields]
+
+    def update_ports(self):
+        """
+        Merge the destination ports into ranges and sync the port span and TCAM entry count columns with
+        them. Must be called before inserting rules with bulk_create.
+        """
+        self.destination_port_span = None
+        self.tcam_entry_count = get_tcam_entry_count(self.protocol, None)
+        if self.destination_ports:
+            try:
+                self.destination_ports = merge_port_ranges(self.destination_ports)
+            except (TypeError, ValueError):
+                # Left for clean_fields() to report, or for the database to reject.
+                return
+            self.destination_port_span = NumericRange(self.destination_ports[0][0], self.destination_ports[-1][1], "[]")
+            self.tcam_entry_count = get_tcam_entry_count(self.protocol, self.destination_ports)
+
+    def update_derived_fields(self):
+        """
+        Sync the columns derived from the prefix and the destination ports.
+        """
+        self.update_network()
+        self.update_ports()
+
+    @classmethod
+    def get_derived_fields(cls):
+        """
+        Return the names of the columns synced by update_derived_fields().
+        """
+        return [*cls.get_network_fields(), "destination_ports", "destination_port_span", "tcam_entry_count"]
+
+    def get_destination_ports_display(self):
+        return format_port_ranges(self.destination_ports)
 
     @classmethod
     def get_prerequisite_models(cls):
@@ -65,7 +228,7 @@ class ACLRule(NetBoxModel):
         """
 
         abstract = True
-        ordering = ["access_list", "destination_ports", "protocol"]
+        ordering = ["access_list", "sequence", "pk"]
         unique_together = ["access_list", "destination_ports", "protocol"]
 
 
@@ -87,6 +250,16 @@ class ACLIngressRule(ACLRule):
         #blank=True,
         #null=True,
     )
+    source_network = RuleNetworkField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Source Network",
+    )
+
+    prefix_field = "source_prefix"
+    network_field = "source_network"
+    effective_rule_field = "ingress_rule"
 
     def get_absolute_url(self):
         """
@@ -105,10 +278,30 @@ class ACLIngressRule(ACLRule):
           - default_related_name for any FK relationships
           - verbose name (for displaying in the GUI)
           - verbose name plural (for displaying in the GUI)
+          - GiST index on the network column, for containment and overlap lookups
+          - keyset indexes of the change feed (see changes.py) and of the API's cursor pagination
+          - index of the rules of an Access List in sequence order
+          - btree indexes on the bounds of the network range, for range scans
+          - GiST index on the destination port span, for port overlap lookups
         """
 
         verbose_name = "ACL Ingress Rule"
         verbose_name_plural = "ACL Ingress Rules"
+        indexes = [
+            GistIndex(fields=["source_network"], opclasses=["inet_ops"], name="netbox_acls_ingress_network_gist"),
+            models.Index(fields=["last_updated", "id"], name="netbox_acls_ingress_feed"),
+            models.Index(fields=["access_list", "id"], name="netbox_acls_ingress_keyset"),
+            models.Index(fields=["access_list", "sequence"], name="netbox_acls_ingress_sequence"),
+            models.Index(
+                fields=["network_family", "network_start_high", "network_start_low"],
+                name="netbox_acls_ingress_range_start",
+            ),
+            models.Index(
+                fields=["network_family", "network_end_high", "network_end_low"],
+                name="netbox_acls_ingress_range_end",
+            ),
+            GistIndex(fields=["destination_port_span"], name="netbox_acls_ingress_port_gist"),
+        ]
 
 
 class ACLEgressRule(ACLRule):
@@ -129,7 +322,16 @@ class ACLEgressRule(ACLRule):
         #blank=True,
         #null=True,
     )
+    destination_network = RuleNetworkField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Destination Network",
+    )
 
+    prefix_field = "destination_prefix"
+    network_field = "destination_network"
+    effective_rule_field = "egress_rule"
 
     def get_absolute_url(self):
         """
@@ -151,7 +353,27 @@ class ACLEgressRule(ACLRule):
           - default_related_name for any FK relationships
           - verbose name (for displaying in the GUI)
           - verbose name plural (for displaying in the GUI)
+          - GiST index on the network column, for containment and overlap lookups
+          - keyset indexes of the change feed (see changes.py) and of the API's cursor pagination
+          - index of the rules of an Access List in sequence order
+          - btree indexes on the bounds of the network range, for range scans
+          - GiST index on the destination port span, for port overlap lookups
         """
 
         verbose_name = "ACL Egress Rule"
         verbose_name_plural = "ACL Egress Rules"
+        indexes = [
+            GistIndex(fields=["destination_network"], opclasses=["inet_ops"], name="netbox_acls_egress_network_gist"),
+            models.Index(fields=["last_updated", "id"], name="netbox_acls_egress_feed"),
+            models.Index(fields=["access_list", "id"], name="netbox_acls_egress_keyset"),
+            models.Index(fields=["access_list", "sequence"], name="netbox_acls_egress_sequence"),
+            models.Index(
+                fields=["network_family", "network_start_high", "network_start_low"],
+                name="netbox_acls_egress_range_start",
+            ),
+            models.Index(
+                fields=["network_family", "network_end_high", "network_end_low"],
+                name="netbox_acls_egress_range_end",
+            ),
+            GistIndex(fields=["destination_port_span"], name="netbox_acls_egress_port_gist"),
+        ]
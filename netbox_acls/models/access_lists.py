@@ -6,19 +6,35 @@ from dcim.models import Device, Interface, VirtualChassis, DeviceRole
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import connection, models
+from django.db.models import Count, Max
 from django.urls import reverse
+from django.utils import timezone
 from netbox.models import NetBoxModel
 from virtualization.models import VirtualMachine, VMInterface
 
 from ..choices import ACLAssignmentDirectionChoices
-from ..constants import ACL_HOST_ASSIGNMENT_MODELS, ACL_INTERFACE_ASSIGNMENT_MODELS
+from ..constants import ACL_HOST_ASSIGNMENT_MODELS, ACL_INTERFACE_ASSIGNMENT_MODELS, ACL_RULE_SEQUENCE_STEP
+from ..querysets import AccessListQuerySet, ACLInterfaceAssignmentQuerySet
 
 __all__ = (
     "AccessList",
     "ACLInterfaceAssignment",
 )
 
+# Renumbers the rules of an Access List in their current order, in a single statement: only the rules
+# whose sequence number changes are written.
+RENUMBER_RULES_SQL = """
+UPDATE {table} AS rule
+SET sequence = numbered.sequence, last_updated = %s
+FROM (
+    SELECT id, %s + (ROW_NUMBER() OVER (ORDER BY sequence, id) - 1) * %s AS sequence
+    FROM {table}
+    WHERE access_list_id = %s
+) AS numbered
+WHERE rule.id = numbered.id AND rule.sequence <> numbered.sequence
+"""
+
 
 alphanumeric_plus = RegexValidator(
     r"^[a-zA-Z0-9-_]+$",
@@ -52,6 +68,35 @@ class AccessList(NetBoxModel):
     comments = models.TextField(
         blank=True,
     )
+    # Denormalized rule counters, maintained by the rule signals (see signals.py).
+    rule_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Rule Count",
+    )
+    icmp_rule_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="ICMP Rule Count",
+    )
+    tcp_rule_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="TCP Rule Count",
+    )
+    udp_rule_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="UDP Rule Count",
+    )
+    tcam_entry_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="TCAM Entries",
+        help_text="Estimated number of TCAM entries of the rules",
+    )
+
+    objects = AccessListQuerySet.as_manager()
 
     clone_fields = (
         "type",
@@ -60,6 +105,10 @@ class AccessList(NetBoxModel):
     class Meta:
         unique_together = ["assigned_object_type", "assigned_object_id", "name"]
         ordering = ["assigned_object_type", "assigned_object_id", "name"]
+        indexes = [
+            # Keyset index of the change feed (see changes.py).
+            models.Index(fields=["last_updated", "id"], name="netbox_acls_accesslist_feed"),
+        ]
         verbose_name = "Access List"
         verbose_name_plural = "Access Lists"
 
@@ -76,6 +125,39 @@ class AccessList(NetBoxModel):
     def get_type_color(self):
         return ACLAssignmentDirectionChoices.colors.get(self.type)
 
+    def get_rules(self):
+        """
+        Return the rules of the Access List, depending on its type.
+        """
+        if self.type == ACLAssignmentDirectionChoices.DIRECTION_EGRESS:
+            return self.aclegressrules.all()
+        return self.aclingressrules.all()
+
+    def renumber_rules(self, start=ACL_RULE_SEQUENCE_STEP, step=ACL_RULE_SEQUENCE_STEP):
+        """
+        Renumber the rules of the Access List from start, step apart, keeping their order, with a single
+        UPDATE statement. Their last_updated timestamp is refreshed, but no change is logged for each rule.
+        Returns the number of renumbered rules.
+        """
+        table = self.get_rules().model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RENUMBER_RULES_SQL.format(table=connection.ops.quote_name(table)),
+                [timezone.now(), start, step, self.pk],
+            )
+            return cursor.rowcount
+
+    def get_rules_version(self):
+        """
+        Return a cheap validator of the Access List's rules: the number of rules and
+        the newest last_updated timestamp. Any rule creation, change or deletion alters it.
+        """
+        version = self.get_rules().order_by().aggregate(
+            count=Count("pk"),
+            last_updated=Max("last_updated"),
+        )
+        return version["count"], version["last_updated"]
+
 
 class ACLInterfaceAssignment(NetBoxModel):
     """
@@ -106,6 +188,8 @@ class ACLInterfaceAssignment(NetBoxModel):
 
     clone_fields = ("access_list")
 
+    objects = ACLInterfaceAssignmentQuerySet.as_manager()
+
     class Meta:
         unique_together = [
             "assigned_object_type",
@@ -117,6 +201,10 @@ class ACLInterfaceAssignment(NetBoxModel):
             "assigned_object_id",
             "access_list",
         ]
+        indexes = [
+            # Keyset index of the change feed (see changes.py).
+            models.Index(fields=["last_updated", "id"], name="netbox_acls_assignment_feed"),
+        ]
         verbose_name = "ACL Interface Assignment"
         verbose_name_plural = "ACL Interface Assignments"
 
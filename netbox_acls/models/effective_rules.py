@@ -0,0 +1,104 @@
+"""
+Define the django models for this plugin.
+"""
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from utilities.querysets import RestrictedQuerySet
+
+from ..choices import ACLAssignmentDirectionChoices
+from ..constants import ACL_INTERFACE_ASSIGNMENT_MODELS
+from .access_list_rules import ACLEgressRule, ACLIngressRule
+from .access_lists import AccessList, ACLInterfaceAssignment
+
+__all__ = ("ACLEffectiveRule",)
+
+
+class ACLEffectiveRule(models.Model):
+    """
+    Materialized rule applied on an interface or VM interface, in a direction, through an
+    ACL Interface Assignment. Rows are maintained by the plugin's signals (see effective.py)
+    and are never edited directly.
+    """
+
+    assigned_object_type = models.ForeignKey(
+        to=ContentType,
+        limit_choices_to=ACL_INTERFACE_ASSIGNMENT_MODELS,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    assigned_object_id = models.PositiveBigIntegerField()
+    assigned_object = GenericForeignKey(
+        ct_field="assigned_object_type",
+        fk_field="assigned_object_id",
+    )
+    direction = models.CharField(
+        max_length=30,
+        choices=ACLAssignmentDirectionChoices,
+    )
+    assignment = models.ForeignKey(
+        on_delete=models.CASCADE,
+        to=ACLInterfaceAssignment,
+        verbose_name="ACL Interface Assignment",
+        related_name="effective_rules",
+    )
+    access_list = models.ForeignKey(
+        on_delete=models.CASCADE,
+        to=AccessList,
+        verbose_name="Access List",
+        related_name="effective_rules",
+    )
+    ingress_rule = models.ForeignKey(
+        on_delete=models.CASCADE,
+        to=ACLIngressRule,
+        blank=True,
+        null=True,
+        verbose_name="Ingress Rule",
+        related_name="effective_rules",
+    )
+    egress_rule = models.ForeignKey(
+        on_delete=models.CASCADE,
+        to=ACLEgressRule,
+        blank=True,
+        null=True,
+        verbose_name="Egress Rule",
+        related_name="effective_rules",
+    )
+
+    objects = RestrictedQuerySet.as_manager()
+
+    class Meta:
+        # Access Lists are evaluated by name, then their rules in sequence order.
+        ordering = [
+            "assigned_object_type",
+            "assigned_object_id",
+            "direction",
+            "access_list__name",
+            "ingress_rule__sequence",
+            "egress_rule__sequence",
+            "pk",
+        ]
+        indexes = [
+            models.Index(
+                fields=["assigned_object_type", "assigned_object_id", "direction"],
+                name="netbox_acls_effective_iface",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["assignment", "ingress_rule"], name="netbox_acls_effective_ingress_rule"),
+            models.UniqueConstraint(fields=["assignment", "egress_rule"], name="netbox_acls_effective_egress_rule"),
+        ]
+        verbose_name = "ACL Effective Rule"
+        verbose_name_plural = "ACL Effective Rules"
+
+    def __str__(self):
+        return f"{self.access_list} Rule {self.rule_id}"
+
+    @property
+    def rule(self):
+        return self.ingress_rule or self.egress_rule
+
+    @property
+    def rule_id(self):
+        return self.ingress_rule_id or self.egress_rule_id
@@ -0,0 +1,42 @@
+"""
+Define the django models for this plugin.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+from utilities.querysets import RestrictedQuerySet
+
+__all__ = ("ACLTombstone",)
+
+
+class ACLTombstone(models.Model):
+    """
+    Record of a deleted Access List, rule or ACL Interface Assignment, listed by the change feed
+    (see changes.py) so that its consumers learn about deletions. Rows are written by the plugin's
+    signals and bulk deletions, and are never edited.
+    """
+
+    object_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    object_id = models.PositiveBigIntegerField()
+    deleted = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+    )
+
+    objects = RestrictedQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["deleted", "id"]
+        indexes = [
+            models.Index(fields=["deleted", "id"], name="netbox_acls_tombstone_feed"),
+        ]
+        verbose_name = "ACL Tombstone"
+        verbose_name_plural = "ACL Tombstones"
+
+    def __str__(self):
+        return f"{self.object_type} {self.object_id}"
@@ -26,6 +26,11 @@ menu_buttons = (
             ),
         ),
     ),
+    PluginMenuItem(
+        link="plugins:netbox_acls:accesslist_coverage",
+        link_text="Coverage Lookup",
+        permissions=["netbox_acls.view_accesslist"],
+    ),
     PluginMenuItem(
         link="plugins:netbox_acls:aclingressrule_list",
         link_text="Ingress Rules",
@@ -0,0 +1,163 @@
+"""
+Optimization of the rules of an Access List into a smaller, equivalent set of rules (see optimize_rules()),
+previewed or applied in place of the current rules, in a background job for large Access Lists.
+
+Applying keeps the current rules which are part of the optimized set, with their description, tags and
+sequence number, deletes the others and creates the missing ones, in batches.
+"""
+
+import uuid
+
+from core.choices import JobStatusChoices
+from django.db import transaction
+from extras.context_managers import change_logging
+from utilities.utils import NetBoxFakeRequest
+
+from .bulk import bulk_create_rules, bulk_delete_objects
+from .choices import ACLProtocolChoices
+from .constants import ACL_OPTIMIZED_RULE_DESCRIPTION
+from .engine import ALL_PORTS, compare_rule_sets, get_rule_entries, make_network_rule_entry, network_from_range, optimize_rules
+from .signals import update_access_lists, update_effective_rules
+
+__all__ = (
+    "OPTIMIZE_JOB_NAME",
+    "apply_optimized_rules",
+    "get_stored_ports",
+    "optimize_access_list",
+    "optimize_access_list_job",
+)
+
+OPTIMIZE_JOB_NAME = "Optimize Access List"
+
+
+def get_stored_ports(entry):
+    """
+    Return the destination ports of a rule entry as stored on a rule: None when any port is permitted.
+    """
+    if entry.protocol == ACLProtocolChoices.PROTOCOL_ICMP or entry.ports == ALL_PORTS:
+        return None
+    return [list(interval) for interval in entry.ports]
+
+
+def apply_optimized_rules(access_list, rules, request):
+    """
+    Replace the rules of an Access List with optimized RuleEntries, keeping the current rules which are
+    part of them. Rules without a network are left untouched. Returns the numbers of created and deleted
+    rules. Raises ValueError when the optimized rules would repeat destination ports for a protocol,
+    which the rules of an Access List cannot.
+    """
+    current_rules = access_list.get_rules()
+    model = current_rules.model
+    optimized = {(entry.network, entry.protocol, entry.ports): entry for entry in rules}
+
+    kept = set()
+    deleted = []
+    values = current_rules.filter(network_family__isnull=False).values_list(
+        "pk",
+        "protocol",
+        "destination_ports",
+        *model.network_range_fields,
+    )
+    for pk, protocol, ports, *network_range in values.iterator():
+        entry = make_network_rule_entry(pk, network_from_range(*network_range), protocol, ports)
+        key = (entry.network, entry.protocol, entry.ports)
+        if key in optimized and key not in kept:
+            kept.add(key)
+        else:
+            deleted.append(pk)
+
+    created = [
+        model(
+            access_list=access_list,
+            description=ACL_OPTIMIZED_RULE_DESCRIPTION,
+            protocol=entry.protocol,
+            destination_ports=get_stored_ports(entry),
+            **{model.prefix_field: str(entry.network)},
+        )
+        for key, entry in optimized.items()
+        if key not in kept
+    ]
+
+    # The rules left untouched, and the optimized ones, must not repeat destination ports for a protocol.
+    untouched = current_rules.filter(network_family__isnull=True, destination_ports__isnull=False)
+    unique_keys = {(protocol, tuple(map(tuple, ports))) for protocol, ports in untouched.values_list("protocol", "destination_ports")}
+    for entry in rules:
+        ports = get_stored_ports(entry)
+        if ports is not None:
+            unique_key = (entry.protocol, tuple(map(tuple, ports)))
+            if unique_key in unique_keys:
+                raise ValueError(
+                    f"The optimized rules would permit the same {entry.protocol} destination ports more than once, "
+                    f"which the rules of an Access List cannot.",
+                )
+            unique_keys.add(unique_key)
+
+    with transaction.atomic():
+        # Deleted first, as created rules may reuse their destination ports.
+        deleted_count = bulk_delete_objects(model, deleted)
+        created = bulk_create_rules(model, [(rule, []) for rule in created], request)
+    update_access_lists([access_list.pk])
+    update_effective_rules(model, [rule.pk for rule in created])
+    return len(created), deleted_count
+
+
+def optimize_access_list(access_list, request=None, apply=False):
+    """
+    Optimize the rules of an Access List, and apply the optimized rules when requested. Returns the result
+    as JSON-serializable data: the numbers of rules before and after, the optimized rules, whether they
+    were applied, and the numbers of rules created and deleted to apply them.
+    """
+    entries = list(get_rule_entries(access_list))
+    optimization = optimize_rules(entries)
+    if compare_rule_sets(entries, optimization.rules, limit=0).truncated:
+        raise ValueError("The optimized rules do not permit the same traffic as the current rules.")
+
+    created = deleted = 0
+    if apply and optimization.after < optimization.before:
+        created, deleted = apply_optimized_rules(access_list, optimization.rules, request)
+    return {
+        "before": optimization.before,
+        "after": optimization.after,
+        "applied": bool(created or deleted),
+        "created": created,
+        "deleted": deleted,
+        "rules": [
+            {
+                "prefix": str(entry.network),
+                "protocol": entry.protocol,
+                "destination_ports": get_stored_ports(entry),
+            }
+            for entry in optimization.rules
+        ],
+    }
+
+
+def optimize_access_list_job(job, apply=False, **kwargs):
+    """
+    Background job optimizing the Access List of a Job, recording the result as the job's data.
+    Changes are logged on behalf of the user who requested the job.
+    """
+    job.start()
+    request = NetBoxFakeRequest(
+        {
+            "META": {},
+            "POST": {},
+            "GET": {},
+            "FILES": {},
+            "user": job.user,
+            "path": "",
+            "id": uuid.uuid4(),
+        },
+    )
+    try:
+        with change_logging(request):
+            job.data = optimize_access_list(job.object, request, apply)
+    except ValueError as e:
+        job.data = {"error": str(e)}
+        job.terminate(status=JobStatusChoices.STATUS_FAILED)
+    except Exception as e:
+        job.data = {"error": str(e)}
+        job.terminate(status=JobStatusChoices.STATUS_ERRORED)
+        raise
+    else:
+        job.terminate()
@@ -0,0 +1,185 @@
+"""
+Define the custom querysets used by the django models of this plugin.
+"""
+
+from collections import defaultdict
+
+from dcim.models import Device, DeviceRole
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.query import ModelIterable
+from utilities.querysets import RestrictedQuerySet
+
+from .choices import ACLProtocolChoices
+
+__all__ = (
+    "AccessListQuerySet",
+    "AssignedObjectQuerySet",
+    "ACLInterfaceAssignmentQuerySet",
+)
+
+
+def _get_device_role_field():
+    """
+    Return the name of the Device field referencing its role, which NetBox 3.6 renamed from device_role to role.
+    """
+    try:
+        Device._meta.get_field("role")
+    except FieldDoesNotExist:
+        return "device_role"
+    return "role"
+
+
+DEVICE_ROLE_FIELD = _get_device_role_field()
+
+
+def _rule_count_subquery(model_name, aggregate=Count("pk"), **filters):
+    """
+    Return a correlated subquery counting the rules of a given rule model for the outer Access List,
+    or computing another aggregate of them.
+    """
+    model = apps.get_model("netbox_acls", model_name)
+    subquery = (
+        model.objects.filter(access_list=OuterRef("pk"), **filters)
+        .order_by()
+        .values("access_list")
+        .annotate(count=aggregate)
+        .values("count")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def _rule_count_expression(aggregate=Count("pk"), **filters):
+    """
+    Return an expression counting both the ingress and egress rules of the outer Access List.
+    """
+    return _rule_count_subquery("ACLIngressRule", aggregate, **filters) + _rule_count_subquery("ACLEgressRule", aggregate, **filters)
+
+
+class AssignedObjectQuerySet(RestrictedQuerySet):
+    """
+    QuerySet for the models assigned to another object through an assigned_object GenericForeignKey.
+    """
+
+    # Relations selected along with the assigned objects by default, by assigned model name.
+    assigned_object_select_related = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._assigned_object_select_related = None
+
+    def with_assigned_objects(self, **select_related):
+        """
+        Bulk load the assigned objects when the queryset is evaluated, with one query per content
+        type instead of one per row. Keyword arguments override, by assigned model name, the
+        relations selected along with them, e.g. interface=("device",).
+        """
+        clone = self._chain()
+        clone._assigned_object_select_related = {**self.assigned_object_select_related, **select_related}
+        return clone
+
+    def prefetch_related(self, *lookups):
+        clone = super().prefetch_related(*lookups)
+        if lookups == (None,):
+            # Cleared along with the prefetches, e.g. for brief API responses.
+            clone._assigned_object_select_related = None
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._assigned_object_select_related = self._assigned_object_select_related
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if not fetched and self._assigned_object_select_related is not None and self._iterable_class is ModelIterable:
+            self._load_assigned_objects()
+
+    def _load_assigned_objects(self):
+        object_ids = defaultdict(set)
+        for obj in self._result_cache:
+            object_ids[obj.assigned_object_type_id].add(obj.assigned_object_id)
+
+        assigned_objects = {}
+        for content_type_id, ids in object_ids.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            queryset = model._base_manager.using(self.db)
+            select_related = self._assigned_object_select_related.get(model._meta.model_name)
+            if select_related:
+                queryset = queryset.select_related(*select_related)
+            for pk, assigned_object in queryset.in_bulk(ids).items():
+                assigned_objects[content_type_id, pk] = assigned_object
+
+        for obj in self._result_cache:
+            assigned_object = assigned_objects.get((obj.assigned_object_type_id, obj.assigned_object_id))
+            if assigned_object is not None:
+                # Assigning through the GenericForeignKey caches the object on the instance.
+                obj.assigned_object = assigned_object
+
+
+class AccessListQuerySet(AssignedObjectQuerySet):
+    """
+    QuerySet for the AccessList model.
+    """
+
+    def rule_count_expressions(self):
+        """
+        Return the expressions used to compute each of the denormalized rule counters, and the TCAM entry
+        count summed up from those of the rules.
+        """
+        return {
+            "rule_count": _rule_count_expression(),
+            "icmp_rule_count": _rule_count_expression(protocol=ACLProtocolChoices.PROTOCOL_ICMP),
+            "tcp_rule_count": _rule_count_expression(protocol=ACLProtocolChoices.PROTOCOL_TCP),
+            "udp_rule_count": _rule_count_expression(protocol=ACLProtocolChoices.PROTOCOL_UDP),
+            "tcam_entry_count": _rule_count_expression(Sum("tcam_entry_count")),
+        }
+
+    def for_device_roles(self, device_roles):
+        """
+        Filter the Access Lists assigned to the given device roles (IDs or queryset).
+        """
+        return self.filter(
+            assigned_object_type=ContentType.objects.get_for_model(DeviceRole),
+            assigned_object_id__in=device_roles,
+        )
+
+    def for_device(self, device):
+        """
+        Filter the Access Lists applying to a device, through its role.
+        """
+        return self.for_device_roles([getattr(device, f"{DEVICE_ROLE_FIELD}_id")])
+
+    def for_virtual_chassis(self, virtual_chassis):
+        """
+        Filter the Access Lists applying to any member of a virtual chassis, through their roles.
+        """
+        return self.for_device_roles(virtual_chassis.members.values(DEVICE_ROLE_FIELD))
+
+    def for_virtual_machine(self, virtual_machine):
+        """
+        Filter the Access Lists applying to a virtual machine, through its role.
+        """
+        return self.for_device_roles([virtual_machine.role_id])
+
+    def update_rule_counts(self):
+        """
+        Recompute the denormalized rule counters of every Access List in the queryset
+        using a single set-based UPDATE statement.
+        """
+        return self.order_by().update(**self.rule_count_expressions())
+
+
+class ACLInterfaceAssignmentQuerySet(AssignedObjectQuerySet):
+    """
+    QuerySet for the ACLInterfaceAssignment model. The assigned interfaces are loaded with their host.
+    """
+
+    assigned_object_select_related = {
+        "interface": ("device",),
+        "vminterface": ("virtual_machine",),
+    }
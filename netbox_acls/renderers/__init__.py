@@ -0,0 +1,11 @@
+# flake8: noqa
+"""
+Import each of the directory's scripts.
+"""
+
+from .arista import *
+from .base import *
+from .cisco import *
+from .junos import *
+from .nftables import *
+from .rendering import *
@@ -0,0 +1,19 @@
+"""
+Renderer of Arista EOS access lists.
+"""
+
+from ..choices import ACLRenderPlatformChoices
+from .cisco import CiscoRenderer
+
+__all__ = ("AristaEOSRenderer",)
+
+
+class AristaEOSRenderer(CiscoRenderer):
+    """
+    Arista EOS access lists, with explicit sequence numbers.
+    """
+
+    platform = ACLRenderPlatformChoices.PLATFORM_ARISTA_EOS
+    indent = "   "
+    sequenced = True
+    icmp_keywords = {4: "icmp", 6: "icmpv6"}
@@ -0,0 +1,162 @@
+"""
+Base class of the device configuration renderers.
+"""
+
+from collections import namedtuple
+
+from ..choices import ACLAssignmentDirectionChoices, ACLProtocolChoices
+from ..engine import ALL_PORTS, get_protocol_ports, make_network_rule_entry, network_from_range
+from ..engine.rules import CHUNK_SIZE
+
+__all__ = (
+    "ACLRenderer",
+    "RenderedRule",
+)
+
+# A rule to render: its parsed RuleEntry, its description, and whether it is one of the rules of each
+# protocol a rule matching any protocol on given destination ports is split into (see split_rule()).
+RenderedRule = namedtuple("RenderedRule", ("entry", "description", "split"), defaults=(False,))
+
+
+class AccessListRules:
+    """
+    Re-iterable source of the RenderedRules of an Access List. Each iteration streams the
+    rules from the database in chunks, so that no renderer holds a whole Access List in memory.
+    """
+
+    def __init__(self, access_list):
+        self.access_list = access_list
+
+    def __iter__(self):
+        rules = self.access_list.get_rules()
+        values = rules.values_list("pk", "protocol", "destination_ports", "description", *rules.model.network_range_fields)
+        for pk, protocol, ports, description, *network_range in values.iterator(chunk_size=CHUNK_SIZE):
+            entry = make_network_rule_entry(pk, network_from_range(*network_range), protocol, ports)
+            # Rules with an invalid prefix cannot match any traffic, and are left out of the configuration.
+            if entry is not None:
+                yield RenderedRule(entry, description)
+
+
+class ACLRenderer:
+    """
+    Renders an Access List as the configuration of a device platform, one line at a time.
+
+    Rules are rendered as permit statements, in rule order, followed by an explicit deny of
+    everything else. Platforms which configure IPv4 and IPv6 filters separately render one
+    filter per address family: the IPv4 filter is always rendered, the IPv6 one only when
+    the Access List has IPv6 rules.
+    """
+
+    platform = None
+
+    # Whether the platform configures IPv4 and IPv6 filters separately.
+    split_families = True
+
+    # Maximum length of the rule descriptions rendered as remarks or comments.
+    max_description_length = 100
+
+    # Increment between the sequence numbers of consecutive entries, on platforms numbering them.
+    sequence_step = 10
+
+    def __init__(self, name, match_destination, rules):
+        """
+        Rules must be re-iterable when the platform splits the address families,
+        as they are iterated once per family.
+        """
+        self.name = name
+        self.match_destination = match_destination
+        self.rules = rules
+
+    @classmethod
+    def from_access_list(cls, access_list):
+        return cls(
+            access_list.name,
+            access_list.type == ACLAssignmentDirectionChoices.DIRECTION_EGRESS,
+            AccessListRules(access_list),
+        )
+
+    def render(self):
+        """
+        Yield the configuration lines of the Access List.
+        """
+        if not self.split_families:
+            yield from self.render_filter(None, self.rules)
+            return
+
+        has_ipv6 = False
+
+        def ipv4_rules():
+            nonlocal has_ipv6
+            for rule in self.rules:
+                if rule.entry.network.version == 4:
+                    yield rule
+                else:
+                    has_ipv6 = True
+
+        yield from self.render_filter(4, ipv4_rules())
+        if has_ipv6:
+            yield from self.render_filter(6, (rule for rule in self.rules if rule.entry.network.version == 6))
+
+    def render_filter(self, version, rules):
+        """
+        Yield the lines of one filter. Version is None when the filter holds both address families.
+        """
+        self.sequence = 0
+        yield from self.begin_filter(version)
+        for rule in rules:
+            for split_rule in self.split_rule(rule):
+                yield from self.render_rule(version, split_rule)
+        yield from self.end_filter(version)
+
+    def begin_filter(self, version):
+        return ()
+
+    def render_rule(self, version, rule):
+        raise NotImplementedError
+
+    def end_filter(self, version):
+        return ()
+
+    #
+    # Helpers
+    #
+
+    def next_sequence(self):
+        """
+        Return the sequence number of the next entry of the current filter.
+        """
+        self.sequence += self.sequence_step
+        return self.sequence
+
+    @staticmethod
+    def split_rule(rule):
+        """
+        Yield the rules to render for a rule. Destination ports only apply to TCP and UDP, so a rule matching
+        any protocol on given ports is split into a rule of each protocol it permits (see get_protocol_ports()),
+        rather than rendered as permitting any protocol. Only the first of them keeps the description.
+        """
+        entry = rule.entry
+        if entry.protocol or entry.ports == ALL_PORTS:
+            yield rule
+            return
+        description = rule.description
+        for protocol, ports in get_protocol_ports(entry):
+            yield RenderedRule(entry._replace(protocol=protocol, ports=ports), description, True)
+            description = None
+
+    def get_description(self, rule):
+        """
+        Return the description of a rule as a single line, truncated to the platform's limit.
+        """
+        description = " ".join((rule.description or "").split())
+        return description[: self.max_description_length]
+
+    @staticmethod
+    def get_port_intervals(rule):
+        """
+        Return the destination port intervals to match, or an empty tuple when the rule matches any port.
+        """
+        entry = rule.entry
+        if entry.protocol in (None, ACLProtocolChoices.PROTOCOL_ICMP) or entry.ports == ALL_PORTS:
+            return ()
+        return entry.ports
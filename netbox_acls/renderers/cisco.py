@@ -0,0 +1,94 @@
+"""
+Renderers of Cisco IOS and NX-OS access lists.
+"""
+
+from ..choices import ACLProtocolChoices, ACLRenderPlatformChoices
+from .base import ACLRenderer
+
+__all__ = (
+    "CiscoIOSRenderer",
+    "CiscoNXOSRenderer",
+)
+
+
+class CiscoRenderer(ACLRenderer):
+    """
+    Common rendering of the Cisco-like extended access lists:
+        permit <protocol> <source> <destination> [eq <port> | range <low> <high>]
+    """
+
+    indent = " "
+    sequenced = False
+    family_keywords = {4: "ip", 6: "ipv6"}
+    icmp_keywords = {4: "icmp", 6: "icmp"}
+
+    def begin_filter(self, version):
+        yield f"{self.family_keywords[version]} access-list {self.name}"
+
+    def end_filter(self, version):
+        yield self.statement("deny", self.family_keywords[version], "any any")
+
+    def render_rule(self, version, rule):
+        description = self.get_description(rule)
+        if description:
+            yield self.statement("remark", description)
+
+        entry = rule.entry
+        if entry.protocol == ACLProtocolChoices.PROTOCOL_ICMP:
+            protocol = self.icmp_keywords[version]
+        else:
+            protocol = entry.protocol or self.family_keywords[version]
+        address = self.format_network(entry.network)
+        addresses = f"any {address}" if self.match_destination else f"{address} any"
+
+        intervals = self.get_port_intervals(rule)
+        if not intervals:
+            yield self.statement("permit", protocol, addresses)
+            return
+        for low, high in intervals:
+            ports = f"eq {low}" if low == high else f"range {low} {high}"
+            yield self.statement("permit", protocol, addresses, ports)
+
+    def statement(self, *words):
+        """
+        Return one access list entry, numbered on sequenced platforms.
+        """
+        if self.sequenced:
+            words = (self.next_sequence(), *words)
+        return self.indent + " ".join(str(word) for word in words)
+
+    def format_network(self, network):
+        if network.prefixlen == 0:
+            return "any"
+        if network.prefixlen == network.max_prefixlen:
+            return f"host {network.network_address}"
+        return network.with_prefixlen
+
+
+class CiscoIOSRenderer(CiscoRenderer):
+    """
+    Cisco IOS / IOS-XE named extended access lists. IPv4 entries use wildcard masks.
+    """
+
+    platform = ACLRenderPlatformChoices.PLATFORM_CISCO_IOS
+
+    def begin_filter(self, version):
+        if version == 4:
+            yield f"ip access-list extended {self.name}"
+        else:
+            yield f"ipv6 access-list {self.name}"
+
+    def format_network(self, network):
+        if network.version == 4 and 0 < network.prefixlen < network.max_prefixlen:
+            return f"{network.network_address} {network.hostmask}"
+        return super().format_network(network)
+
+
+class CiscoNXOSRenderer(CiscoRenderer):
+    """
+    Cisco NX-OS access lists, with explicit sequence numbers.
+    """
+
+    platform = ACLRenderPlatformChoices.PLATFORM_CISCO_NXOS
+    indent = "  "
+    sequenced = True
@@ -0,0 +1,40 @@
+"""
+Renderer of Junos firewall filters, in "set" format.
+"""
+
+from ..choices import ACLProtocolChoices, ACLRenderPlatformChoices
+from .base import ACLRenderer
+
+__all__ = ("JunosRenderer",)
+
+
+class JunosRenderer(ACLRenderer):
+    """
+    Junos firewall filters, one term per rule named after the rule ID.
+    """
+
+    platform = ACLRenderPlatformChoices.PLATFORM_JUNOS
+    family_keywords = {4: "inet", 6: "inet6"}
+
+    def prefix(self, version, term):
+        return f"set firewall family {self.family_keywords[version]} filter {self.name} term {term}"
+
+    def render_rule(self, version, rule):
+        entry = rule.entry
+        # The rules a rule is split into take a term each.
+        prefix = self.prefix(version, f"rule-{entry.id}-{entry.protocol}" if rule.split else f"rule-{entry.id}")
+
+        if entry.network.prefixlen:
+            address_field = "destination-address" if self.match_destination else "source-address"
+            yield f"{prefix} from {address_field} {entry.network.with_prefixlen}"
+        if entry.protocol:
+            protocol = entry.protocol
+            if version == 6 and protocol == ACLProtocolChoices.PROTOCOL_ICMP:
+                protocol = "icmp6"
+            yield f"{prefix} from {'protocol' if version == 4 else 'next-header'} {protocol}"
+        for low, high in self.get_port_intervals(rule):
+            yield f"{prefix} from destination-port {low if low == high else f'{low}-{high}'}"
+        yield f"{prefix} then accept"
+
+    def end_filter(self, version):
+        yield f"{self.prefix(version, 'default-deny')} then discard"
@@ -0,0 +1,61 @@
+"""
+Renderer of nftables chains.
+"""
+
+import re
+
+from ..choices import ACLProtocolChoices, ACLRenderPlatformChoices
+from .base import ACLRenderer
+
+__all__ = ("NftablesRenderer",)
+
+
+class NftablesRenderer(ACLRenderer):
+    """
+    A regular nftables chain, in an "inet" table, holding the rules of both address families.
+    The chain can be jumped to from a base chain hooked on the interfaces it applies to.
+    """
+
+    platform = ACLRenderPlatformChoices.PLATFORM_NFTABLES
+    split_families = False
+    table = "netbox_acls"
+    family_keywords = {4: "ip", 6: "ip6"}
+    icmp_keywords = {4: "icmp", 6: "ipv6-icmp"}
+    nfproto_keywords = {4: "ipv4", 6: "ipv6"}
+
+    def begin_filter(self, version):
+        yield f"table inet {self.table} {{"
+        # Chain names are identifiers: replace any other character.
+        yield f"\tchain {re.sub(r'[^A-Za-z0-9_]', '_', self.name)} {{"
+
+    def render_rule(self, version, rule):
+        entry = rule.entry
+        network = entry.network
+        matches = []
+
+        if network.prefixlen:
+            address_field = "daddr" if self.match_destination else "saddr"
+            matches.append(f"{self.family_keywords[network.version]} {address_field} {network.with_prefixlen}")
+        else:
+            matches.append(f"meta nfproto {self.nfproto_keywords[network.version]}")
+
+        intervals = self.get_port_intervals(rule)
+        if intervals:
+            ports = [str(low) if low == high else f"{low}-{high}" for low, high in intervals]
+            ports = ports[0] if len(ports) == 1 else f"{{ {', '.join(ports)} }}"
+            matches.append(f"{entry.protocol} dport {ports}")
+        elif entry.protocol == ACLProtocolChoices.PROTOCOL_ICMP:
+            matches.append(f"meta l4proto {self.icmp_keywords[network.version]}")
+        elif entry.protocol:
+            matches.append(f"meta l4proto {entry.protocol}")
+
+        matches.append("accept")
+        description = self.get_description(rule).replace('"', "'")
+        if description:
+            matches.append(f'comment "{description}"')
+        yield "\t\t" + " ".join(matches)
+
+    def end_filter(self, version):
+        yield "\t\tdrop"
+        yield "\t}"
+        yield "}"
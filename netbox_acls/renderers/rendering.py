@@ -0,0 +1,126 @@
+"""
+Render Access Lists as streamed configuration text, caching the output per platform.
+"""
+
+from itertools import islice
+
+from django.core.cache import cache
+
+from ..choices import ACLRenderPlatformChoices
+from ..engine import get_rules_cache_key
+from .arista import AristaEOSRenderer
+from .cisco import CiscoIOSRenderer, CiscoNXOSRenderer
+from .junos import JunosRenderer
+from .nftables import NftablesRenderer
+
+__all__ = (
+    "RENDERERS",
+    "get_renderer",
+    "invalidate_rendered_configs",
+    "render_access_list",
+)
+
+RENDERERS = {
+    renderer.platform: renderer
+    for renderer in (
+        CiscoIOSRenderer,
+        CiscoNXOSRenderer,
+        JunosRenderer,
+        AristaEOSRenderer,
+        NftablesRenderer,
+    )
+}
+
+# Rendered configurations are cached in chunks of lines, so that serving them from the
+# cache streams as well as rendering them does.
+CHUNK_LINES = 1000
+
+# Rendered configurations are cached for a day, unless invalidated by a change of their rules.
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_renderer(platform):
+    """
+    Return the renderer class of a platform, raising KeyError for unknown platforms.
+    """
+    return RENDERERS[platform]
+
+
+def _get_manifest_key(access_list_id, platform):
+    return f"netbox_acls:render:{access_list_id}:{platform}"
+
+
+def _get_chunk_key(version, index):
+    return f"{version}:{index}"
+
+
+def render_access_list(access_list, platform):
+    """
+    Return an iterator over the configuration text of an Access List for a platform, in chunks.
+
+    The output is cached as a manifest (content version and chunk count) per Access List and
+    platform, plus the chunks themselves. The content version covers the rules and the Access
+    List itself, so that a stale manifest is never served even if an invalidation was missed.
+    """
+    renderer = get_renderer(platform)
+    version = get_rules_cache_key("render", access_list, platform, access_list.last_updated.timestamp())
+    manifest_key = _get_manifest_key(access_list.pk, platform)
+    manifest = cache.get(manifest_key)
+    if manifest and manifest[0] == version:
+        return _stream_cached(access_list, renderer, version, manifest[1])
+    return _stream_rendered(access_list, renderer, version, manifest_key)
+
+
+def _iter_chunks(lines):
+    """
+    Group lines into newline-terminated chunks of CHUNK_LINES lines.
+    """
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, CHUNK_LINES))
+        if not chunk:
+            return
+        yield "\n".join(chunk) + "\n"
+
+
+def _stream_rendered(access_list, renderer, version, manifest_key):
+    """
+    Render the Access List, caching each chunk as it is streamed, then the manifest.
+    """
+    chunk_count = 0
+    for chunk in _iter_chunks(renderer.from_access_list(access_list).render()):
+        cache.set(_get_chunk_key(version, chunk_count), chunk, CACHE_TIMEOUT)
+        chunk_count += 1
+        yield chunk
+    cache.set(manifest_key, (version, chunk_count), CACHE_TIMEOUT)
+
+
+def _stream_cached(access_list, renderer, version, chunk_count):
+    """
+    Stream the cached chunks. Should a chunk have been evicted, the rest of the
+    configuration is rendered again, skipping the lines already streamed.
+    """
+    for index in range(chunk_count):
+        chunk = cache.get(_get_chunk_key(version, index))
+        if chunk is None:
+            lines = islice(renderer.from_access_list(access_list).render(), index * CHUNK_LINES, None)
+            yield from _iter_chunks(lines)
+            return
+        yield chunk
+
+
+def invalidate_rendered_configs(access_list_ids):
+    """
+    Drop the cached configurations of the given Access Lists, for every platform.
+    """
+    manifest_keys = [
+        _get_manifest_key(access_list_id, platform)
+        for access_list_id in access_list_ids
+        for platform in ACLRenderPlatformChoices.values()
+    ]
+    manifests = cache.get_many(manifest_keys)
+    stale_keys = list(manifests)
+    for version, chunk_count in manifests.values():
+        stale_keys.extend(_get_chunk_key(version, index) for index in range(chunk_count))
+    if stale_keys:
+        cache.delete_many(stale_keys)
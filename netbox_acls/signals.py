@@ -0,0 +1,191 @@
+"""
+Signal receivers keeping the plugin's denormalized data in sync with the ACL rules.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from dcim.models import Device, VirtualChassis
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from virtualization.models import VirtualMachine
+
+from .badges import invalidate_badge_count, invalidate_badge_counts
+from .changes import record_tombstones
+from .effective import sync_assignment_effective_rules, sync_rule_effective_rules
+from .models import AccessList, ACLEgressRule, ACLIngressRule, ACLInterfaceAssignment
+from .renderers import invalidate_rendered_configs
+
+
+class _DeferredUpdates:
+    """
+    Access List and rule IDs whose derived data must be refreshed once the current bulk operation ends.
+    """
+
+    def __init__(self):
+        self.access_list_ids = set()
+        self.rule_ids = defaultdict(set)
+
+
+# While it is None, the data is refreshed immediately by each rule signal.
+_deferred_updates = ContextVar("deferred_updates", default=None)
+
+
+def update_access_lists(access_list_ids):
+    """
+    Refresh the data derived from the rules of the given Access Lists (rule counters and rendered
+    configurations), or defer it to the end of the bulk operation in progress.
+    """
+    access_list_ids = {pk for pk in access_list_ids if pk}
+    if not access_list_ids:
+        return
+
+    deferred = _deferred_updates.get()
+    if deferred is not None:
+        deferred.access_list_ids.update(access_list_ids)
+        return
+
+    AccessList.objects.filter(pk__in=access_list_ids).update_rule_counts()
+    invalidate_rendered_configs(access_list_ids)
+
+
+def update_effective_rules(model, rule_ids):
+    """
+    Re-materialize the effective rules of the given rules, or defer it to the end of the bulk operation in progress.
+    """
+    deferred = _deferred_updates.get()
+    if deferred is not None:
+        deferred.rule_ids[model].update(rule_ids)
+        return
+
+    sync_rule_effective_rules(model, rule_ids)
+
+
+@contextmanager
+def defer_rule_updates():
+    """
+    Collect the Access Lists and rules touched by rule signals and refresh all of their counters
+    (with a single set-based statement), rendered configurations and effective rules once the
+    wrapped block exits.
+    """
+    if _deferred_updates.get() is not None:
+        # Already deferred by an outer block.
+        yield
+        return
+
+    token = _deferred_updates.set(_DeferredUpdates())
+    try:
+        yield
+    finally:
+        deferred = _deferred_updates.get()
+        _deferred_updates.reset(token)
+        update_access_lists(deferred.access_list_ids)
+        for model, rule_ids in deferred.rule_ids.items():
+            update_effective_rules(model, rule_ids)
+
+
+def _get_access_list_ids(instance):
+    """
+    Return the current and, when the rule was moved, the previous Access List ID of a rule.
+    """
+    access_list_ids = {instance.access_list_id}
+    prechange_snapshot = getattr(instance, "_prechange_snapshot", None) or {}
+    access_list_ids.add(prechange_snapshot.get("access_list"))
+    return access_list_ids
+
+
+@receiver(post_save, sender=ACLIngressRule)
+@receiver(post_save, sender=ACLEgressRule)
+@receiver(post_delete, sender=ACLIngressRule)
+@receiver(post_delete, sender=ACLEgressRule)
+def handle_rule_change(sender, instance, **kwargs):
+    """
+    Keep the rule-derived data of the parent Access List(s) up to date when a rule is saved or deleted.
+    """
+    update_access_lists(_get_access_list_ids(instance))
+
+    # Effective rules only reference the rule: they change when it is created or moved to another
+    # Access List. Those of deleted rules cascade.
+    if kwargs["signal"] is post_save:
+        prechange_snapshot = getattr(instance, "_prechange_snapshot", None) or {}
+        if kwargs["created"] or prechange_snapshot.get("access_list") != instance.access_list_id:
+            update_effective_rules(sender, [instance.pk])
+
+
+@receiver(post_save, sender=AccessList)
+@receiver(post_delete, sender=AccessList)
+def handle_access_list_change(sender, instance, **kwargs):
+    """
+    Drop the rendered configurations of an Access List when it is renamed, retyped or deleted.
+    As the Access List may apply to any number of devices through its role, drop every badge count.
+    A retyped Access List applies the rules of its new type, in its new direction, on its interfaces.
+    """
+    invalidate_rendered_configs([instance.pk])
+    invalidate_badge_counts()
+    if kwargs.get("created") is False:
+        prechange_snapshot = getattr(instance, "_prechange_snapshot", None) or {}
+        if prechange_snapshot.get("type") != instance.type:
+            sync_assignment_effective_rules(instance.aclinterfaceassignment_set.values_list("pk", flat=True))
+
+
+def _invalidate_interface_badge_count(content_type_id, object_id):
+    if content_type_id and object_id:
+        invalidate_badge_count(ContentType.objects.get_for_id(content_type_id).model_class(), object_id)
+
+
+def update_interface_assignments(assignments):
+    """
+    Re-materialize the effective rules of created ACL Interface Assignments and drop the badge counts
+    of their interfaces, for bulk creations which do not send signals.
+    """
+    sync_assignment_effective_rules([assignment.pk for assignment in assignments])
+    for assignment in assignments:
+        _invalidate_interface_badge_count(assignment.assigned_object_type_id, assignment.assigned_object_id)
+
+
+@receiver(post_save, sender=ACLInterfaceAssignment)
+@receiver(post_delete, sender=ACLInterfaceAssignment)
+def handle_interface_assignment_change(sender, instance, **kwargs):
+    """
+    Re-materialize the effective rules of a saved assignment (those of a deleted one cascade),
+    and drop the badge counts of the interface it applies, or applied, to.
+    """
+    if kwargs["signal"] is post_save:
+        sync_assignment_effective_rules([instance.pk])
+
+    prechange_snapshot = getattr(instance, "_prechange_snapshot", None) or {}
+    assigned_objects = {
+        (instance.assigned_object_type_id, instance.assigned_object_id),
+        (prechange_snapshot.get("assigned_object_type"), prechange_snapshot.get("assigned_object_id")),
+    }
+    for content_type_id, object_id in assigned_objects:
+        _invalidate_interface_badge_count(content_type_id, object_id)
+
+
+@receiver(post_delete, sender=AccessList)
+@receiver(post_delete, sender=ACLIngressRule)
+@receiver(post_delete, sender=ACLEgressRule)
+@receiver(post_delete, sender=ACLInterfaceAssignment)
+def handle_change_feed_deletion(sender, instance, **kwargs):
+    """
+    Record the tombstone of a deleted object for the change feed, in the deleting transaction.
+    """
+    record_tombstones(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Device)
+@receiver(post_save, sender=VirtualMachine)
+def handle_host_change(sender, instance, **kwargs):
+    """
+    Drop the badge counts of a device or virtual machine, whose role may have changed.
+    """
+    invalidate_badge_count(sender, instance.pk)
+
+    # Devices also count towards their virtual chassis, current and previous.
+    if sender is Device:
+        prechange_snapshot = getattr(instance, "_prechange_snapshot", None) or {}
+        for virtual_chassis_id in {instance.virtual_chassis_id, prechange_snapshot.get("virtual_chassis")}:
+            if virtual_chassis_id:
+                invalidate_badge_count(VirtualChassis, virtual_chassis_id)
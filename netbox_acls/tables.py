@@ -48,6 +48,18 @@ class AccessListTable(NetBoxTable):
     rule_count = tables.Column(
         verbose_name="Rule Count",
     )
+    icmp_rule_count = tables.Column(
+        verbose_name="ICMP Rules",
+    )
+    tcp_rule_count = tables.Column(
+        verbose_name="TCP Rules",
+    )
+    udp_rule_count = tables.Column(
+        verbose_name="UDP Rules",
+    )
+    tcam_entry_count = tables.Column(
+        verbose_name="TCAM Entries",
+    )
     tags = columns.TagColumn(
         url_name="plugins:netbox_acls:accesslist_list",
     )
@@ -61,6 +73,10 @@ class AccessListTable(NetBoxTable):
             "assigned_object",
             "type",
             "rule_count",
+            "icmp_rule_count",
+            "tcp_rule_count",
+            "udp_rule_count",
+            "tcam_entry_count",
             "comments",
             "tags",
         )
@@ -69,6 +85,7 @@ class AccessListTable(NetBoxTable):
             "assigned_object",
             "type",
             "rule_count",
+            "tcam_entry_count",
             "tags",
         )
 
@@ -127,6 +144,11 @@ class ACLIngressRuleTable(NetBoxTable):
     tags = columns.TagColumn(
         url_name="plugins:netbox_acls:aclingressrule_list",
     )
+    destination_ports = tables.Column(
+        accessor="get_destination_ports_display",
+        order_by="destination_ports",
+        verbose_name="Destination Ports",
+    )
 
     class Meta(NetBoxTable.Meta):
         model = ACLIngressRule
@@ -134,6 +156,7 @@ class ACLIngressRuleTable(NetBoxTable):
             "pk",
             "id",
             "access_list",
+            "sequence",
             "tags",
             "description",
             "source_prefix",
@@ -141,6 +164,7 @@ class ACLIngressRuleTable(NetBoxTable):
         )
         default_columns = (
             "access_list",
+            "sequence",
             "description",
             "protocol",
             "source_prefix",
@@ -160,6 +184,11 @@ class ACLEgressRuleTable(NetBoxTable):
     tags = columns.TagColumn(
         url_name="plugins:netbox_acls:aclegressrule_list",
     )
+    destination_ports = tables.Column(
+        accessor="get_destination_ports_display",
+        order_by="destination_ports",
+        verbose_name="Destination Ports",
+    )
     protocol = ChoiceFieldColumn()
 
     class Meta(NetBoxTable.Meta):
@@ -168,6 +197,7 @@ class ACLEgressRuleTable(NetBoxTable):
             "pk",
             "id",
             "access_list",
+            "sequence",
             "tags",
             "description",
             "destination_prefix",
@@ -176,6 +206,7 @@ class ACLEgressRuleTable(NetBoxTable):
         )
         default_columns = (
             "access_list",
+            "sequence",
             "description",
             "protocol",
             "destination_prefix",
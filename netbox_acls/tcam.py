@@ -0,0 +1,81 @@
+"""
+TCAM usage of the Access Lists, aggregated per device role they are assigned to, or per interface through
+their ACL Interface Assignments.
+
+The TCAM entry count of each rule is stored along with its ports, and summed up on its Access List with
+the other rule counters, so aggregating it is a single grouped query over the Access Lists or assignments.
+"""
+
+from collections import namedtuple
+
+from dcim.models import DeviceRole
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Sum
+
+from .models import AccessList, ACLInterfaceAssignment
+
+__all__ = (
+    "TCAM_USAGE_GROUPS",
+    "TCAMUsage",
+    "get_tcam_usage",
+)
+
+TCAM_USAGE_GROUP_DEVICE_ROLE = "device_role"
+TCAM_USAGE_GROUP_INTERFACE = "interface"
+TCAM_USAGE_GROUPS = (TCAM_USAGE_GROUP_DEVICE_ROLE, TCAM_USAGE_GROUP_INTERFACE)
+
+# The usage of each device role or interface, as (content type, object id, assigned object, Access List
+# count, TCAM entry count) dicts ordered from the largest TCAM entry count, and whether some were left out
+# past the limit.
+TCAMUsage = namedtuple("TCAMUsage", ("results", "truncated"))
+
+
+def _get_device_role_usage(user):
+    queryset = AccessList.objects.restrict(user, "view").filter(
+        assigned_object_type=ContentType.objects.get_for_model(DeviceRole),
+    )
+    return queryset.order_by().values("assigned_object_type", "assigned_object_id").annotate(
+        access_list_count=Count("pk"),
+        tcam_entry_count=Sum("tcam_entry_count"),
+    )
+
+
+def _get_interface_usage(user, direction=None):
+    queryset = ACLInterfaceAssignment.objects.restrict(user, "view").filter(
+        access_list__in=AccessList.objects.restrict(user, "view"),
+    )
+    if direction:
+        queryset = queryset.filter(access_list__type=direction)
+    return queryset.order_by().values("assigned_object_type", "assigned_object_id").annotate(
+        access_list_count=Count("pk"),
+        tcam_entry_count=Sum("access_list__tcam_entry_count"),
+    )
+
+
+def get_tcam_usage(user, group_by, direction=None, limit=100):
+    """
+    Return the TCAMUsage of the Access Lists the user may view, per device role or per interface (optionally
+    for a direction), for the limit largest ones. Objects the user may not view are left as None.
+    """
+    if group_by == TCAM_USAGE_GROUP_DEVICE_ROLE:
+        queryset = _get_device_role_usage(user)
+    else:
+        queryset = _get_interface_usage(user, direction)
+    results = list(queryset.order_by("-tcam_entry_count", "assigned_object_type", "assigned_object_id")[:limit + 1])
+    truncated = len(results) > limit
+    results = results[:limit]
+
+    # The assigned objects are loaded with a query per content type.
+    object_ids = {}
+    for result in results:
+        object_ids.setdefault(result["assigned_object_type"], []).append(result["assigned_object_id"])
+    objects = {}
+    for content_type_id, ids in object_ids.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        for pk, instance in model.objects.restrict(user, "view").in_bulk(ids).items():
+            objects[content_type_id, pk] = instance
+
+    for result in results:
+        result["assigned_object_type"] = ContentType.objects.get_for_id(result["assigned_object_type"])
+        result["assigned_object"] = objects.get((result["assigned_object_type"].pk, result["assigned_object_id"]))
+    return TCAMUsage(results, truncated)
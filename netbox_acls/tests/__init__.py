@@ -0,0 +1,24 @@
+from dcim.models import DeviceRole
+from django.contrib.contenttypes.models import ContentType
+
+from netbox_acls.models import AccessList
+
+
+def get_device_role():
+    """
+    Return "Device Role 1", the device role the test Access Lists are assigned to by default.
+    """
+    device_role, _ = DeviceRole.objects.get_or_create(name="Device Role 1", slug="device-role-1")
+    return device_role
+
+
+def create_access_list(direction, name="testacl1", device_role=None):
+    """
+    Create an Access List of the given direction, assigned to the device role or to "Device Role 1".
+    """
+    return AccessList.objects.create(
+        name=name,
+        assigned_object_type=ContentType.objects.get_for_model(DeviceRole),
+        assigned_object_id=(device_role or get_device_role()).id,
+        type=direction,
+    )
@@ -1,11 +1,18 @@
-from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Site
+import csv
+import json
+
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Site
 from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
 from rest_framework import status
 from utilities.testing import APITestCase, APIViewTestCases
 
 from netbox_acls.choices import *
 from netbox_acls.models import *
+from netbox_acls.querysets import DEVICE_ROLE_FIELD
+from netbox_acls.tests import create_access_list, get_device_role
 
 
 class AppTest(APITestCase):
@@ -36,10 +43,7 @@ class ACLTestCase(
             manufacturer=manufacturer,
             model="Device Type 1",
         )
-        devicerole = DeviceRole.objects.create(
-            name="Device Role 1",
-            slug="device-role-1",
-        )
+        devicerole = get_device_role()
         device = Device.objects.create(
             name="Device 1",
             site=site,
@@ -89,3 +93,918 @@ class ACLTestCase(
                 "type": ACLAssignmentDirectionChoices.DIRECTION_INGRESS,
             },
         ]
+
+
+class ACLIngressRuleTestCase(
+    APIViewTestCases.APIViewTestCase,
+):
+    """Test the ACLIngressRule API"""
+
+    model = ACLIngressRule
+    view_namespace = "plugins-api:netbox_acls"
+    brief_fields = ["display", "id", "url"]
+
+    @classmethod
+    def setUpTestData(cls):
+        access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+
+        for ports in ([22], [80], [443]):
+            ACLIngressRule.objects.create(
+                access_list=access_list,
+                source_prefix="10.0.0.0/8",
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=ports,
+            )
+
+        cls.create_data = [
+            {
+                "access_list": access_list.pk,
+                "source_prefix": "10.1.0.0/16",
+                "protocol": ACLProtocolChoices.PROTOCOL_TCP,
+                "destination_ports": ["1024-65535"],
+                "description": "Rule 4",
+            },
+            {
+                "access_list": access_list.pk,
+                "source_prefix": "10.2.0.0/16",
+                "protocol": ACLProtocolChoices.PROTOCOL_UDP,
+                "destination_ports": [53],
+                "description": "Rule 5",
+            },
+            {
+                "access_list": access_list.pk,
+                "source_prefix": "192.0.2.0/24",
+                "protocol": ACLProtocolChoices.PROTOCOL_ICMP,
+                "description": "Rule 6",
+            },
+        ]
+        cls.update_data = {
+            "protocol": ACLProtocolChoices.PROTOCOL_TCP,
+            "destination_ports": [[8080, 8081]],
+            "description": "Updated rule",
+        }
+
+    def test_destination_ports(self):
+        self.add_permissions("netbox_acls.view_aclingressrule")
+        rule = ACLIngressRule.objects.get(destination_ports=[[22, 22]])
+        url = reverse("plugins-api:netbox_acls-api:aclingressrule-detail", kwargs={"pk": rule.pk})
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["destination_ports"], [[22, 22]])
+
+
+class AccessListMatchTestCase(APITestCase):
+    """Test the flow matching action of the AccessList API"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        cls.rule = ACLIngressRule.objects.create(
+            access_list=cls.access_list,
+            description="Rule 1",
+            source_prefix="10.1.0.0/16",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[443],
+        )
+
+    def test_match(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-match", kwargs={"pk": self.access_list.pk})
+
+        response = self.client.get(f"{url}?source=10.1.2.3&protocol=tcp&port=443", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["verdict"]["value"], ACLVerdictChoices.VERDICT_PERMIT)
+        self.assertEqual(response.data["rule"], self.rule.pk)
+
+        response = self.client.get(f"{url}?source=10.2.0.1&protocol=tcp&port=443", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["verdict"]["value"], ACLVerdictChoices.VERDICT_DENY)
+        self.assertIsNone(response.data["rule"])
+
+    def test_match_requires_source_on_ingress_acl(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-match", kwargs={"pk": self.access_list.pk})
+
+        response = self.client.get(f"{url}?destination=10.1.2.3&protocol=tcp&port=443", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+
+class ACLFlowSimulationTestCase(APITestCase):
+    """Test the simulation of flows against the Access Lists assigned to an interface"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        devicerole = get_device_role()
+        device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: devicerole},
+        )
+        cls.interface = Interface.objects.create(device=device, name="eth0", type="1000base-t")
+        cls.access_lists = {}
+        for direction, rule_model, prefix in (
+            (ACLAssignmentDirectionChoices.DIRECTION_INGRESS, ACLIngressRule, "10.0.0.0/8"),
+            (ACLAssignmentDirectionChoices.DIRECTION_EGRESS, ACLEgressRule, "192.0.2.0/24"),
+        ):
+            access_list = create_access_list(direction, name=f"testacl-{direction}")
+            rule_model.objects.create(
+                access_list=access_list,
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[22],
+                **{rule_model.prefix_field: prefix},
+            )
+            ACLInterfaceAssignment.objects.create(
+                access_list=access_list,
+                assigned_object_type=ContentType.objects.get_for_model(Interface),
+                assigned_object_id=cls.interface.id,
+            )
+            cls.access_lists[direction] = access_list
+
+    def simulate(self, flows, **data):
+        url = reverse("plugins-api:netbox_acls-api:aclinterfaceassignment-simulate")
+        data = {"assigned_object_type": "dcim.interface", "assigned_object_id": self.interface.pk, "flows": flows, **data}
+        response = self.client.post(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_simulate_each_direction(self):
+        self.add_permissions(
+            "netbox_acls.view_accesslist",
+            "netbox_acls.view_aclinterfaceassignment",
+        )
+        ingress = ACLAssignmentDirectionChoices.DIRECTION_INGRESS
+        egress = ACLAssignmentDirectionChoices.DIRECTION_EGRESS
+
+        # Denied by the ingress Access List, even though an egress rule matches its destination.
+        result = self.simulate([["172.16.0.1", "192.0.2.1", "tcp", 22]])[0]
+        self.assertEqual(result[ingress]["verdict"], ACLVerdictChoices.VERDICT_DENY)
+        self.assertIsNone(result[ingress]["rule"])
+        self.assertEqual(result[egress]["verdict"], ACLVerdictChoices.VERDICT_PERMIT)
+        self.assertEqual(result[egress]["access_list"], self.access_lists[egress].pk)
+
+        result = self.simulate([["10.1.2.3", "198.51.100.1", "tcp", 22]], direction=ingress)[0]
+        self.assertEqual(list(result), [ingress])
+        self.assertEqual(result[ingress]["verdict"], ACLVerdictChoices.VERDICT_PERMIT)
+        self.assertEqual(result[ingress]["access_list"], self.access_lists[ingress].pk)
+
+
+class ACLRuleExportTestCase(APITestCase):
+    """Test the streamed export action of the ACL rule APIs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        ACLIngressRule.objects.bulk_create(
+            ACLIngressRule(
+                access_list=cls.access_list,
+                sequence=index * 10,
+                description=f"Rule {index}",
+                source_prefix=f"10.{index}.0.0/16",
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[80, 443, 8000 + index],
+            )
+            for index in range(1, 4)
+        )
+
+    def test_export_ndjson(self):
+        self.add_permissions("netbox_acls.view_aclingressrule")
+        url = reverse("plugins-api:netbox_acls-api:aclingressrule-export")
+
+        response = self.client.get(f"{url}?source_prefix=10.2.0.0/16", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["access_list_name"], "testacl1")
+        self.assertEqual(rows[0]["source_prefix"], "10.2.0.0/16")
+        self.assertEqual(rows[0]["sequence"], 20)
+        self.assertEqual(rows[0]["destination_ports"], [[80, 80], [443, 443], [8002, 8002]])
+
+    def test_export_csv(self):
+        self.add_permissions("netbox_acls.view_aclingressrule")
+        url = reverse("plugins-api:netbox_acls-api:aclingressrule-export")
+
+        response = self.client.get(f"{url}?export_format=csv", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        rows = list(csv.DictReader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["destination_ports"], "80,443,8001")
+
+
+class ACLEffectiveRuleTestCase(APITestCase):
+    """Test the read-only effective rules API"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        devicerole = get_device_role()
+        device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: devicerole},
+        )
+        cls.interfaces = [Interface.objects.create(device=device, name=f"eth{index}", type="1000base-t") for index in range(2)]
+        access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        cls.rule = ACLIngressRule.objects.create(
+            access_list=access_list,
+            description="Rule 1",
+            source_prefix="10.1.0.0/16",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[443],
+        )
+        for interface in cls.interfaces:
+            ACLInterfaceAssignment.objects.create(
+                access_list=access_list,
+                assigned_object_type=ContentType.objects.get_for_model(Interface),
+                assigned_object_id=interface.id,
+            )
+
+    def test_list_by_interface(self):
+        self.add_permissions("netbox_acls.view_acleffectiverule")
+        url = reverse("plugins-api:netbox_acls-api:acleffectiverule-list")
+
+        response = self.client.get(f"{url}?interface_id={self.interfaces[0].pk}&direction=ingress", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        result = response.data["results"][0]
+        self.assertEqual(result["assigned_object_id"], self.interfaces[0].pk)
+        self.assertEqual(result["rule"]["id"], self.rule.pk)
+        self.assertEqual(result["rule"]["prefix"], "10.1.0.0/16")
+
+    def test_read_only(self):
+        self.add_permissions("netbox_acls.view_acleffectiverule", "netbox_acls.add_acleffectiverule")
+        url = reverse("plugins-api:netbox_acls-api:acleffectiverule-list")
+
+        response = self.client.post(url, {}, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class ACLInterfaceAssignmentBulkCreateTestCase(APITestCase):
+    """Test the set-based validation and creation of lists of ACL Interface Assignments"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        devicerole = get_device_role()
+        other_devicerole = DeviceRole.objects.create(
+            name="Device Role 2",
+            slug="device-role-2",
+        )
+        device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: devicerole},
+        )
+        cls.interfaces = [Interface.objects.create(device=device, name=f"eth{index}", type="1000base-t") for index in range(3)]
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        cls.other_access_list = create_access_list(
+            ACLAssignmentDirectionChoices.DIRECTION_INGRESS,
+            name="testacl2",
+            device_role=other_devicerole,
+        )
+        ACLIngressRule.objects.create(
+            access_list=cls.access_list,
+            description="Rule 1",
+            source_prefix="10.1.0.0/16",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[443],
+        )
+
+    def get_data(self, access_list, interface):
+        return {
+            "access_list": access_list.pk,
+            "assigned_object_type": "dcim.interface",
+            "assigned_object_id": interface.pk,
+        }
+
+    def test_bulk_create(self):
+        self.add_permissions("netbox_acls.add_aclinterfaceassignment", "netbox_acls.view_aclinterfaceassignment")
+        url = reverse("plugins-api:netbox_acls-api:aclinterfaceassignment-list")
+        data = [self.get_data(self.access_list, interface) for interface in self.interfaces]
+
+        response = self.client.post(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(ACLInterfaceAssignment.objects.count(), 3)
+        self.assertEqual(ACLEffectiveRule.objects.count(), 3)
+        self.assertTrue(all(result["id"] for result in response.data))
+
+    def test_bulk_create_errors(self):
+        self.add_permissions("netbox_acls.add_aclinterfaceassignment", "netbox_acls.view_aclinterfaceassignment")
+        url = reverse("plugins-api:netbox_acls-api:aclinterfaceassignment-list")
+        data = [
+            self.get_data(self.access_list, self.interfaces[0]),
+            self.get_data(self.other_access_list, self.interfaces[1]),
+            self.get_data(self.access_list, self.interfaces[0]),
+        ]
+
+        response = self.client.post(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("access_list", response.data[1])
+        self.assertIn("non_field_errors", response.data[2])
+        self.assertFalse(ACLInterfaceAssignment.objects.exists())
+
+
+class ACLRuleBulkWriteTestCase(APITestCase):
+    """Test the opt-in bulk write mode of the ACL rule APIs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS)
+
+    def get_data(self, index):
+        return {
+            "access_list": self.access_list.pk,
+            "description": f"Rule {index}",
+            "destination_prefix": f"10.{index}.0.0/16",
+            "protocol": ACLProtocolChoices.PROTOCOL_TCP,
+            "destination_ports": [index],
+        }
+
+    def test_bulk_write(self):
+        self.add_permissions(
+            "netbox_acls.add_aclegressrule",
+            "netbox_acls.change_aclegressrule",
+            "netbox_acls.delete_aclegressrule",
+            "netbox_acls.view_aclegressrule",
+        )
+        url = reverse("plugins-api:netbox_acls-api:aclegressrule-list")
+
+        response = self.client.post(f"{url}?bulk_write=true", [self.get_data(index) for index in range(1, 4)], format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(ACLEgressRule.objects.count(), 3)
+        self.assertEqual(ObjectChange.objects.filter(action="create").count(), 3)
+        self.access_list.refresh_from_db()
+        self.assertEqual(self.access_list.rule_count, 3)
+
+        rules = ACLEgressRule.objects.order_by("pk")
+        data = [{"id": rule.pk, "description": "Updated"} for rule in rules]
+        response = self.client.patch(f"{url}?bulk_write=true", data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(set(ACLEgressRule.objects.values_list("description", flat=True)), {"Updated"})
+        self.assertEqual(ObjectChange.objects.filter(action="update").count(), 3)
+
+        response = self.client.delete(f"{url}?bulk_write=true", [{"id": rule.pk} for rule in rules], format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertFalse(ACLEgressRule.objects.exists())
+        self.assertEqual(ObjectChange.objects.filter(action="delete").count(), 3)
+        self.access_list.refresh_from_db()
+        self.assertEqual(self.access_list.rule_count, 0)
+
+    def test_bulk_write_errors(self):
+        self.add_permissions("netbox_acls.add_aclegressrule", "netbox_acls.view_aclegressrule")
+        url = reverse("plugins-api:netbox_acls-api:aclegressrule-list")
+        data = [self.get_data(1), {**self.get_data(2), "destination_prefix": "invalid"}, self.get_data(1)]
+
+        response = self.client.post(f"{url}?bulk_write=true", data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("destination_prefix", response.data[1])
+        self.assertIn("non_field_errors", response.data[2])
+        self.assertFalse(ACLEgressRule.objects.exists())
+
+
+class ACLConditionalGetTestCase(APITestCase):
+    """Test the ETags and 304 Not Modified responses of the Access List and rule APIs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.devicerole = get_device_role()
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS)
+        cls.rule = ACLEgressRule.objects.create(
+            access_list=cls.access_list,
+            destination_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[22],
+        )
+
+    def test_access_list_etag(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-detail", kwargs={"pk": self.access_list.pk})
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+
+        # Changing one of its rules changes the Access List's representation (rule counts).
+        self.rule.protocol = ACLProtocolChoices.PROTOCOL_UDP
+        self.rule.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_rule_list_etag(self):
+        self.add_permissions("netbox_acls.view_aclegressrule")
+        url = reverse("plugins-api:netbox_acls-api:aclegressrule-list")
+
+        etag = self.client.get(url, **self.header)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+
+        # A filtered list has its own ETag.
+        response = self.client.get(f"{url}?protocol=udp", HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        self.rule.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+    def test_nested_object_etags(self):
+        self.add_permissions("netbox_acls.view_accesslist", "netbox_acls.view_aclegressrule")
+        access_list_url = reverse("plugins-api:netbox_acls-api:accesslist-detail", kwargs={"pk": self.access_list.pk})
+        rule_url = reverse("plugins-api:netbox_acls-api:aclegressrule-detail", kwargs={"pk": self.rule.pk})
+        rule_etag = self.client.get(rule_url, **self.header)["ETag"]
+
+        # Renaming the Access List changes the rule's nested Access List.
+        self.access_list.name = "testacl2"
+        self.access_list.save()
+        response = self.client.get(rule_url, HTTP_IF_NONE_MATCH=rule_etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["access_list"]["name"], "testacl2")
+
+        # Renaming the device role changes the Access List's nested assigned object.
+        access_list_etag = self.client.get(access_list_url, **self.header)["ETag"]
+        self.devicerole.name = "Device Role 2"
+        self.devicerole.save()
+        response = self.client.get(access_list_url, HTTP_IF_NONE_MATCH=access_list_etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+
+class ACLChangeFeedTestCase(APITestCase):
+    """Test the incremental change feed of Access Lists, rules and assignments"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS)
+        cls.rule = ACLEgressRule.objects.create(
+            access_list=cls.access_list,
+            destination_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[22],
+        )
+
+    def test_changes(self):
+        self.add_permissions("netbox_acls.view_accesslist", "netbox_acls.view_aclegressrule")
+        url = reverse("plugins-api:netbox_acls-api:change-list")
+
+        response = self.client.get(f"{url}?limit=1", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["object_type"], "netbox_acls.accesslist")
+        self.assertEqual(response.data["results"][0]["object"]["name"], "testacl1")
+        self.assertTrue(response.data["has_more"])
+
+        response = self.client.get(f"{url}?limit=1&cursor={response.data['cursor']}", **self.header)
+        self.assertEqual(response.data["results"][0]["object_type"], "netbox_acls.aclegressrule")
+        self.assertEqual(response.data["results"][0]["object_id"], self.rule.pk)
+        self.assertFalse(response.data["results"][0]["deleted"])
+        self.assertFalse(response.data["has_more"])
+        cursor = response.data["cursor"]
+
+        # Nothing changed: the cursor stays put.
+        response = self.client.get(f"{url}?cursor={cursor}", **self.header)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+
+        rule_id = self.rule.pk
+        self.rule.delete()
+        response = self.client.get(f"{url}?cursor={cursor}", **self.header)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["object_id"], rule_id)
+        self.assertTrue(response.data["results"][0]["deleted"])
+        self.assertIsNone(response.data["results"][0]["object"])
+
+    def test_changes_ingress_rule(self):
+        access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS, name="testacl2")
+        rule = ACLIngressRule.objects.create(
+            access_list=access_list,
+            source_prefix="192.0.2.0/24",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[443],
+        )
+        self.add_permissions("netbox_acls.view_accesslist", "netbox_acls.view_aclingressrule")
+        url = reverse("plugins-api:netbox_acls-api:change-list")
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        changes = {(result["object_type"], result["object_id"]): result for result in response.data["results"]}
+        change = changes["netbox_acls.aclingressrule", rule.pk]
+        self.assertFalse(change["deleted"])
+        self.assertEqual(change["object"]["source_prefix"], "192.0.2.0/24")
+        self.assertEqual(change["object"]["destination_ports"], [[443, 443]])
+
+    def test_changes_invalid_cursor(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:change-list")
+        response = self.client.get(f"{url}?cursor=invalid", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+
+class ACLCoverageTestCase(APITestCase):
+    """Test the reverse lookup of the rules covering an address or prefix"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        devicerole = get_device_role()
+        device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: devicerole},
+        )
+        cls.interface = Interface.objects.create(device=device, name="eth0", type="1000base-t")
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        cls.rules = [
+            ACLIngressRule.objects.create(
+                access_list=cls.access_list,
+                source_prefix="10.0.0.0/8",
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[443],
+            ),
+            ACLIngressRule.objects.create(
+                access_list=cls.access_list,
+                source_prefix="10.1.0.0/16",
+                protocol=ACLProtocolChoices.PROTOCOL_UDP,
+            ),
+            ACLIngressRule.objects.create(
+                access_list=cls.access_list,
+                source_prefix="192.0.2.0/24",
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[22],
+            ),
+        ]
+        ACLInterfaceAssignment.objects.create(
+            access_list=cls.access_list,
+            assigned_object_type=ContentType.objects.get_for_model(Interface),
+            assigned_object_id=cls.interface.id,
+        )
+
+    def get_rule_ids(self, query):
+        url = reverse("plugins-api:netbox_acls-api:coverage-list")
+        response = self.client.get(f"{url}?{query}", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        return [rule["id"] for result in response.data["results"] for rule in result["rules"]]
+
+    def test_coverage(self):
+        self.add_permissions(
+            "netbox_acls.view_accesslist",
+            "netbox_acls.view_aclingressrule",
+            "netbox_acls.view_aclinterfaceassignment",
+        )
+        url = reverse("plugins-api:netbox_acls-api:coverage-list")
+
+        response = self.client.get(f"{url}?prefix=10.1.2.3", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        result = response.data["results"][0]
+        self.assertEqual(result["access_list"]["id"], self.access_list.pk)
+        self.assertEqual([rule["id"] for rule in result["rules"]], [self.rules[0].pk, self.rules[1].pk])
+        self.assertEqual(len(result["assignments"]), 1)
+        self.assertEqual(result["assignments"][0]["assigned_object_id"], self.interface.pk)
+        self.assertFalse(response.data["truncated"])
+
+        # Only rules containing the whole prefix cover it.
+        self.assertEqual(self.get_rule_ids("prefix=10.0.0.0/12"), [self.rules[0].pk])
+        self.assertEqual(self.get_rule_ids("prefix=10.1.2.3&protocol=tcp&port=443"), [self.rules[0].pk])
+        # Rules without destination ports match any port.
+        self.assertEqual(self.get_rule_ids("prefix=10.1.2.3&port=53"), [self.rules[1].pk])
+        self.assertEqual(self.get_rule_ids("prefix=10.1.2.3&direction=egress"), [])
+
+    def test_coverage_permissions(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        self.assertEqual(self.get_rule_ids("prefix=10.1.2.3"), [])
+
+    def test_coverage_invalid_prefix(self):
+        self.add_permissions("netbox_acls.view_accesslist", "netbox_acls.view_aclingressrule")
+        url = reverse("plugins-api:netbox_acls-api:coverage-list")
+        response = self.client.get(f"{url}?prefix=invalid", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+
+class ACLRuleCursorPaginationTestCase(APITestCase):
+    """Test the opt-in cursor pagination of the ACL rule lists"""
+
+    @classmethod
+    def setUpTestData(cls):
+        access_lists = [
+            create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS, name=f"testacl{index}")
+            for index in range(1, 3)
+        ]
+        for access_list in access_lists:
+            for port in range(1, 4):
+                ACLEgressRule.objects.create(
+                    access_list=access_list,
+                    destination_prefix="10.0.0.0/8",
+                    protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                    destination_ports=[port],
+                )
+
+    def test_cursor_pagination(self):
+        self.add_permissions("netbox_acls.view_aclegressrule")
+        url = reverse("plugins-api:netbox_acls-api:aclegressrule-list")
+        expected = list(ACLEgressRule.objects.order_by("access_list", "pk").values_list("pk", flat=True))
+
+        response = self.client.get(f"{url}?cursor=&limit=4", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual([rule["id"] for rule in response.data["results"]], expected[:4])
+
+        response = self.client.get(response.data["next"], **self.header)
+        self.assertEqual([rule["id"] for rule in response.data["results"]], expected[4:])
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get(response.data["previous"], **self.header)
+        self.assertEqual([rule["id"] for rule in response.data["results"]], expected[:4])
+        self.assertIsNone(response.data["previous"])
+
+    def test_offset_pagination_by_default(self):
+        self.add_permissions("netbox_acls.view_aclegressrule")
+        url = reverse("plugins-api:netbox_acls-api:aclegressrule-list")
+        response = self.client.get(f"{url}?limit=4", **self.header)
+        self.assertEqual(response.data["count"], 6)
+
+
+class ACLRuleSequenceTestCase(APITestCase):
+    """Test the insertion of rules between others and the renumbering of Access Lists"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS)
+        for port in (1, 2):
+            ACLEgressRule.objects.create(
+                access_list=cls.access_list,
+                destination_prefix="10.0.0.0/8",
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[port],
+            )
+
+    def test_insert_after(self):
+        self.add_permissions("netbox_acls.add_aclegressrule", "netbox_acls.view_aclegressrule")
+        url = reverse("plugins-api:netbox_acls-api:aclegressrule-list")
+        data = {
+            "access_list": self.access_list.pk,
+            "insert_after": 10,
+            "description": "Inserted",
+            "destination_prefix": "10.0.0.0/8",
+            "protocol": ACLProtocolChoices.PROTOCOL_TCP,
+            "destination_ports": [3],
+        }
+
+        response = self.client.post(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["sequence"], 15)
+        self.assertEqual(list(self.access_list.get_rules().values_list("sequence", flat=True)), [10, 15, 20])
+
+    def test_renumber(self):
+        self.add_permissions("netbox_acls.view_accesslist", "netbox_acls.change_aclegressrule")
+        ACLEgressRule.objects.filter(sequence=20).update(sequence=11)
+        url = reverse("plugins-api:netbox_acls-api:accesslist-renumber", kwargs={"pk": self.access_list.pk})
+
+        response = self.client.post(url, {"start": 100, "step": 100}, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["renumbered"], 2)
+        self.assertEqual(list(self.access_list.get_rules().values_list("sequence", flat=True)), [100, 200])
+
+    def test_renumber_requires_rule_change_permission(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-renumber", kwargs={"pk": self.access_list.pk})
+        response = self.client.post(url, {}, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+
+
+class ACLHistoryDiffTestCase(APITestCase):
+    """Test the diff of an Access List's rules between two points of its change history"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS)
+
+    def log_change(self, rule, action):
+        object_change = rule.to_objectchange(action)
+        object_change.user = self.user
+        object_change.save()
+        return object_change
+
+    def test_history_diff(self):
+        self.add_permissions("netbox_acls.view_accesslist", "extras.view_objectchange")
+        rules = [
+            ACLEgressRule.objects.create(
+                access_list=self.access_list,
+                destination_prefix="10.0.0.0/8",
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[port],
+            )
+            for port in (22, 80)
+        ]
+        for rule in rules:
+            start_change = self.log_change(rule, ObjectChangeActionChoices.ACTION_CREATE)
+
+        rules[0].snapshot()
+        rules[0].description = "SSH"
+        rules[0].save()
+        self.log_change(rules[0], ObjectChangeActionChoices.ACTION_UPDATE)
+        rules[1].snapshot()
+        self.log_change(rules[1], ObjectChangeActionChoices.ACTION_DELETE)
+        rules[1].delete()
+        rule = ACLEgressRule.objects.create(
+            access_list=self.access_list,
+            destination_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[443],
+        )
+        self.log_change(rule, ObjectChangeActionChoices.ACTION_CREATE)
+
+        url = reverse("plugins-api:netbox_acls-api:accesslist-history-diff", kwargs={"pk": self.access_list.pk})
+        response = self.client.get(f"{url}?start_change={start_change.pk}", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual([version["id"] for version in response.data["added"]], [rule.pk])
+        self.assertEqual(response.data["added"][0]["destination_ports"], [[443, 443]])
+        self.assertEqual([version["id"] for version in response.data["removed"]], [rules[1].pk])
+        self.assertEqual(len(response.data["modified"]), 1)
+        self.assertEqual(response.data["modified"][0]["before"]["description"], "")
+        self.assertEqual(response.data["modified"][0]["after"]["description"], "SSH")
+        self.assertFalse(response.data["truncated"])
+
+        # Rules created then deleted since the oldest change are left out.
+        response = self.client.get(url, **self.header)
+        self.assertEqual([version["id"] for version in response.data["added"]], [rules[0].pk, rule.pk])
+        self.assertEqual(response.data["removed"], [])
+        self.assertEqual(response.data["modified"], [])
+
+    def test_history_diff_conflicting_bounds(self):
+        self.add_permissions("netbox_acls.view_accesslist", "extras.view_objectchange")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-history-diff", kwargs={"pk": self.access_list.pk})
+        response = self.client.get(f"{url}?start=2024-01-01T00:00:00Z&start_change=1", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+
+class ACLOptimizeTestCase(APITestCase):
+    """Test the optimization of the rules of an Access List"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS)
+        for prefix, ports in (("10.0.0.0/25", [22]), ("10.0.0.128/25", [22, 23]), ("10.0.0.0/24", [23])):
+            ACLEgressRule.objects.create(
+                access_list=cls.access_list,
+                destination_prefix=prefix,
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=ports,
+            )
+
+    def test_optimize(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-optimize", kwargs={"pk": self.access_list.pk})
+        response = self.client.post(url, {}, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual((response.data["before"], response.data["after"]), (3, 1))
+        self.assertFalse(response.data["applied"])
+        self.assertEqual(ACLEgressRule.objects.count(), 3)
+
+    def test_optimize_apply(self):
+        self.add_permissions(
+            "netbox_acls.view_accesslist",
+            "netbox_acls.add_aclegressrule",
+            "netbox_acls.delete_aclegressrule",
+        )
+        url = reverse("plugins-api:netbox_acls-api:accesslist-optimize", kwargs={"pk": self.access_list.pk})
+        response = self.client.post(url, {"apply": True}, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertTrue(response.data["applied"])
+        self.assertEqual((response.data["created"], response.data["deleted"]), (1, 3))
+        self.assertEqual(
+            list(ACLEgressRule.objects.values_list("destination_prefix", "destination_ports")),
+            [("10.0.0.0/24", [[22, 23]])],
+        )
+
+    def test_optimize_apply_requires_rule_permissions(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-optimize", kwargs={"pk": self.access_list.pk})
+        response = self.client.post(url, {"apply": True}, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+
+
+class ACLTCAMUsageTestCase(APITestCase):
+    """Test the TCAM entries of Access Lists, and their aggregation per device role or interface"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        cls.devicerole = get_device_role()
+        device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: cls.devicerole},
+        )
+        cls.interface = Interface.objects.create(device=device, name="eth0", type="1000base-t")
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        cls.rule = ACLIngressRule.objects.create(
+            access_list=cls.access_list,
+            source_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[[1024, 65535]],
+        )
+        ACLIngressRule.objects.create(
+            access_list=cls.access_list,
+            source_prefix="10.1.0.0/16",
+            protocol=ACLProtocolChoices.PROTOCOL_ICMP,
+        )
+        ACLInterfaceAssignment.objects.create(
+            access_list=cls.access_list,
+            assigned_object_type=ContentType.objects.get_for_model(Interface),
+            assigned_object_id=cls.interface.id,
+        )
+
+    def test_tcam_entry_count(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        url = reverse("plugins-api:netbox_acls-api:accesslist-detail", kwargs={"pk": self.access_list.pk})
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["tcam_entry_count"], 7)
+
+        # The count is recomputed when rules change.
+        self.rule.destination_ports = [[22, 23]]
+        self.rule.save()
+        self.access_list.refresh_from_db()
+        self.assertEqual(self.access_list.tcam_entry_count, 2)
+
+    def test_tcam_usage(self):
+        self.add_permissions(
+            "netbox_acls.view_accesslist",
+            "netbox_acls.view_aclinterfaceassignment",
+            "dcim.view_devicerole",
+            "dcim.view_interface",
+        )
+        url = reverse("plugins-api:netbox_acls-api:tcam-usage-list")
+
+        response = self.client.get(f"{url}?group_by=device_role", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        result = response.data["results"][0]
+        self.assertEqual(result["assigned_object_type"], "dcim.devicerole")
+        self.assertEqual(result["assigned_object"]["id"], self.devicerole.pk)
+        self.assertEqual((result["access_list_count"], result["tcam_entry_count"]), (1, 7))
+
+        response = self.client.get(f"{url}?group_by=interface", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        result = response.data["results"][0]
+        self.assertEqual(result["assigned_object_type"], "dcim.interface")
+        self.assertEqual(result["assigned_object_id"], self.interface.pk)
+        self.assertEqual(result["tcam_entry_count"], 7)
+
+        response = self.client.get(f"{url}?group_by=interface&direction=egress", **self.header)
+        self.assertEqual(response.data["results"], [])
@@ -0,0 +1,54 @@
+from dcim.models import Device, DeviceType, Interface, Manufacturer, Site
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from netbox_acls.badges import get_device_access_list_count, get_interface_assignment_count
+from netbox_acls.choices import *
+from netbox_acls.models import *
+from netbox_acls.querysets import DEVICE_ROLE_FIELD
+from netbox_acls.tests import create_access_list, get_device_role
+
+
+class BadgeCountTestCase(TestCase):
+    """Test the cached badge counts of the plugin's tabs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        cls.devicerole = get_device_role()
+        cls.device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: cls.devicerole},
+        )
+        cls.interfaces = [
+            Interface.objects.create(device=cls.device, name=f"eth{index}", type="1000base-t") for index in range(3)
+        ]
+
+    def test_device_count_follows_role_access_lists(self):
+        self.assertEqual(get_device_access_list_count(self.device), 0)
+        create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        self.assertEqual(get_device_access_list_count(self.device), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_device_access_list_count(self.device), 1)
+
+    def test_device_count_primes_interface_counts(self):
+        access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        ACLInterfaceAssignment.objects.create(
+            access_list=access_list,
+            assigned_object_type=ContentType.objects.get_for_model(Interface),
+            assigned_object_id=self.interfaces[0].id,
+        )
+        get_device_access_list_count(self.device)
+        with self.assertNumQueries(0):
+            counts = [get_interface_assignment_count(interface) for interface in self.interfaces]
+        self.assertEqual(counts, [1, 0, 0])
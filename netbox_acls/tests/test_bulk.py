@@ -0,0 +1,84 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from extras.context_managers import change_logging
+from extras.models import ObjectChange, Tag, TaggedItem
+
+from netbox_acls.bulk import bulk_create_rules, bulk_delete_objects, get_access_lists_by_name, get_rule_unique_key, get_rule_unique_keys
+from netbox_acls.choices import *
+from netbox_acls.models import *
+from netbox_acls.tests import create_access_list
+
+
+class RuleBulkCreateTestCase(TestCase):
+    """Test the batched creation of rules used by the bulk import views"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        cls.tag = Tag.objects.create(name="Tag 1", slug="tag-1")
+        cls.user = get_user_model().objects.create_user(username="testuser")
+
+    def test_get_access_lists_by_name_limits_to_rule_type(self):
+        self.assertEqual(get_access_lists_by_name(ACLIngressRule, ["testacl1"]), {"testacl1": [self.access_list]})
+        self.assertEqual(get_access_lists_by_name(ACLEgressRule, ["testacl1"]), {})
+
+    def get_request(self):
+        request = RequestFactory().post("/")
+        request.user = self.user
+        request.id = uuid.uuid4()
+        return request
+
+    def test_bulk_create_rules(self):
+        request = self.get_request()
+        rules = [
+            (
+                ACLIngressRule(
+                    access_list=self.access_list,
+                    description=f"Rule {port}",
+                    source_prefix="10.0.0.0/8",
+                    protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                    destination_ports=[port],
+                ),
+                [self.tag] if port == 22 else [],
+            )
+            for port in (22, 80)
+        ]
+
+        created = bulk_create_rules(ACLIngressRule, rules, request)
+
+        self.assertEqual(ACLIngressRule.objects.count(), 2)
+        self.assertEqual([rule.sequence for rule in created], [10, 20])
+        self.assertEqual(list(created[0].tags.all()), [self.tag])
+        changes = ObjectChange.objects.filter(request_id=request.id)
+        self.assertEqual(changes.count(), 2)
+        self.assertEqual(changes.get(changed_object_id=created[0].pk).postchange_data["tags"], ["Tag 1"])
+        self.assertEqual(
+            get_rule_unique_keys(ACLIngressRule, [self.access_list.pk]),
+            {get_rule_unique_key(rule) for rule in created},
+        )
+
+    def test_bulk_delete_objects(self):
+        rules = []
+        for port in (22, 80, 443):
+            rule = ACLIngressRule.objects.create(
+                access_list=self.access_list,
+                source_prefix="10.0.0.0/8",
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[port],
+            )
+            rule.tags.add(self.tag)
+            rules.append(rule)
+
+        request = self.get_request()
+        with change_logging(request):
+            count = bulk_delete_objects(ACLIngressRule, [rule.pk for rule in rules[:2]])
+
+        self.assertEqual(count, 2)
+        self.assertEqual(list(ACLIngressRule.objects.values_list("pk", flat=True)), [rules[2].pk])
+        self.assertEqual(TaggedItem.objects.filter(object_id__in=[rule.pk for rule in rules[:2]]).count(), 0)
+        self.assertEqual(ObjectChange.objects.filter(request_id=request.id, action="delete").count(), 2)
+        self.assertEqual(ACLTombstone.objects.count(), 2)
+        self.access_list.refresh_from_db()
+        self.assertEqual(self.access_list.rule_count, 1)
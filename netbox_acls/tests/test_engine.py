@@ -0,0 +1,232 @@
+import ipaddress
+
+from django.test import SimpleTestCase
+
+from netbox_acls.choices import ACLRuleFindingChoices
+from netbox_acls.engine import (
+    CompiledAccessList,
+    FlowVerdict,
+    RuleFinding,
+    RuleSet,
+    analyze_rules,
+    compare_rule_sets,
+    count_port_range_prefixes,
+    get_counterexample,
+    get_network_range,
+    get_region_prefixes,
+    get_tcam_entry_count,
+    make_rule_entry,
+    merge_port_ranges,
+    network_from_range,
+    optimize_rules,
+    parse_address_range,
+    parse_flows,
+    parse_port_ranges,
+    parse_rule_entries,
+    simulate_flows,
+    subtract_intervals,
+    to_intervals,
+)
+
+
+class PortIntervalsTestCase(SimpleTestCase):
+    """Test the conversion of destination ports into port intervals"""
+
+    def test_to_intervals_merges_adjacent_ports(self):
+        self.assertEqual(to_intervals([443, 80, 81, 82, 8080]), ((80, 82), (443, 443), (8080, 8080)))
+
+    def test_to_intervals_without_ports(self):
+        self.assertEqual(to_intervals(None), ((0, 65535),))
+
+    def test_merge_port_ranges(self):
+        self.assertEqual(merge_port_ranges([443, [1024, 2048], 80, (2000, 65535)]), [[80, 80], [443, 443], [1024, 65535]])
+        self.assertEqual(merge_port_ranges(None), [])
+        with self.assertRaises(ValueError):
+            merge_port_ranges([[2048, 1024]])
+
+    def test_parse_port_ranges(self):
+        self.assertEqual(parse_port_ranges("22, 80,81,1024-65535"), [[22, 22], [80, 81], [1024, 65535]])
+        # As the API represents them.
+        self.assertEqual(parse_port_ranges("[22, 22],[80, 81]"), [[22, 22], [80, 81]])
+        with self.assertRaises(ValueError):
+            parse_port_ranges("22,65536")
+
+    def test_subtract_intervals(self):
+        self.assertEqual(subtract_intervals(((0, 100), (200, 300)), ((50, 60), (250, 400))), ((0, 49), (61, 100), (200, 249)))
+        self.assertEqual(subtract_intervals(((22, 23),), ((0, 65535),)), ())
+        self.assertEqual(subtract_intervals(((22, 23),), ()), ((22, 23),))
+
+
+class NetworkRangeTestCase(SimpleTestCase):
+    """Test the numeric ranges of networks stored alongside the rule prefixes"""
+
+    def test_round_trip(self):
+        for prefix in ("0.0.0.0/0", "10.1.2.0/24", "255.255.255.255/32", "::/0", "2001:db8::/32", "ffff::1/128"):
+            network = ipaddress.ip_network(prefix)
+            network_range = get_network_range(network)
+            self.assertTrue(all(-(2**63) <= value < 2**63 for value in network_range[1:]))
+            self.assertEqual(network_from_range(*network_range), network)
+
+    def test_ranges_order_as_addresses(self):
+        ranges = [get_network_range(ipaddress.ip_network(prefix))[1:3] for prefix in ("::/128", "::1:0:0:0:0/128", "ffff::/16")]
+        self.assertEqual(ranges, sorted(ranges))
+
+    def test_parse_address_range(self):
+        self.assertEqual(parse_address_range("10.0.0.0/30"), (4, 0x0A000000, 0x0A000003))
+        self.assertEqual(parse_address_range("10.0.0.1 - 10.0.0.9"), (4, 0x0A000001, 0x0A000009))
+        self.assertIsNone(parse_address_range("10.0.0.9-10.0.0.1"))
+        self.assertIsNone(parse_address_range("10.0.0.1-::1"))
+
+
+class CompiledAccessListTestCase(SimpleTestCase):
+    """Test the compiled Access List matcher"""
+
+    def setUp(self):
+        self.compiled = CompiledAccessList(
+            entry
+            for entry in (
+                make_rule_entry(1, "10.0.0.0/8", "tcp", [80, 443]),
+                make_rule_entry(2, "10.1.0.0/16", "tcp", [22, 443]),
+                make_rule_entry(3, "10.1.2.0/24", "udp", [53]),
+                make_rule_entry(4, "2001:db8::/32", "icmp", None),
+                make_rule_entry(5, "invalid", "tcp", [80]),
+            )
+            if entry is not None
+        )
+
+    def test_first_matching_rule_wins(self):
+        self.assertEqual(self.compiled.match("10.1.2.3", "tcp", 443), 1)
+        self.assertEqual(self.compiled.match("10.1.2.3", "tcp", 22), 2)
+        self.assertEqual(self.compiled.match("10.1.2.3", "udp", 53), 3)
+        self.assertEqual(self.compiled.match("2001:db8::1", "icmp"), 4)
+
+    def test_unmatched_flow_is_denied(self):
+        self.assertIsNone(self.compiled.match("10.2.0.1", "tcp", 22))
+        self.assertIsNone(self.compiled.match("10.1.3.1", "udp", 53))
+        self.assertIsNone(self.compiled.match("192.0.2.1", "tcp", 80))
+
+
+class FlowSimulationTestCase(SimpleTestCase):
+    """Test the batch flow simulation"""
+
+    def test_simulate_flows(self):
+        rule_sets = [
+            RuleSet(1, False, [make_rule_entry(10, "10.0.0.0/8", "tcp", [443])]),
+            RuleSet(2, True, [make_rule_entry(20, "192.0.2.0/24", None, None)]),
+        ]
+        flows = parse_flows(
+            [
+                ["10.1.2.3", "198.51.100.1", "tcp", 443],
+                ["10.1.2.3", "192.0.2.1", "tcp", 80],
+                ["10.1.2.3", "198.51.100.1", "udp", 53],
+            ],
+        )
+        self.assertEqual(
+            simulate_flows(rule_sets, flows),
+            [FlowVerdict(1, 10), FlowVerdict(2, 20), FlowVerdict(None, None)],
+        )
+
+    def test_parse_flows_rejects_missing_port(self):
+        with self.assertRaises(ValueError):
+            parse_flows([["10.1.2.3", "192.0.2.1", "tcp", None]])
+
+
+class RuleAnalysisTestCase(SimpleTestCase):
+    """Test the duplicate, shadowed and overlapping rule analysis"""
+
+    def test_analyze_rules(self):
+        entries = [
+            make_rule_entry(1, "10.0.0.0/8", "tcp", [80, 443]),
+            make_rule_entry(2, "10.1.0.0/16", "tcp", [443]),
+            make_rule_entry(3, "10.1.0.0/16", "tcp", [22, 443]),
+            make_rule_entry(4, "10.0.0.0/8", "tcp", [443, 80]),
+            make_rule_entry(5, "10.2.0.0/16", "udp", [53]),
+            make_rule_entry(6, "2001:db8::/32", "tcp", [22]),
+        ]
+        self.assertEqual(
+            analyze_rules(entries),
+            [
+                RuleFinding(2, ACLRuleFindingChoices.FINDING_SHADOWED, [1, 4]),
+                RuleFinding(3, ACLRuleFindingChoices.FINDING_OVERLAP, [1, 4, 2]),
+                RuleFinding(4, ACLRuleFindingChoices.FINDING_DUPLICATE, [1]),
+            ],
+        )
+
+
+class RuleSetImpactTestCase(SimpleTestCase):
+    """Test the comparison of the traffic permitted by two sets of rules"""
+
+    def get_regions(self, regions):
+        return [([str(prefix) for prefix in get_region_prefixes(region)], region.protocol, region.ports) for region in regions]
+
+    def test_compare_rule_sets(self):
+        current = [make_rule_entry(1, "10.0.0.0/24", "tcp", [22, (80, 90)])]
+        proposed = parse_rule_entries(
+            [
+                {"prefix": "10.0.0.0/25", "protocol": "tcp", "destination_ports": [22]},
+                {"prefix": "10.0.0.0/24", "protocol": "tcp", "destination_ports": ["80-85"]},
+                {"prefix": "10.0.1.0/24", "protocol": "icmp"},
+            ],
+        )
+        impact = compare_rule_sets(current, proposed)
+        self.assertEqual(self.get_regions(impact.added), [(["10.0.1.0/24"], "icmp", None)])
+        self.assertEqual(
+            self.get_regions(impact.removed),
+            [(["10.0.0.0/25"], "tcp", ((86, 90),)), (["10.0.0.128/25"], "tcp", ((22, 22), (86, 90)))],
+        )
+        self.assertFalse(impact.truncated)
+        self.assertEqual(get_counterexample(impact), (ipaddress.ip_address("10.0.1.0"), "icmp", None, True))
+
+    def test_equivalent_rule_sets(self):
+        current = [make_rule_entry(1, "10.0.0.0/24", "tcp", [22]), make_rule_entry(2, "10.0.0.0/24", "tcp", [23])]
+        proposed = [make_rule_entry(1, "10.0.0.0/25", "tcp", [(22, 23)]), make_rule_entry(2, "10.0.0.128/25", "tcp", [(22, 23)])]
+        self.assertIsNone(get_counterexample(compare_rule_sets(current, proposed)))
+
+    def test_parse_rule_entries_rejects_icmp_ports(self):
+        with self.assertRaisesRegex(ValueError, "Rule 0"):
+            parse_rule_entries([{"prefix": "10.0.0.0/8", "protocol": "icmp", "destination_ports": [22]}])
+
+
+class RuleOptimizerTestCase(SimpleTestCase):
+    """Test the minimization of rules into an equivalent set of rules"""
+
+    def test_optimize_rules(self):
+        entries = [
+            make_rule_entry(1, "10.0.0.0/25", "tcp", [22]),
+            make_rule_entry(2, "10.0.0.128/25", "tcp", [22]),
+            make_rule_entry(3, "10.0.0.5/32", "tcp", [22]),
+            make_rule_entry(4, "10.0.0.0/24", "tcp", [23]),
+            make_rule_entry(5, "10.0.1.0/24", "udp", [53, 54]),
+            make_rule_entry(6, "10.0.1.0/24", "icmp", None),
+            make_rule_entry(7, "10.0.1.0/25", "udp", [(50, 53)]),
+        ]
+        optimization = optimize_rules(entries)
+        self.assertEqual(
+            [(str(entry.network), entry.protocol, entry.ports) for entry in optimization.rules],
+            [
+                ("10.0.1.0/24", "icmp", ((0, 65535),)),
+                ("10.0.0.0/24", "tcp", ((22, 23),)),
+                ("10.0.1.0/24", "udp", ((53, 54),)),
+                ("10.0.1.0/25", "udp", ((50, 52),)),
+            ],
+        )
+        self.assertEqual((optimization.before, optimization.after), (7, 4))
+        self.assertIsNone(get_counterexample(compare_rule_sets(entries, optimization.rules)))
+
+
+class TCAMEntryCountTestCase(SimpleTestCase):
+    """Test the estimation of the TCAM entries of rules"""
+
+    def test_count_port_range_prefixes(self):
+        self.assertEqual(count_port_range_prefixes(0, 65535), 1)
+        self.assertEqual(count_port_range_prefixes(22, 23), 1)
+        self.assertEqual(count_port_range_prefixes(1, 2), 2)
+        self.assertEqual(count_port_range_prefixes(1024, 65535), 6)
+        self.assertEqual(count_port_range_prefixes(1, 65535), 16)
+
+    def test_get_tcam_entry_count(self):
+        self.assertEqual(get_tcam_entry_count("icmp", None), 1)
+        self.assertEqual(get_tcam_entry_count("tcp", None), 1)
+        self.assertEqual(get_tcam_entry_count("tcp", [[22, 23], [80, 80], [1024, 65535]]), 8)
+        # Rules matching any protocol take entries for both TCP and UDP.
+        self.assertEqual(get_tcam_entry_count("", [[1, 2]]), 4)
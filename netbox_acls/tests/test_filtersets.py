@@ -0,0 +1,83 @@
+from django.test import TestCase
+
+from netbox_acls.choices import *
+from netbox_acls.filtersets import ACLIngressRuleFilterSet
+from netbox_acls.models import *
+from netbox_acls.tests import create_access_list
+
+
+class ACLIngressRuleNetworkFilterTestCase(TestCase):
+    """Test the network lookups of the ACLIngressRule filter set"""
+
+    queryset = ACLIngressRule.objects.all()
+    filterset = ACLIngressRuleFilterSet
+
+    @classmethod
+    def setUpTestData(cls):
+        access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+        for port, prefix in enumerate(("10.0.0.0/8", "10.20.0.0/16", "10.20.30.0/24", "192.168.0.1/24"), start=1):
+            ACLIngressRule.objects.create(
+                access_list=access_list,
+                description=f"Rule {port}",
+                source_prefix=prefix,
+                protocol=ACLProtocolChoices.PROTOCOL_TCP,
+                destination_ports=[port],
+            )
+
+    def filter(self, params):
+        return self.filterset(params, self.queryset).qs
+
+    def test_network_is_parsed_on_save(self):
+        self.assertEqual(str(self.queryset.get(source_prefix="192.168.0.1/24").source_network), "192.168.0.0/24")
+
+    def test_source_prefix_net_contains_or_equals(self):
+        params = {"source_prefix__net_contains_or_equals": "10.20.0.0/16"}
+        self.assertEqual(self.filter(params).count(), 2)
+
+    def test_source_prefix_net_contained_or_equal(self):
+        params = {"source_prefix__net_contained_or_equal": "10.20.0.0/16"}
+        self.assertEqual(self.filter(params).count(), 2)
+
+    def test_source_prefix_net_overlaps(self):
+        params = {"source_prefix__net_overlaps": "10.20.30.128/25"}
+        self.assertEqual(self.filter(params).count(), 3)
+
+    def test_invalid_prefix_matches_nothing(self):
+        params = {"source_prefix__net_overlaps": "invalid"}
+        self.assertEqual(self.filter(params).count(), 0)
+
+    def test_source_prefix_range_overlaps(self):
+        params = {"source_prefix__range_overlaps": "10.20.30.200-10.21.0.0"}
+        self.assertEqual(self.filter(params).count(), 3)
+        params = {"source_prefix__range_overlaps": "192.168.1.0-192.168.2.0"}
+        self.assertEqual(self.filter(params).count(), 0)
+
+    def test_source_prefix_range_within(self):
+        params = {"source_prefix__range_within": "10.20.0.0-10.20.255.255"}
+        self.assertEqual(self.filter(params).count(), 2)
+        params = {"source_prefix__range_within": "10.0.0.0/8"}
+        self.assertEqual(self.filter(params).count(), 3)
+
+    def test_invalid_range_matches_nothing(self):
+        params = {"source_prefix__range_overlaps": "10.0.0.2-10.0.0.1"}
+        self.assertEqual(self.filter(params).count(), 0)
+
+    def test_destination_ports_overlaps(self):
+        params = {"destination_ports__overlaps": "2-3"}
+        self.assertEqual(self.filter(params).count(), 2)
+        params = {"destination_ports__overlaps": "4"}
+        self.assertEqual(self.filter(params).count(), 1)
+        params = {"destination_ports__overlaps": "5-1024"}
+        self.assertEqual(self.filter(params).count(), 0)
+
+    def test_invalid_port_range_matches_nothing(self):
+        params = {"destination_ports__overlaps": "3-2"}
+        self.assertEqual(self.filter(params).count(), 0)
+
+    def test_destination_ports_are_merged_on_save(self):
+        rule = self.queryset.get(source_prefix="10.0.0.0/8")
+        rule.destination_ports = [443, [1024, 2048], 80, [2000, 65535]]
+        rule.save()
+        rule.refresh_from_db()
+        self.assertEqual(rule.destination_ports, [[80, 80], [443, 443], [1024, 65535]])
+        self.assertEqual((rule.destination_port_span.lower, rule.destination_port_span.upper), (80, 65536))
@@ -0,0 +1,143 @@
+import json
+
+from dcim.models import Device, DeviceType, Interface, Manufacturer, Site
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from users.models import ObjectPermission
+from utilities.testing import APITestCase
+
+from netbox_acls.choices import *
+from netbox_acls.models import *
+from netbox_acls.querysets import DEVICE_ROLE_FIELD
+from netbox_acls.tests import create_access_list, get_device_role
+
+
+class GraphQLTestCase(APITestCase):
+    """Test the batched relations and the paginated rule queries of the GraphQL API"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        cls.devicerole = get_device_role()
+        device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: cls.devicerole},
+        )
+        interface = Interface.objects.create(device=device, name="eth0", type="1000base-t")
+        cls.access_lists = [
+            create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS, name=f"testacl{index}")
+            for index in range(2)
+        ]
+        cls.rules = [
+            cls.create_rule(access_list, protocol, port)
+            for access_list in cls.access_lists
+            for protocol, port in ((ACLProtocolChoices.PROTOCOL_TCP, 22), (ACLProtocolChoices.PROTOCOL_UDP, 53))
+        ]
+        cls.assignment = ACLInterfaceAssignment.objects.create(
+            access_list=cls.access_lists[0],
+            assigned_object_type=ContentType.objects.get_for_model(Interface),
+            assigned_object_id=interface.id,
+        )
+
+    @classmethod
+    def create_rule(cls, access_list, protocol, port):
+        return ACLEgressRule.objects.create(
+            access_list=access_list,
+            destination_prefix="10.0.0.0/8",
+            protocol=protocol,
+            destination_ports=[port],
+        )
+
+    def execute(self, query):
+        response = self.client.post(reverse("graphql"), data={"query": query}, format="json", **self.header)
+        return json.loads(response.content)
+
+    def test_nested_relations(self):
+        self.add_permissions("netbox_acls.view_accesslist", "netbox_acls.view_aclegressrule")
+        query = "{ access_list_list { name aclegressrules { id access_list { name } } } }"
+
+        data = self.execute(query)
+        self.assertNotIn("errors", data)
+        access_lists = {access_list["name"]: access_list for access_list in data["data"]["access_list_list"]}
+        self.assertEqual(len(access_lists["testacl0"]["aclegressrules"]), 2)
+        self.assertEqual(access_lists["testacl0"]["aclegressrules"][0]["access_list"]["name"], "testacl0")
+
+        # The number of queries does not grow with the number of Access Lists and rules.
+        with CaptureQueriesContext(connection) as queries:
+            self.execute(query)
+        access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS, name="testacl2")
+        for port in (80, 443):
+            self.create_rule(access_list, ACLProtocolChoices.PROTOCOL_TCP, port)
+        with self.assertNumQueries(len(queries)):
+            data = self.execute(query)
+        self.assertEqual(len(data["data"]["access_list_list"]), 3)
+
+    def test_nested_relations_permissions(self):
+        self.add_permissions("netbox_acls.view_accesslist")
+        data = self.execute("{ access_list_list { name aclegressrules { id } } }")
+        self.assertNotIn("errors", data)
+        self.assertEqual([access_list["aclegressrules"] for access_list in data["data"]["access_list_list"]], [[], []])
+
+        # Only the rules matching the constraints of the permission are loaded.
+        permission = ObjectPermission.objects.create(
+            name="View TCP rules",
+            actions=["view"],
+            constraints={"protocol": ACLProtocolChoices.PROTOCOL_TCP},
+        )
+        permission.users.add(self.user)
+        permission.object_types.add(ContentType.objects.get_for_model(ACLEgressRule))
+        data = self.execute("{ access_list_list { name aclegressrules { protocol } } }")
+        protocols = {rule["protocol"] for access_list in data["data"]["access_list_list"] for rule in access_list["aclegressrules"]}
+        self.assertEqual(protocols, {ACLProtocolChoices.PROTOCOL_TCP})
+
+    def test_rule_pages(self):
+        self.add_permissions("netbox_acls.view_aclegressrule")
+        query = "{ acl_egress_rule_page(first: 3%s) { items { id } end_cursor has_next_page } }"
+
+        page = self.execute(query % "")["data"]["acl_egress_rule_page"]
+        self.assertEqual([int(item["id"]) for item in page["items"]], [rule.pk for rule in self.rules[:3]])
+        self.assertTrue(page["has_next_page"])
+
+        page = self.execute(query % f', after: "{page["end_cursor"]}"')["data"]["acl_egress_rule_page"]
+        self.assertEqual([int(item["id"]) for item in page["items"]], [self.rules[3].pk])
+        self.assertFalse(page["has_next_page"])
+
+        page = self.execute(query % f', after: "{page["end_cursor"]}"')["data"]["acl_egress_rule_page"]
+        self.assertEqual(page["items"], [])
+        self.assertIsNone(page["end_cursor"])
+
+    def test_rule_pages_invalid_arguments(self):
+        self.add_permissions("netbox_acls.view_aclegressrule")
+        for arguments in ("first: 0", "first: 1001", 'after: "invalid"', 'after: "cGs6YQ=="'):
+            data = self.execute(f"{{ acl_egress_rule_page({arguments}) {{ items {{ id }} }} }}")
+            self.assertIn("errors", data, arguments)
+
+    def test_interface_assignments(self):
+        self.add_permissions("netbox_acls.view_aclinterfaceassignment", "netbox_acls.view_accesslist")
+        data = self.execute("{ acl_interface_assignment_list { id access_list { name } } }")
+        self.assertNotIn("errors", data)
+        self.assertEqual(
+            data["data"]["acl_interface_assignment_list"],
+            [{"id": str(self.assignment.pk), "access_list": {"name": "testacl0"}}],
+        )
+
+        data = self.execute(f"{{ acl_interface_assignment(id: {self.assignment.pk}) {{ access_list {{ name }} }} }}")
+        self.assertEqual(data["data"]["acl_interface_assignment"]["access_list"]["name"], "testacl0")
+
+    def test_interface_assignments_permissions(self):
+        # The Access Lists the user may not view are left out.
+        self.add_permissions("netbox_acls.view_aclinterfaceassignment")
+        data = self.execute("{ acl_interface_assignment_list { access_list { name } } }")
+        self.assertEqual(data["data"]["acl_interface_assignment_list"], [{"access_list": None}])
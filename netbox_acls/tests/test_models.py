@@ -0,0 +1,222 @@
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Site
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from netbox_acls.choices import *
+from netbox_acls.models import *
+from netbox_acls.querysets import DEVICE_ROLE_FIELD
+from netbox_acls.tests import create_access_list, get_device_role
+
+
+class AccessListRuleCountTestCase(TestCase):
+    """Test the denormalized rule counters of the AccessList model"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS)
+
+    def test_rule_counts_follow_rule_changes(self):
+        rule = ACLIngressRule.objects.create(
+            access_list=self.access_list,
+            description="Rule 1",
+            source_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[22],
+        )
+        ACLIngressRule.objects.create(
+            access_list=self.access_list,
+            description="Rule 2",
+            source_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_ICMP,
+        )
+        self.access_list.refresh_from_db()
+        self.assertEqual(self.access_list.rule_count, 2)
+        self.assertEqual(self.access_list.tcp_rule_count, 1)
+        self.assertEqual(self.access_list.icmp_rule_count, 1)
+
+        rule.delete()
+        self.access_list.refresh_from_db()
+        self.assertEqual(self.access_list.rule_count, 1)
+        self.assertEqual(self.access_list.tcp_rule_count, 0)
+
+    def test_update_rule_counts_repairs_drift(self):
+        ACLIngressRule.objects.create(
+            access_list=self.access_list,
+            description="Rule 1",
+            source_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_UDP,
+            destination_ports=[53],
+        )
+        AccessList.objects.filter(pk=self.access_list.pk).update(rule_count=42, udp_rule_count=0)
+
+        AccessList.objects.filter(pk=self.access_list.pk).update_rule_counts()
+        self.access_list.refresh_from_db()
+        self.assertEqual(self.access_list.rule_count, 1)
+        self.assertEqual(self.access_list.udp_rule_count, 1)
+
+
+class AssignedObjectQuerySetTestCase(TestCase):
+    """Test the bulk loading of assigned objects"""
+
+    @classmethod
+    def setUpTestData(cls):
+        content_type = ContentType.objects.get_for_model(DeviceRole)
+        for index in range(1, 4):
+            devicerole = DeviceRole.objects.create(
+                name=f"Device Role {index}",
+                slug=f"device-role-{index}",
+            )
+            AccessList.objects.create(
+                name="testacl1",
+                assigned_object_type=content_type,
+                assigned_object_id=devicerole.id,
+                type=ACLAssignmentDirectionChoices.DIRECTION_INGRESS,
+            )
+
+    def test_with_assigned_objects(self):
+        # One query for the Access Lists and one for the device roles.
+        with self.assertNumQueries(2):
+            access_lists = list(AccessList.objects.with_assigned_objects())
+            self.assertEqual(
+                sorted(access_list.assigned_object.name for access_list in access_lists),
+                ["Device Role 1", "Device Role 2", "Device Role 3"],
+            )
+
+    def test_cleared_with_prefetches(self):
+        queryset = AccessList.objects.with_assigned_objects().prefetch_related(None)
+        with self.assertNumQueries(1):
+            list(queryset)
+
+
+class ACLEffectiveRuleTestCase(TestCase):
+    """Test the materialized effective rules of interfaces"""
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="Site 1", slug="site-1")
+        manufacturer = Manufacturer.objects.create(
+            name="Manufacturer 1",
+            slug="manufacturer-1",
+        )
+        devicetype = DeviceType.objects.create(
+            manufacturer=manufacturer,
+            model="Device Type 1",
+        )
+        devicerole = get_device_role()
+        device = Device.objects.create(
+            name="Device 1",
+            site=site,
+            device_type=devicetype,
+            **{DEVICE_ROLE_FIELD: devicerole},
+        )
+        cls.interfaces = [Interface.objects.create(device=device, name=f"eth{index}", type="1000base-t") for index in range(2)]
+        cls.access_lists = [
+            create_access_list(ACLAssignmentDirectionChoices.DIRECTION_INGRESS, name=name)
+            for name in ("testacl1", "testacl2")
+        ]
+
+    def create_rule(self, access_list, port):
+        return ACLIngressRule.objects.create(
+            access_list=access_list,
+            description=f"Rule {port}",
+            source_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[port],
+        )
+
+    def assign(self, access_list, interface):
+        return ACLInterfaceAssignment.objects.create(
+            access_list=access_list,
+            assigned_object_type=ContentType.objects.get_for_model(Interface),
+            assigned_object_id=interface.id,
+        )
+
+    def get_effective_rules(self, interface):
+        return list(
+            ACLEffectiveRule.objects.filter(
+                assigned_object_type=ContentType.objects.get_for_model(Interface),
+                assigned_object_id=interface.id,
+                direction=ACLAssignmentDirectionChoices.DIRECTION_INGRESS,
+            ).values_list("ingress_rule", flat=True)
+        )
+
+    def test_follow_assignment_changes(self):
+        rules = [self.create_rule(self.access_lists[0], port) for port in (22, 443)]
+        assignment = self.assign(self.access_lists[0], self.interfaces[0])
+        self.assertEqual(self.get_effective_rules(self.interfaces[0]), [rule.pk for rule in rules])
+
+        assignment.assigned_object_id = self.interfaces[1].id
+        assignment.save()
+        self.assertEqual(self.get_effective_rules(self.interfaces[0]), [])
+        self.assertEqual(self.get_effective_rules(self.interfaces[1]), [rule.pk for rule in rules])
+
+        assignment.delete()
+        self.assertFalse(ACLEffectiveRule.objects.exists())
+
+    def test_follow_rule_changes(self):
+        self.assign(self.access_lists[0], self.interfaces[0])
+        self.assign(self.access_lists[1], self.interfaces[1])
+        rule = self.create_rule(self.access_lists[0], 22)
+        self.assertEqual(self.get_effective_rules(self.interfaces[0]), [rule.pk])
+
+        rule.access_list = self.access_lists[1]
+        rule.save()
+        self.assertEqual(self.get_effective_rules(self.interfaces[0]), [])
+        self.assertEqual(self.get_effective_rules(self.interfaces[1]), [rule.pk])
+
+        rule.delete()
+        self.assertEqual(self.get_effective_rules(self.interfaces[1]), [])
+
+    def test_follow_access_list_type_changes(self):
+        self.create_rule(self.access_lists[0], 22)
+        self.assign(self.access_lists[0], self.interfaces[0])
+        self.assertTrue(ACLEffectiveRule.objects.exists())
+
+        access_list = AccessList.objects.get(pk=self.access_lists[0].pk)
+        access_list.snapshot()
+        access_list.type = ACLAssignmentDirectionChoices.DIRECTION_EGRESS
+        access_list.save()
+        # The ingress rules no longer apply, and the Access List has no egress rules.
+        self.assertFalse(ACLEffectiveRule.objects.exists())
+
+
+class ACLRuleSequenceTestCase(TestCase):
+    """Test the sequence numbers of the ACL rules"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.access_list = create_access_list(ACLAssignmentDirectionChoices.DIRECTION_EGRESS)
+
+    def create_rule(self, port, sequence=None):
+        return ACLEgressRule.objects.create(
+            access_list=self.access_list,
+            sequence=sequence,
+            destination_prefix="10.0.0.0/8",
+            protocol=ACLProtocolChoices.PROTOCOL_TCP,
+            destination_ports=[port],
+        )
+
+    def test_append(self):
+        self.assertEqual(self.create_rule(1).sequence, 10)
+        self.assertEqual(self.create_rule(2).sequence, 20)
+        self.assertEqual(self.create_rule(3, sequence=15).sequence, 15)
+        self.assertEqual(list(self.access_list.get_rules().values_list("sequence", flat=True)), [10, 15, 20])
+
+    def test_insert_in_gap(self):
+        self.create_rule(1)
+        self.create_rule(2)
+        self.assertEqual(ACLEgressRule.get_sequence_after(self.access_list.pk, 10), 15)
+        self.assertEqual(ACLEgressRule.get_sequence_after(self.access_list.pk, 20), 30)
+
+        self.create_rule(3, sequence=11)
+        with self.assertRaises(ValidationError):
+            ACLEgressRule.get_sequence_after(self.access_list.pk, 10)
+
+    def test_renumber(self):
+        rules = [self.create_rule(1, sequence=5), self.create_rule(2, sequence=6), self.create_rule(3, sequence=30)]
+        self.assertEqual(self.access_list.renumber_rules(), 2)
+        self.assertEqual(
+            list(self.access_list.get_rules().values_list("pk", "sequence")),
+            [(rules[0].pk, 10), (rules[1].pk, 20), (rules[2].pk, 30)],
+        )
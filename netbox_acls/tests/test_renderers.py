@@ -0,0 +1,96 @@
+from django.test import SimpleTestCase
+
+from netbox_acls.engine import make_rule_entry
+from netbox_acls.renderers import CiscoIOSRenderer, CiscoNXOSRenderer, JunosRenderer, NftablesRenderer, RenderedRule
+
+
+class ACLRendererTestCase(SimpleTestCase):
+    """Test the rendering of Access Lists as device configurations"""
+
+    def setUp(self):
+        self.rules = [
+            RenderedRule(make_rule_entry(1, "10.0.0.0/8", "tcp", [80, 443, 444]), "Web servers"),
+            RenderedRule(make_rule_entry(2, "10.1.1.1/32", "icmp", None), ""),
+            RenderedRule(make_rule_entry(3, "2001:db8::/32", "udp", [53]), None),
+        ]
+
+    def render(self, renderer, match_destination=False):
+        return list(renderer("ACL-1", match_destination, self.rules).render())
+
+    def test_cisco_ios(self):
+        self.assertEqual(
+            self.render(CiscoIOSRenderer),
+            [
+                "ip access-list extended ACL-1",
+                " remark Web servers",
+                " permit tcp 10.0.0.0 0.255.255.255 any eq 80",
+                " permit tcp 10.0.0.0 0.255.255.255 any range 443 444",
+                " permit icmp host 10.1.1.1 any",
+                " deny ip any any",
+                "ipv6 access-list ACL-1",
+                " permit udp 2001:db8::/32 any eq 53",
+                " deny ipv6 any any",
+            ],
+        )
+
+    def test_cisco_nxos_egress(self):
+        self.assertEqual(
+            self.render(CiscoNXOSRenderer, match_destination=True)[:3],
+            [
+                "ip access-list ACL-1",
+                "  10 remark Web servers",
+                "  20 permit tcp any 10.0.0.0/8 eq 80",
+            ],
+        )
+
+    def test_ipv6_filter_only_rendered_with_ipv6_rules(self):
+        self.rules.pop()
+        self.assertNotIn("ipv6 access-list ACL-1", self.render(CiscoIOSRenderer))
+
+    def test_junos(self):
+        lines = self.render(JunosRenderer)
+        self.assertIn("set firewall family inet filter ACL-1 term rule-1 from destination-port 443-444", lines)
+        self.assertIn("set firewall family inet6 filter ACL-1 term rule-3 from next-header udp", lines)
+        self.assertEqual(lines[-1], "set firewall family inet6 filter ACL-1 term default-deny then discard")
+
+    def test_nftables(self):
+        self.assertEqual(
+            self.render(NftablesRenderer),
+            [
+                "table inet netbox_acls {",
+                "\tchain ACL_1 {",
+                '\t\tip saddr 10.0.0.0/8 tcp dport { 80, 443-444 } accept comment "Web servers"',
+                "\t\tip saddr 10.1.1.1/32 meta l4proto icmp accept",
+                "\t\tip6 saddr 2001:db8::/32 udp dport 53 accept",
+                "\t\tdrop",
+                "\t}",
+                "}",
+            ],
+        )
+
+    def test_any_protocol_with_ports(self):
+        # Destination ports only apply to TCP and UDP: the rule must not permit any protocol.
+        self.rules = [RenderedRule(make_rule_entry(1, "10.0.0.0/8", None, [22]), "SSH")]
+        self.assertEqual(
+            self.render(CiscoIOSRenderer)[:4],
+            [
+                "ip access-list extended ACL-1",
+                " remark SSH",
+                " permit tcp 10.0.0.0 0.255.255.255 any eq 22",
+                " permit udp 10.0.0.0 0.255.255.255 any eq 22",
+            ],
+        )
+        self.assertEqual(
+            self.render(NftablesRenderer)[2:4],
+            [
+                '\t\tip saddr 10.0.0.0/8 tcp dport 22 accept comment "SSH"',
+                "\t\tip saddr 10.0.0.0/8 udp dport 22 accept",
+            ],
+        )
+        lines = self.render(JunosRenderer)
+        self.assertIn("set firewall family inet filter ACL-1 term rule-1-tcp from protocol tcp", lines)
+        self.assertIn("set firewall family inet filter ACL-1 term rule-1-udp from destination-port 22", lines)
+
+        # Rules matching any port still permit any protocol.
+        self.rules = [RenderedRule(make_rule_entry(1, "10.0.0.0/8", None, None), "")]
+        self.assertIn(" permit ip 10.0.0.0 0.255.255.255 any", self.render(CiscoIOSRenderer))
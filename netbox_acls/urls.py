@@ -16,6 +16,11 @@ urlpatterns = (
         name="accesslist_add",
     ),
     # path('access-lists/edit/', views.AccessListBulkEditView.as_view(), name='accesslist_bulk_edit'),
+    path(
+        "access-lists/coverage/",
+        views.AccessListCoverageView.as_view(),
+        name="accesslist_coverage",
+    ),
     path(
         "access-lists/delete/",
         views.AccessListBulkDeleteView.as_view(),
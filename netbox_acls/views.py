@@ -4,12 +4,38 @@ Specifically, all the various interactions with a client.
 """
 
 from dcim.models import Device, Interface, VirtualChassis
-from django.db.models import Count
+from django.core.exceptions import ValidationError
+from django.shortcuts import render
+from django.views.generic import View
+from extras.models import ObjectChange
 from netbox.views import generic
 from utilities.views import ViewTab, register_model_view
 from virtualization.models import VirtualMachine, VMInterface
 
 from . import choices, filtersets, forms, models, tables
+from .badges import (
+    get_device_access_list_count,
+    get_interface_assignment_count,
+    get_virtual_chassis_access_list_count,
+    get_virtual_machine_access_list_count,
+)
+from .bulk import BATCH_SIZE, bulk_create_rules, get_access_lists_by_name, get_rule_unique_key, get_rule_unique_keys
+from .coverage import get_coverage
+from .engine import get_rule_analysis
+from .history import get_change_position, get_rule_history_diff
+from .signals import defer_rule_updates, update_access_lists, update_effective_rules
+
+# Maximum number of rule analysis findings displayed on the Access List page.
+MAX_DISPLAYED_FINDINGS = 100
+
+# Maximum number of covering rules, per direction, displayed by the coverage lookup.
+MAX_DISPLAYED_COVERING_RULES = 100
+
+# Maximum number of changed rules compared by the rule history diff.
+MAX_DISPLAYED_CHANGED_RULES = 1000
+
+# Maximum number of invalid rows reported by a bulk import, after which validation stops.
+MAX_IMPORT_ERRORS = 100
 
 __all__ = (
     "AccessListView",
@@ -17,6 +43,8 @@ __all__ = (
     "AccessListEditView",
     "AccessListDeleteView",
     "AccessListBulkDeleteView",
+    "AccessListCoverageView",
+    "AccessListHistoryDiffView",
     "ACLInterfaceAssignmentView",
     "ACLInterfaceAssignmentListView",
     "ACLInterfaceAssignmentEditView",
@@ -37,6 +65,85 @@ __all__ = (
 )
 
 
+class RuleUpdatesDeferredMixin:
+    """
+    Refresh the rule counters and rendered configurations of the touched Access Lists
+    once at the end of a bulk operation, instead of once per rule.
+    """
+
+    def post(self, request, *args, **kwargs):
+        with defer_rule_updates():
+            return super().post(request, *args, **kwargs)
+
+
+class RuleBulkImportMixin:
+    """
+    Import new rules in batches: the referenced access lists are resolved with a single query,
+    rows are validated BATCH_SIZE at a time with a set-based uniqueness check, and valid batches
+    are inserted with bulk_create. Imports updating existing rules use the per-row path.
+    """
+
+    def create_and_update_objects(self, form, request):
+        records = list(form.cleaned_data["data"])
+        if any(record.get("id") for record in records):
+            return super().create_and_update_objects(form, request)
+
+        model = self.queryset.model
+        access_lists = get_access_lists_by_name(model, {record.get("access_list") for record in records})
+        unique_keys = get_rule_unique_keys(
+            model,
+            [access_list.pk for matches in access_lists.values() for access_list in matches],
+        )
+        unique_check = ("access_list", "destination_ports", "protocol")
+
+        saved_objects = []
+        error_count = 0
+        for offset in range(0, len(records), BATCH_SIZE):
+            batch = []
+            for i, record in enumerate(records[offset : offset + BATCH_SIZE], start=offset + 1):
+                model_form_kwargs = {
+                    "data": record,
+                    "access_lists": access_lists,
+                }
+                if hasattr(form, "_csv_headers"):
+                    model_form_kwargs["headers"] = form._csv_headers
+                model_form = self.model_form(**model_form_kwargs)
+
+                if model_form.is_valid():
+                    instance = model_form.instance
+                    unique_key = get_rule_unique_key(instance)
+                    if unique_key is None or unique_key not in unique_keys:
+                        if unique_key is not None:
+                            unique_keys.add(unique_key)
+                        batch.append((instance, list(model_form.cleaned_data.get("tags") or ())))
+                        continue
+                    form.add_error(None, f"Record {i}: {instance.unique_error_message(model, unique_check)}")
+                else:
+                    # Replicate model form errors for display
+                    for field, errors in model_form.errors.items():
+                        for err in errors:
+                            if field == "__all__":
+                                form.add_error(None, f"Record {i}: {err}")
+                            else:
+                                form.add_error(None, f"Record {i} {field}: {err}")
+
+                error_count += 1
+                if error_count >= MAX_IMPORT_ERRORS:
+                    raise ValidationError("")
+
+            # Keep validating after an error to report every invalid row, but stop inserting.
+            if not error_count:
+                saved_objects.extend(bulk_create_rules(model, batch, request))
+
+        if error_count:
+            raise ValidationError("")
+
+        # bulk_create does not send the signals refreshing the Access Lists and effective rules.
+        update_access_lists({rule.access_list_id for rule in saved_objects})
+        update_effective_rules(model, [rule.pk for rule in saved_objects])
+        return saved_objects
+
+
 #
 # AccessList views
 #
@@ -69,18 +176,42 @@ class AccessListView(generic.ObjectView):
 
             return {
                 "rules_table": table,
+                **self.get_rule_analysis_context(instance),
             }
         return {}
 
+    @staticmethod
+    def get_rule_analysis_context(instance):
+        """
+        Return the findings of the rule analysis to display, along with their rules.
+        """
+        findings = get_rule_analysis(instance)
+        displayed = findings[:MAX_DISPLAYED_FINDINGS]
+        rule_ids = {finding.rule for finding in displayed}
+        rule_ids.update(related for finding in displayed for related in finding.related)
+        rules = instance.get_rules().in_bulk(rule_ids)
+
+        return {
+            "rule_findings": [
+                {
+                    "rule": rules.get(finding.rule),
+                    "kind": finding.kind,
+                    "kind_display": dict(choices.ACLRuleFindingChoices)[finding.kind],
+                    "kind_color": choices.ACLRuleFindingChoices.colors.get(finding.kind),
+                    "related": [rules[related] for related in finding.related if related in rules],
+                }
+                for finding in displayed
+            ],
+            "rule_finding_count": len(findings),
+        }
+
 
 class AccessListListView(generic.ObjectListView):
     """
     Defines the list view for the AccessLists django model.
     """
 
-    queryset = models.AccessList.objects.annotate(
-        rule_count=Count("aclegressrules") + Count("aclingressrules"),
-    ).prefetch_related("tags")
+    queryset = models.AccessList.objects.prefetch_related("tags").with_assigned_objects()
     table = tables.AccessListTable
     filterset = filtersets.AccessListFilterSet
     filterset_form = forms.AccessListFilterForm
@@ -106,12 +237,95 @@ class AccessListDeleteView(generic.ObjectDeleteView):
     queryset = models.AccessList.objects.prefetch_related("tags")
 
 
-class AccessListBulkDeleteView(generic.BulkDeleteView):
+class AccessListBulkDeleteView(RuleUpdatesDeferredMixin, generic.BulkDeleteView):
     queryset = models.AccessList.objects.prefetch_related("tags")
     filterset = filtersets.AccessListFilterSet
     table = tables.AccessListTable
 
 
+class AccessListCoverageView(View):
+    """
+    Looks up the rules covering an IP address or prefix, optionally for a protocol and destination
+    port, grouped by Access List along with the interfaces it is assigned to.
+    """
+
+    template_name = "netbox_acls/coverage.html"
+
+    def get(self, request):
+        form = forms.ACLCoverageForm(request.GET or None)
+        results = None
+        truncated = False
+        if form.is_valid():
+            coverage = get_coverage(
+                request.user,
+                form.cleaned_data["prefix"],
+                protocol=form.cleaned_data["protocol"] or None,
+                port=form.cleaned_data["port"],
+                direction=form.cleaned_data["direction"] or None,
+                limit=MAX_DISPLAYED_COVERING_RULES,
+            )
+            rules = {}
+            for rule in coverage.rules:
+                rules.setdefault(rule.access_list_id, []).append(rule)
+            results = [
+                {
+                    "access_list": access_list,
+                    "rules": rules[access_list.pk],
+                    "assignments": coverage.assignments.get(access_list.pk, []),
+                }
+                for access_list in coverage.access_lists
+            ]
+            truncated = coverage.truncated
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "form": form,
+                "results": results,
+                "truncated": truncated,
+            },
+        )
+
+
+@register_model_view(models.AccessList, "history_diff", path="history-diff")
+class AccessListHistoryDiffView(generic.ObjectView):
+    """
+    Compares the rules of an Access List at two points of its change history: the rules added, removed
+    and modified in between, rebuilt from the change log entries the user may view.
+    """
+
+    queryset = models.AccessList.objects.all()
+    template_name = "netbox_acls/accesslist_history_diff.html"
+    tab = ViewTab(
+        label="Rule History",
+        permission="extras.view_objectchange",
+        weight=10100,
+    )
+
+    def get_extra_context(self, request, instance):
+        form = forms.ACLHistoryDiffForm(request.GET or None)
+        diff = None
+        if form.is_valid():
+            object_changes = ObjectChange.objects.restrict(request.user, "view")
+            bounds = {}
+            for field in ("start", "end"):
+                bounds[field] = form.cleaned_data[field]
+                change_id = form.cleaned_data[f"{field}_change"]
+                if change_id is not None:
+                    object_change = object_changes.filter(pk=change_id).first()
+                    if object_change is None:
+                        form.add_error(f"{field}_change", f"Change log entry {change_id} not found.")
+                        return {"form": form, "diff": None}
+                    bounds[field] = get_change_position(object_change)
+            diff = get_rule_history_diff(instance, object_changes, limit=MAX_DISPLAYED_CHANGED_RULES, **bounds)
+
+        return {
+            "form": form,
+            "diff": diff,
+        }
+
+
 class AccessListChildView(generic.ObjectChildrenView):
     """
     Defines the child view for the AccessLists model.
@@ -129,25 +343,18 @@ class AccessListChildView(generic.ObjectChildrenView):
             "add_url": "plugins:netbox_acls:accesslist_add",
         }
 
-    def prep_table_data(self, request, queryset, parent):
-        return queryset.annotate(
-            rule_count=Count("aclegressrules") + Count("aclingressrules"),
-        )
-
 
 @register_model_view(Device, "access_lists")
 class DeviceAccessListView(AccessListChildView):
     queryset = Device.objects.prefetch_related("tags")
     tab = ViewTab(
         label="Access Lists",
-        badge=lambda obj: models.AccessList.objects.filter(device=obj).count(),
+        badge=get_device_access_list_count,
         permission="netbox_acls.view_accesslist",
     )
 
     def get_children(self, request, parent):
-        return self.child_model.objects.restrict(request.user, "view").filter(
-            device=parent,
-        )
+        return self.child_model.objects.restrict(request.user, "view").for_device(parent).with_assigned_objects()
 
 
 @register_model_view(VirtualChassis, "access_lists")
@@ -155,13 +362,13 @@ class VirtualChassisAccessListView(AccessListChildView):
     queryset = VirtualChassis.objects.prefetch_related("tags")
     tab = ViewTab(
         label="Access Lists",
-        badge=lambda obj: models.AccessList.objects.filter(virtual_chassis=obj).count(),
+        badge=get_virtual_chassis_access_list_count,
         permission="netbox_acls.view_accesslist",
     )
 
     def get_children(self, request, parent):
-        return self.child_model.objects.restrict(request.user, "view").filter(
-            virtual_chassis=parent,
+        return (
+            self.child_model.objects.restrict(request.user, "view").for_virtual_chassis(parent).with_assigned_objects()
         )
 
 
@@ -170,13 +377,13 @@ class VirtualMachineAccessListView(AccessListChildView):
     queryset = VirtualMachine.objects.prefetch_related("tags")
     tab = ViewTab(
         label="Access Lists",
-        badge=lambda obj: models.AccessList.objects.filter(virtual_machine=obj).count(),
+        badge=get_virtual_machine_access_list_count,
         permission="netbox_acls.view_accesslist",
     )
 
     def get_children(self, request, parent):
-        return self.child_model.objects.restrict(request.user, "view").filter(
-            virtual_machine=parent,
+        return (
+            self.child_model.objects.restrict(request.user, "view").for_virtual_machine(parent).with_assigned_objects()
         )
 
 
@@ -205,7 +412,7 @@ class ACLInterfaceAssignmentListView(generic.ObjectListView):
     queryset = models.ACLInterfaceAssignment.objects.prefetch_related(
         "access_list",
         "tags",
-    )
+    ).with_assigned_objects()
     table = tables.ACLInterfaceAssignmentTable
     filterset = filtersets.ACLInterfaceAssignmentFilterSet
     filterset_form = forms.ACLInterfaceAssignmentFilterForm
@@ -278,16 +485,14 @@ class InterfaceACLInterfaceAssignmentView(ACLInterfaceAssignmentChildView):
     queryset = Interface.objects.prefetch_related("device", "tags")
     tab = ViewTab(
         label="ACL Interface Assignments",
-        badge=lambda obj: models.ACLInterfaceAssignment.objects.filter(
-            interface=obj,
-        ).count(),
+        badge=get_interface_assignment_count,
         permission="netbox_acls.view_aclinterfaceassignment",
     )
 
     def get_children(self, request, parent):
         return self.child_model.objects.restrict(request.user, "view").filter(
             interface=parent,
-        )
+        ).with_assigned_objects()
 
 
 @register_model_view(VMInterface, "acl_interface_assignments")
@@ -297,16 +502,14 @@ class VirtualMachineInterfaceACLInterfaceAssignmentView(
     queryset = VMInterface.objects.prefetch_related("virtual_machine", "tags")
     tab = ViewTab(
         label="ACL Interface Assignments",
-        badge=lambda obj: models.ACLInterfaceAssignment.objects.filter(
-            vminterface=obj,
-        ).count(),
+        badge=get_interface_assignment_count,
         permission="netbox_acls.view_aclinterfaceassignment",
     )
 
     def get_children(self, request, parent):
         return self.child_model.objects.restrict(request.user, "view").filter(
             vminterface=parent,
-        )
+        ).with_assigned_objects()
 
 
 #
@@ -374,7 +577,7 @@ class ACLIngressRuleDeleteView(generic.ObjectDeleteView):
     )
 
 
-class ACLIngressRuleBulkDeleteView(generic.BulkDeleteView):
+class ACLIngressRuleBulkDeleteView(RuleUpdatesDeferredMixin, generic.BulkDeleteView):
     queryset = models.ACLIngressRule.objects.prefetch_related(
         "access_list",
         "tags",
@@ -383,7 +586,7 @@ class ACLIngressRuleBulkDeleteView(generic.BulkDeleteView):
     table = tables.ACLIngressRuleTable
 
 
-class ACLIngressBulkImportView(generic.BulkImportView):
+class ACLIngressBulkImportView(RuleUpdatesDeferredMixin, RuleBulkImportMixin, generic.BulkImportView):
     queryset = models.ACLIngressRule.objects.prefetch_related(
         "access_list",
         "tags",
@@ -443,7 +646,7 @@ class ACLEgressRuleEditView(generic.ObjectEditView):
             "access_list": request.GET.get("access_list") or request.POST.get("access_list"),
         }
 
-class ACLEgressBulkImportView(generic.BulkImportView):
+class ACLEgressBulkImportView(RuleUpdatesDeferredMixin, RuleBulkImportMixin, generic.BulkImportView):
     queryset = models.ACLEgressRule.objects.prefetch_related(
         "access_list",
         "tags",
@@ -464,7 +667,7 @@ class ACLEgressRuleDeleteView(generic.ObjectDeleteView):
     )
 
 
-class ACLEgressRuleBulkDeleteView(generic.BulkDeleteView):
+class ACLEgressRuleBulkDeleteView(RuleUpdatesDeferredMixin, generic.BulkDeleteView):
     queryset = models.ACLEgressRule.objects.prefetch_related(
         "access_list",
         "tags",
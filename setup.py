@@ -40,6 +40,10 @@ setup(
     url="https://github.com/ryanmerolle/netbox-acls",
     license="Apache 2.0",
     install_requires=[],
+    extras_require={
+        # Vectorized evaluation of the flow simulation API.
+        "simulation": ["numpy"],
+    },
     python_requires=">=3.10",
     packages=find_packages(),
     include_package_data=True,